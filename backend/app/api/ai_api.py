@@ -3,9 +3,9 @@ AI API
 AI 推薦和語義搜尋的 API 端點
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.db.session import get_db
+from app.dependencies import get_movie_repository
 from app.repositories.movie_repository import MovieRepository
 from app.services.ai_service import get_ai_service
 from app.schemas.ai_schema import (
@@ -19,11 +19,6 @@ from app.schemas.ai_schema import (
 router = APIRouter(prefix="/ai", tags=["AI Recommendations"])
 
 
-def get_movie_repository(db: Session = Depends(get_db)) -> MovieRepository:
-    """獲取 Movie Repository"""
-    return MovieRepository(db)
-
-
 @router.post("/recommend", response_model=RecommendationResponse)
 def get_ai_recommendations(
     request: RecommendationRequest,
@@ -102,6 +97,11 @@ def semantic_search(
 def get_similar_movies(
     movie_id: str,
     top_k: int = Query(10, ge=1, le=50, description="返回數量"),
+    mode: Optional[str] = Query(
+        None,
+        pattern="^(embedding|credits|hybrid)$",
+        description="embedding | credits | hybrid（預設依 SIMILAR_MOVIES_MODE）"
+    ),
     movie_repo: MovieRepository = Depends(get_movie_repository)
 ):
     """
@@ -109,6 +109,11 @@ def get_similar_movies(
     
     根據指定電影 ID，使用向量相似度找出最相似的電影。
     
+    **mode**:
+    - embedding: 只用簡介等文字的向量相似度
+    - credits: 共同導演 / 演員優先（同分時依向量相似度）
+    - hybrid: 向量相似度與共同演職人員分數加權混合
+    
     **使用情境**:
     - "喜歡這部電影，推薦類似的"
     - "更多像這樣的電影"
@@ -117,7 +122,8 @@ def get_similar_movies(
         ai_service = get_ai_service(movie_repo)
         result = ai_service.get_similar_movies(
             movie_id=movie_id,
-            top_k=top_k
+            top_k=top_k,
+            mode=mode
         )
         
         if not result['source_movie']:
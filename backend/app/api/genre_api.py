@@ -14,10 +14,10 @@ router = APIRouter(prefix="/genres", tags=["genres"])
 
 
 @router.get("", response_model=List[GenreSchema])
-def get_all_genres(service: GenreService = Depends(get_genre_service)):
+async def get_all_genres(service: GenreService = Depends(get_genre_service)):
     """
     獲取所有電影類型
     
     返回資料庫中所有可用的電影類型列表
     """
-    return service.get_all_genres()
+    return await service.get_all_genres()
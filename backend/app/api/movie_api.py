@@ -3,6 +3,7 @@ Movie API Endpoints
 電影相關的 RESTful API
 """
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 
 from app.dependencies import get_movie_service
@@ -13,11 +14,13 @@ from app.schemas.movie_schema import MovieDetail, MovieListResponse
 router = APIRouter(prefix="/movies", tags=["movies"])
 
 
-@router.get("", response_model=MovieListResponse)
-def get_movies(
+# 列表端點由 service 組裝字典並直接以 orjson 序列化（response_model 只用於 OpenAPI 文件）
+@router.get("", response_model=MovieListResponse, response_class=ORJSONResponse)
+async def get_movies(
     page: int = Query(1, ge=1, description="頁碼"),
     page_size: int = Query(20, ge=1, le=100, description="每頁數量"),
     genre_id: Optional[int] = Query(None, description="類型 ID（可選）"),
+    cursor: Optional[str] = Query(None, description="分頁游標（可選，取代 page）"),
     service: MovieService = Depends(get_movie_service)
 ):
     """
@@ -26,29 +29,37 @@ def get_movies(
     - **page**: 頁碼（從 1 開始）
     - **page_size**: 每頁數量（1-100）
     - **genre_id**: 可選，按類型篩選
+    - **cursor**: 可選，上一頁回應的 `next_cursor`；使用後忽略 page，深層分頁不會變慢
     """
-    return service.list_movies(page=page, page_size=page_size, genre_id=genre_id)
+    return ORJSONResponse(
+        await service.list_movies(page=page, page_size=page_size, genre_id=genre_id, cursor=cursor)
+    )
 
 
-@router.get("/search", response_model=MovieListResponse)
-def search_movies(
+@router.get("/search", response_model=MovieListResponse, response_class=ORJSONResponse)
+async def search_movies(
     q: str = Query(..., min_length=1, description="搜尋關鍵字"),
     page: int = Query(1, ge=1, description="頁碼"),
     page_size: int = Query(20, ge=1, le=100, description="每頁數量"),
+    cursor: Optional[str] = Query(None, description="分頁游標（可選，取代 page）"),
     service: MovieService = Depends(get_movie_service)
 ):
     """
     搜尋電影（支援中文）
     
     - **q**: 搜尋關鍵字（必填）
-    - **page**: 頁碼（從 1 開始）
+    - **page**: 頁碼（從 1 開始），結果按相關度排序
     - **page_size**: 每頁數量（1-100）
+    - **cursor**: 可選，改用按人氣度排序的游標分頁；傳入空字串取得第一頁，
+      之後傳入回應中的 `next_cursor`
     """
-    return service.search_movies(query=q, page=page, page_size=page_size)
+    return ORJSONResponse(
+        await service.search_movies(query=q, page=page, page_size=page_size, cursor=cursor)
+    )
 
 
 @router.get("/{movie_id}", response_model=MovieDetail)
-def get_movie_detail(
+async def get_movie_detail(
     movie_id: str,
     service: MovieService = Depends(get_movie_service)
 ):
@@ -57,4 +68,4 @@ def get_movie_detail(
     
     - **movie_id**: 電影 UUID
     """
-    return service.get_movie_detail(movie_id)
+    return await service.get_movie_detail(movie_id)
@@ -0,0 +1,46 @@
+"""
+Person API Endpoints
+演職人員相關的 RESTful API
+"""
+from fastapi import APIRouter, Depends, Query
+
+from app.dependencies import get_person_service
+from app.services.person_service import PersonService
+from app.schemas.person_schema import PersonDetail, PersonListResponse
+
+
+router = APIRouter(prefix="/people", tags=["people"])
+
+
+@router.get("", response_model=PersonListResponse)
+async def get_people(
+    role: str = Query("actor", description="角色：actor 或 director"),
+    page: int = Query(1, ge=1, description="頁碼"),
+    page_size: int = Query(20, ge=1, le=100, description="每頁數量"),
+    service: PersonService = Depends(get_person_service)
+):
+    """
+    獲取熱門演員或導演
+    
+    - **role**: actor（演員）或 director（導演）
+    - **page**: 頁碼（從 1 開始）
+    - **page_size**: 每頁數量（1-100）
+    
+    按參與電影數排序，統計資料於每次同步後更新
+    """
+    return await service.list_people(role=role, page=page, page_size=page_size)
+
+
+@router.get("/{person_id}", response_model=PersonDetail)
+async def get_person_detail(
+    person_id: str,
+    service: PersonService = Depends(get_person_service)
+):
+    """
+    獲取演職人員資訊
+    
+    - **person_id**: 人員 UUID
+    
+    包含各角色的參與電影數、平均評分與代表作
+    """
+    return await service.get_person_detail(person_id)
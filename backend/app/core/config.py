@@ -21,6 +21,44 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./cinemood.db"
     
+    # Database Connection Pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    
+    # SQLite Tuning（每個連線建立時設定）
+    SQLITE_WAL: bool = True  # WAL 模式：讀取不會被寫入阻塞
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536  # 每個連線的 page cache（64 MB）
+    SQLITE_MMAP_SIZE: int = 268435456  # memory-mapped I/O（256 MB）
+    
+    # Count Cache（總數快取，每隔幾秒檢查一次資料版本）
+    COUNT_CACHE_VERSION_CHECK_SECONDS: float = 5.0
+    COUNT_CACHE_MAX_SEARCH_ENTRIES: int = 1024
+    
+    # Response Cache（/movies、/genres 的完整回應快取 + ETag，資料版本改變時失效）
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_VERSION_CHECK_SECONDS: float = 5.0
+    RESPONSE_CACHE_DIR: str = ""  # 多個 worker 行程共用的磁碟目錄（空字串時只使用記憶體）
+    
+    # Embedding
+    EMBEDDING_MODEL: str = "paraphrase-multilingual-mpnet-base-v2"
+    EMBEDDING_STORAGE_DTYPE: str = "float32"  # movie_embeddings 的儲存精度：float32 | float16
+    EMBEDDING_MAX_SEQ_LENGTH: int = 128  # 超過的 token 截斷（0 使用模型預設值）
+    
+    # Vector Store（auto：DATABASE_URL 為 PostgreSQL 時使用 pgvector，否則使用記憶體 + pickle）
+    VECTOR_STORE_BACKEND: str = "auto"  # auto | memory | pgvector
+    PGVECTOR_HNSW_M: int = 16
+    PGVECTOR_HNSW_EF_CONSTRUCTION: int = 64
+    PGVECTOR_HNSW_EF_SEARCH: int = 40
+    
+    # Similar Movies（hybrid：嵌入餘弦相似度與共同導演 / 演員分數加權混合）
+    SIMILAR_MOVIES_MODE: str = "hybrid"  # embedding | credits | hybrid（/ai/similar 未指定 mode 時使用）
+    SIMILAR_CREDITS_WEIGHT: float = 0.3  # hybrid 中共同演職人員分數的比重
+    SIMILAR_DIRECTOR_WEIGHT: float = 2.0  # 導演關聯的權重（演員為 1）
+    SIMILAR_MAX_CAST: int = 10  # 每部電影計入的演員數量
+    
     # CORS
     BACKEND_CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
     
@@ -33,6 +71,15 @@ class Settings(BaseSettings):
     TMDB_READ_ACCESS_TOKEN: str = ""
     TMDB_BASE_URL: str = "https://api.themoviedb.org/3"
     TMDB_IMAGE_BASE_URL: str = "https://image.tmdb.org/t/p"
+    TMDB_RATE_LIMIT_PER_SECOND: float = 40.0
+    TMDB_MAX_WORKERS: int = 8  # 同步時並行請求的執行緒數量
+    TMDB_TIMEOUT: float = 10.0
+    TMDB_MAX_RETRIES: int = 3  # 5xx、逾時與 429 的重試次數
+    TMDB_BACKOFF_BASE: float = 0.5
+    TMDB_BACKOFF_MAX: float = 10.0
+    TMDB_CACHE_MODE: str = "off"  # 回應的磁碟快取：off | readwrite | replay（只讀快取，不連網）
+    TMDB_CACHE_DIR: str = "./.tmdb_cache"
+    TMDB_CACHE_TTL_SECONDS: float = 86400.0  # 過期後以 ETag 重新驗證
     
     # AI Provider (Phase 3)
     AI_PROVIDER: str = "ollama"
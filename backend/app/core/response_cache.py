@@ -0,0 +1,294 @@
+"""
+Response Cache
+唯讀目錄端點（/movies、/genres、/people）的 HTTP 回應快取
+
+電影目錄只在同步後才會改變，因此完整回應以「資料版本號 + 路徑 + 查詢字串」為鍵快取：
+行程內 LRU（可選共用磁碟目錄，讓多個 worker 行程共用），回應帶有內容雜湊的強 ETag，
+If-None-Match 相符時返回 304。同步腳本遞增 data_versions 後舊版本的快取自動失效。
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.repositories.data_version_repository import AsyncDataVersionRepository
+
+logger = logging.getLogger(__name__)
+
+# 快取的回應：(status, headers, body, etag)
+CachedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes, str]
+
+# 不隨快取保存的回應標頭（返回時重新產生）
+_SKIPPED_HEADERS = {b"content-length", b"etag", b"cache-control", b"x-cache"}
+
+
+def make_etag(body: bytes) -> str:
+    """以內容雜湊產生強 ETag（相同內容在不同行程得到相同的值）"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否包含 etag（依 RFC 9110 以弱比較處理 W/ 前綴與 *）"""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in (value[2:] if value.startswith("W/") else value for value in candidates)
+
+
+class DiskResponseStore:
+    """
+    共用的磁碟快取後端（多個 worker 行程共用同一目錄）
+    檔名包含資料版本號，版本改變後舊檔案不會再被讀取，並於清除時刪除
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, version: int, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"v{version}-{digest}.resp")
+
+    def get(self, version: int, key: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._path(version, key), "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in meta["headers"]]
+        return meta["status"], headers, body, meta["etag"]
+
+    def put(self, version: int, key: str, response: CachedResponse):
+        status, headers, body, etag = response
+        meta = {
+            "status": status,
+            "etag": etag,
+            "headers": [(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers],
+        }
+        # 先寫入暫存檔再替換，其他行程不會讀到寫到一半的檔案
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode("utf-8") + b"\n")
+                f.write(body)
+            os.replace(tmp_path, self._path(version, key))
+        except OSError as e:
+            logger.warning(f"Failed to write response cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def prune(self, version: int):
+        """刪除其他版本的快取檔案（其他行程可能同時刪除，忽略錯誤）"""
+        prefix = f"v{version}-"
+        for name in os.listdir(self.directory):
+            if name.endswith(".resp") and not name.startswith(prefix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+class ResponseCache:
+    """行程內的回應 LRU（所有請求共用），可搭配 DiskResponseStore"""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        version_check_interval: float = 5.0,
+        disk: Optional[DiskResponseStore] = None
+    ):
+        """
+        Args:
+            max_entries: 行程內 LRU 的最大筆數
+            version_check_interval: 檢查資料版本的間隔（秒）
+            disk: 共用磁碟後端（None 時只使用記憶體）
+        """
+        self.max_entries = max_entries
+        self.version_check_interval = version_check_interval
+        self.disk = disk
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+
+    def needs_version_check(self) -> bool:
+        """距離上次檢查版本是否已超過間隔"""
+        return time.monotonic() - self._checked_at >= self.version_check_interval
+
+    def sync_version(self, version: int) -> bool:
+        """
+        記錄最新的資料版本，版本改變時清空記憶體快取
+
+        Returns:
+            版本是否改變（呼叫端據此清除磁碟上的舊版本）
+        """
+        with self._lock:
+            changed = version != self._version
+            if changed:
+                if self._version is not None:
+                    logger.info(f"Data version changed {self._version} -> {version}, clearing response cache")
+                self._version = version
+                self._entries.clear()
+            self._checked_at = time.monotonic()
+            return changed
+
+    def invalidate(self):
+        """立即清空快取（下次請求重新讀取版本）"""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+            self._entries.clear()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is not None:
+                self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: CachedResponse):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "version": self._version}
+
+
+async def _read_catalog_version() -> int:
+    async with AsyncSessionLocal() as db:
+        return await AsyncDataVersionRepository(db).get_version()
+
+
+class ResponseCacheMiddleware:
+    """
+    快取指定路徑前綴的 GET 200 回應（ASGI middleware，不經過 BaseHTTPMiddleware 的額外串流包裝）
+
+    命中時不進入路由、不查詢資料庫；回應標頭 X-Cache 標示 HIT / MISS
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: Tuple[str, ...], cache: Optional[ResponseCache] = None):
+        """
+        Args:
+            app: 下一層 ASGI 應用
+            prefixes: 要快取的路徑前綴（例如 "/api/v1/movies"）
+            cache: ResponseCache，None 時使用全域單例
+        """
+        self.app = app
+        self.prefixes = prefixes
+        self.cache = cache or get_response_cache()
+
+    def _cacheable(self, scope: Scope) -> bool:
+        return (
+            scope["type"] == "http"
+            and scope["method"] in ("GET", "HEAD")
+            and any(scope["path"] == p or scope["path"].startswith(p + "/") for p in self.prefixes)
+        )
+
+    async def _refresh_version(self) -> int:
+        if self.cache.needs_version_check():
+            version = await _read_catalog_version()
+            if self.cache.sync_version(version) and self.cache.disk is not None:
+                await run_in_threadpool(self.cache.disk.prune, version)
+        return self.cache.version
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if not self._cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        version = await self._refresh_version()
+        query = scope.get("query_string", b"").decode("latin-1")
+        key = f"{scope['path']}?{'&'.join(sorted(query.split('&')))}" if query else scope["path"]
+        if_none_match = next(
+            (value.decode("latin-1") for name, value in scope["headers"] if name == b"if-none-match"), None
+        )
+
+        response = self.cache.get(key)
+        if response is None and self.cache.disk is not None:
+            response = await run_in_threadpool(self.cache.disk.get, version, key)
+            if response is not None:
+                self.cache.set(key, response)
+        if response is not None:
+            self.cache.count("hits")
+            await self._send(send, scope, response, if_none_match, b"HIT")
+            return
+
+        # 未命中：緩衝下層回應（目錄端點的 JSON 很小），加上 ETag 後再送出
+        self.cache.count("misses")
+        start: Dict = {}
+        chunks: List[bytes] = []
+
+        async def capture(message: Message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        body = b"".join(chunks)
+        headers = [(name, value) for name, value in start.get("headers", []) if name.lower() not in _SKIPPED_HEADERS]
+        response = (start["status"], headers, body, make_etag(body))
+        # 只快取成功回應；HEAD 沒有內容，也不快取。
+        # 路由執行期間版本可能已改變（其他請求檢查到新版本並清空快取），此時回應可能是舊資料，
+        # 存入會被當作新版本的內容，因此版本不同時不快取
+        if start["status"] == 200 and scope["method"] == "GET" and self.cache.version == version:
+            self.cache.set(key, response)
+            if self.cache.disk is not None:
+                await run_in_threadpool(self.cache.disk.put, version, key, response)
+        await self._send(send, scope, response, if_none_match, b"MISS")
+
+    async def _send(self, send: Send, scope: Scope, response: CachedResponse, if_none_match: Optional[str],
+                    cache_status: bytes):
+        status, headers, body, etag = response
+        extra = [(b"etag", etag.encode("latin-1")), (b"cache-control", b"no-cache"), (b"x-cache", cache_status)]
+        if status == 200 and etag_matches(if_none_match, etag):
+            self.cache.count("not_modified")
+            await send({"type": "http.response.start", "status": 304, "headers": extra})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if status != 200:
+            extra = [(b"x-cache", cache_status)]
+        headers = headers + [(b"content-length", str(len(body)).encode("latin-1"))] + extra
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if scope["method"] == "HEAD" else body})
+
+
+# 全域單例
+_response_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """獲取 Response Cache 單例"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            version_check_interval=settings.RESPONSE_CACHE_VERSION_CHECK_SECONDS,
+            disk=DiskResponseStore(settings.RESPONSE_CACHE_DIR) if settings.RESPONSE_CACHE_DIR else None
+        )
+    return _response_cache
@@ -0,0 +1,75 @@
+"""
+非同步資料庫 Session（SQLAlchemy AsyncSession）
+供 async 讀取端點使用，資料庫 I/O 不會佔用 threadpool 的 worker thread
+"""
+from typing import AsyncGenerator
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.config import settings
+from app.db.session import _is_sqlite_memory, _set_sqlite_pragmas
+
+# 同步 driver -> 對應的 async driver
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    """將同步資料庫 URL 轉為 async driver 的 URL（已指定 async driver 時原樣返回）"""
+    scheme, sep, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def create_async_db_engine(database_url: str = settings.DATABASE_URL) -> AsyncEngine:
+    """
+    建立非同步資料庫 engine
+    連線池大小與 SQLite pragmas 與同步 engine（create_db_engine）相同
+    """
+    async_url = to_async_url(database_url)
+    
+    if not async_url.startswith("sqlite"):
+        return create_async_engine(
+            async_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True
+        )
+    
+    connect_args = {"timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000}
+    
+    if _is_sqlite_memory(database_url):
+        sqlite_engine = create_async_engine(async_url, connect_args=connect_args)
+    else:
+        # aiosqlite 檔案資料庫預設不使用連線池（NullPool），每次請求都要重新連線與設定 pragmas
+        sqlite_engine = create_async_engine(
+            async_url,
+            connect_args=connect_args,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+    
+    event.listen(sqlite_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    return sqlite_engine
+
+
+# Create async database engine
+async_engine = create_async_db_engine()
+
+# 讀取端點不需要 commit 後重新載入物件
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,143 @@
+"""
+Movie Full-Text Search
+SQLite FTS5 全文索引（trigram tokenizer，支援中文子字串搜尋）
+
+movies_fts 是獨立的 FTS5 表，rowid 對應 movies.rowid，
+並透過 triggers 與 movies 表保持同步。
+注意：VACUUM 可能重新編號 movies.rowid，執行 VACUUM 後請呼叫 rebuild_movie_fts()。
+"""
+import logging
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "movies_fts"
+
+# trigram tokenizer 只能索引長度 >= 3 的字串，較短的查詢需退回 LIKE
+FTS_MIN_QUERY_LENGTH = 3
+
+# bm25 欄位權重：movie_id（不索引）、title、original_title、overview
+FTS_BM25_WEIGHTS = "0.0, 10.0, 5.0, 1.0"
+
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        movie_id UNINDEXED,
+        title,
+        original_title,
+        overview,
+        tokenize = 'trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ai AFTER INSERT ON movies BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, movie_id, title, original_title, overview)
+        VALUES (new.rowid, new.id, new.title, new.original_title, new.overview);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_ad AFTER DELETE ON movies BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_fts_au
+    AFTER UPDATE OF title, original_title, overview ON movies BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.rowid;
+        INSERT INTO {FTS_TABLE}(rowid, movie_id, title, original_title, overview)
+        VALUES (new.rowid, new.id, new.title, new.original_title, new.overview);
+    END
+    """,
+]
+
+# 資料庫（方言 + 路徑）-> FTS 是否可用；同一資料庫的同步與 aiosqlite engine 共用
+_fts_available: Dict[str, bool] = {}
+
+
+def _cache_key(engine: Engine) -> str:
+    return f"{engine.dialect.name}:{engine.url.database}"
+
+
+def ensure_movie_fts(engine: Engine) -> bool:
+    """
+    建立 FTS5 表與同步 triggers（可重複執行）
+    若 FTS 表為新建立，會從 movies 表回填索引
+
+    Returns:
+        FTS 是否可用（非 SQLite 或 SQLite 不支援 trigram 時為 False）
+    """
+    if engine.dialect.name != "sqlite":
+        _fts_available[_cache_key(engine)] = False
+        return False
+
+    try:
+        with engine.begin() as conn:
+            existed = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                {"name": FTS_TABLE}
+            ).first() is not None
+
+            for statement in _CREATE_STATEMENTS:
+                conn.execute(text(statement))
+
+            if not existed:
+                _populate(conn)
+    except OperationalError as e:
+        logger.warning(f"FTS5 trigram index unavailable, falling back to LIKE search: {e}")
+        _fts_available[_cache_key(engine)] = False
+        return False
+
+    _fts_available[_cache_key(engine)] = True
+    return True
+
+
+def rebuild_movie_fts(engine: Engine) -> int:
+    """
+    重建 FTS 索引（VACUUM 後或索引不一致時使用）
+
+    Returns:
+        已索引的電影數量
+    """
+    if not ensure_movie_fts(engine):
+        return 0
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        _populate(conn)
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+        return conn.execute(text(f"SELECT count(*) FROM {FTS_TABLE}")).scalar()
+
+
+def is_fts_available(engine: Engine) -> bool:
+    """檢查 engine 是否已啟用 FTS 索引（結果依資料庫快取）"""
+    key = _cache_key(engine)
+    if key not in _fts_available:
+        if engine.dialect.name != "sqlite":
+            _fts_available[key] = False
+        else:
+            with engine.connect() as conn:
+                _fts_available[key] = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE}
+                ).first() is not None
+    return _fts_available[key]
+
+
+def build_match_expression(query: str) -> str:
+    """
+    將使用者輸入轉為 FTS5 MATCH 表達式
+    整個查詢視為單一片語，等同於 LIKE '%query%' 的子字串比對
+    """
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _populate(conn) -> None:
+    """從 movies 表回填 FTS 索引"""
+    conn.execute(text(f"""
+        INSERT INTO {FTS_TABLE}(rowid, movie_id, title, original_title, overview)
+        SELECT rowid, id, title, original_title, overview FROM movies
+    """))
@@ -1,13 +1,67 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+
+def _is_sqlite_memory(database_url: str) -> bool:
+    return database_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_url
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    每個新連線的 SQLite 設定
+    WAL 讓讀取與 sync 腳本的寫入可以同時進行，busy_timeout 避免 "database is locked"
+    """
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")  # WAL 模式下安全，commit 不需 fsync
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def create_db_engine(database_url: str = settings.DATABASE_URL) -> Engine:
+    """
+    建立資料庫 engine
+    SQLite 檔案資料庫會套用連線 pragmas 與連線池大小設定
+    """
+    if not database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_pre_ping=True
+        )
+    
+    connect_args = {
+        "check_same_thread": False,  # Needed for SQLite
+        "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+    }
+    
+    if _is_sqlite_memory(database_url):
+        # 記憶體資料庫使用 SQLAlchemy 預設的連線池
+        sqlite_engine = create_engine(database_url, connect_args=connect_args)
+    else:
+        sqlite_engine = create_engine(
+            database_url,
+            connect_args=connect_args,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT
+        )
+    
+    event.listen(sqlite_engine, "connect", _set_sqlite_pragmas)
+    return sqlite_engine
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+engine = create_db_engine()
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
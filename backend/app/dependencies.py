@@ -5,14 +5,20 @@ FastAPI 依賴注入
 from typing import Generator
 from fastapi import Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import SessionLocal
-from app.repositories.movie_repository import MovieRepository
-from app.repositories.genre_repository import GenreRepository
+from app.db.async_session import get_async_db
+from app.repositories.movie_repository import MovieRepository, AsyncMovieRepository
+from app.repositories.genre_repository import AsyncGenreRepository
+from app.repositories.person_repository import AsyncPersonRepository
 from app.repositories.health_repository import HealthRepository
+from app.repositories.data_version_repository import AsyncDataVersionRepository
 from app.services.movie_service import MovieService
 from app.services.genre_service import GenreService
+from app.services.person_service import PersonService
 from app.services.health_service import HealthService
+from app.services.count_service import CountService
 
 
 def get_db() -> Generator:
@@ -29,34 +35,69 @@ def get_db() -> Generator:
 
 # Repository Dependencies
 def get_movie_repository(db: Session = Depends(get_db)) -> MovieRepository:
-    """獲取 Movie Repository"""
+    """獲取 Movie Repository（同步版本，供 AI 端點在 threadpool 中使用）"""
     return MovieRepository(db)
 
 
-def get_genre_repository(db: Session = Depends(get_db)) -> GenreRepository:
-    """獲取 Genre Repository"""
-    return GenreRepository(db)
-
-
 def get_health_repository(db: Session = Depends(get_db)) -> HealthRepository:
     """獲取 Health Repository"""
     return HealthRepository(db)
 
 
+# Async Repository Dependencies（同一請求共用一個 AsyncSession）
+def get_async_movie_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncMovieRepository:
+    """獲取 Async Movie Repository"""
+    return AsyncMovieRepository(db)
+
+
+def get_async_genre_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncGenreRepository:
+    """獲取 Async Genre Repository"""
+    return AsyncGenreRepository(db)
+
+
+def get_async_person_repository(db: AsyncSession = Depends(get_async_db)) -> AsyncPersonRepository:
+    """獲取 Async Person Repository"""
+    return AsyncPersonRepository(db)
+
+
+def get_async_data_version_repository(
+    db: AsyncSession = Depends(get_async_db)
+) -> AsyncDataVersionRepository:
+    """獲取 Async Data Version Repository"""
+    return AsyncDataVersionRepository(db)
+
+
 # Service Dependencies
-def get_movie_service(
-    movie_repo: MovieRepository = Depends(get_movie_repository),
-    genre_repo: GenreRepository = Depends(get_genre_repository)
-) -> MovieService:
-    """獲取 Movie Service"""
-    return MovieService(movie_repo, genre_repo)
+def get_count_service(
+    movie_repo: AsyncMovieRepository = Depends(get_async_movie_repository),
+    version_repo: AsyncDataVersionRepository = Depends(get_async_data_version_repository)
+) -> CountService:
+    """獲取 Count Service"""
+    return CountService(movie_repo, version_repo)
 
 
 def get_genre_service(
-    genre_repo: GenreRepository = Depends(get_genre_repository)
+    genre_repo: AsyncGenreRepository = Depends(get_async_genre_repository),
+    version_repo: AsyncDataVersionRepository = Depends(get_async_data_version_repository)
 ) -> GenreService:
     """獲取 Genre Service"""
-    return GenreService(genre_repo)
+    return GenreService(genre_repo, version_repo)
+
+
+def get_movie_service(
+    movie_repo: AsyncMovieRepository = Depends(get_async_movie_repository),
+    genre_service: GenreService = Depends(get_genre_service),
+    count_service: CountService = Depends(get_count_service)
+) -> MovieService:
+    """獲取 Movie Service"""
+    return MovieService(movie_repo, genre_service, count_service)
+
+
+def get_person_service(
+    person_repo: AsyncPersonRepository = Depends(get_async_person_repository)
+) -> PersonService:
+    """獲取 Person Service"""
+    return PersonService(person_repo)
 
 
 def get_health_service(
@@ -1,12 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.response_cache import ResponseCacheMiddleware
 from app.db.session import engine, Base
-from app.api import movie_api, genre_api, health_api, ai_api
+from app.db.movie_fts import ensure_movie_fts
+from app.api import movie_api, genre_api, person_api, health_api, ai_api
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Create full-text search index for movie search (SQLite only)
+ensure_movie_fts(engine)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
@@ -14,6 +19,18 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# 唯讀目錄端點的回應快取（ETag / 304，同步後依資料版本失效）
+# 後加入的 middleware 在外層：快取須在 CORS 之前加入，快取的回應才不含依 Origin 產生的 CORS 標頭
+if settings.RESPONSE_CACHE_ENABLED:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        prefixes=(
+            f"{settings.API_V1_PREFIX}/movies",
+            f"{settings.API_V1_PREFIX}/genres",
+            f"{settings.API_V1_PREFIX}/people",
+        ),
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +43,7 @@ app.add_middleware(
 # Include API routers
 app.include_router(movie_api.router, prefix=settings.API_V1_PREFIX)
 app.include_router(genre_api.router, prefix=settings.API_V1_PREFIX)
+app.include_router(person_api.router, prefix=settings.API_V1_PREFIX)
 app.include_router(health_api.router, prefix=settings.API_V1_PREFIX)
 app.include_router(ai_api.router, prefix=settings.API_V1_PREFIX)
 
@@ -1,19 +1,33 @@
 from .movie_model import Movie
 from .genre_model import Genre
 from .person_model import Person
+from .keyword_model import Keyword
 from .mood_tag_model import MoodTag
 from .movie_genre_model import MovieGenre
 from .movie_credit_model import MovieCredit
+from .movie_keyword_model import MovieKeyword
 from .movie_mood_model import MovieMood
 from .movie_embedding_model import MovieEmbedding
+from .data_version_model import DataVersion
+from .sync_run_model import SyncRun
+from .sync_state_model import SyncState
+from .person_stats_model import PersonStats
+from .person_top_movie_model import PersonTopMovie
 
 __all__ = [
     "Movie",
     "Genre",
     "Person",
+    "Keyword",
     "MoodTag",
     "MovieGenre",
     "MovieCredit",
+    "MovieKeyword",
     "MovieMood",
     "MovieEmbedding",
+    "DataVersion",
+    "SyncRun",
+    "SyncState",
+    "PersonStats",
+    "PersonTopMovie",
 ]
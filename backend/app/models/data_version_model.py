@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, Integer, DateTime
+from app.db.session import Base
+from datetime import datetime
+
+
+class DataVersion(Base):
+    """資料版本表 - 同步腳本更新資料後遞增版本號，用於讓行程內快取失效"""
+    __tablename__ = "data_versions"
+    
+    # Primary Key（資料範圍，例如 'catalog'）
+    name = Column(String(50), primary_key=True)
+    
+    # Data
+    version = Column(Integer, nullable=False, default=0)
+    
+    # Timestamp
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    def __repr__(self):
+        return f"<DataVersion(name={self.name}, version={self.version})>"
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, Integer
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+
+
+class Keyword(Base):
+    """關鍵字表 - 儲存 TMDB 電影關鍵字 (time travel、heist 等)，用於推薦重排序"""
+    __tablename__ = "keywords"
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # TMDB Data
+    tmdb_id = Column(Integer, unique=True, nullable=False)
+    name = Column(String(200), nullable=False, index=True)
+    
+    # Relationships
+    movies = relationship("MovieKeyword", back_populates="keyword")
+    
+    def __repr__(self):
+        return f"<Keyword(id={self.id}, name={self.name})>"
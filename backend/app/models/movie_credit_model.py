@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -6,10 +6,14 @@ from app.db.session import Base
 class MovieCredit(Base):
     """電影-演職員關聯表 - 多對多關係，區分演員與導演"""
     __tablename__ = "movie_credits"
+    __table_args__ = (
+        # 按人員查詢作品與統計參演數：覆蓋索引
+        Index("ix_movie_credits_person_role_movie", "person_id", "role", "movie_id"),
+    )
     
     # Composite Primary Key
     movie_id = Column(String(36), ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
-    person_id = Column(String(36), ForeignKey("people.id", ondelete="CASCADE"), primary_key=True, index=True)
+    person_id = Column(String(36), ForeignKey("people.id", ondelete="CASCADE"), primary_key=True)
     role = Column(String(50), primary_key=True)  # 'director' or 'actor'
     
     # Additional Data
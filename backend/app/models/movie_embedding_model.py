@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, LargeBinary, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from datetime import datetime
@@ -11,15 +11,21 @@ class MovieEmbedding(Base):
     # Primary Key (Foreign Key to movies)
     movie_id = Column(String(36), ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
     
-    # Embedding Data
-    embedding = Column(Text, nullable=False)  # JSON string of vector (384 dimensions)
+    # Embedding Data（little-endian float32/float16 bytes，768 維 float32 約 3 KB）
+    embedding = Column(LargeBinary, nullable=False)
+    dim = Column(Integer, nullable=False)
+    dtype = Column(String(10), nullable=False, default="float32")
+    model_version = Column(String(200), nullable=False)  # 產生向量的模型名稱
     embedding_text = Column(Text)  # 用於生成向量的原始文本
+    text_hash = Column(String(64))  # embedding_text 的 SHA-256，增量同步時判斷是否需要重新編碼
+    stale = Column(Boolean, nullable=False, default=False)  # 電影資料在增量 TMDB 同步中更新過，待重新檢查
     
-    # Timestamp
+    # Timestamps
     created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
     # Relationships
     movie = relationship("Movie", back_populates="embedding")
     
     def __repr__(self):
-        return f"<MovieEmbedding(movie_id={self.movie_id})>"
+        return f"<MovieEmbedding(movie_id={self.movie_id}, dim={self.dim}, dtype={self.dtype})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -6,10 +6,14 @@ from app.db.session import Base
 class MovieGenre(Base):
     """電影-類型關聯表 - 多對多關係"""
     __tablename__ = "movie_genres"
+    __table_args__ = (
+        # 按類型列表與計數：覆蓋索引，不需回表查 movie_id
+        Index("ix_movie_genres_genre_movie", "genre_id", "movie_id"),
+    )
     
     # Composite Primary Key
     movie_id = Column(String(36), ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
-    genre_id = Column(Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True, index=True)
+    genre_id = Column(Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True)
     
     # Relationships
     movie = relationship("Movie", back_populates="genres")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+
+
+class MovieKeyword(Base):
+    """電影-關鍵字關聯表 - 多對多關係"""
+    __tablename__ = "movie_keywords"
+    __table_args__ = (
+        # 按關鍵字查詢電影：覆蓋索引
+        Index("ix_movie_keywords_keyword_movie", "keyword_id", "movie_id"),
+    )
+    
+    # Composite Primary Key
+    movie_id = Column(String(36), ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    keyword_id = Column(Integer, ForeignKey("keywords.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Relationships
+    movie = relationship("Movie", back_populates="keywords")
+    keyword = relationship("Keyword", back_populates="movies")
+    
+    def __repr__(self):
+        return f"<MovieKeyword(movie_id={self.movie_id}, keyword_id={self.keyword_id})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Date, Text, DECIMAL, DateTime
+from sqlalchemy import Column, String, Integer, Date, Text, DECIMAL, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import uuid
@@ -8,6 +8,10 @@ from datetime import datetime
 class Movie(Base):
     """電影主表 - 儲存電影基本資訊"""
     __tablename__ = "movies"
+    __table_args__ = (
+        # 列表排序與 keyset 分頁 (popularity DESC, id DESC)
+        Index("ix_movies_popularity_id", "popularity", "id"),
+    )
     
     # Primary Key
     id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -33,6 +37,7 @@ class Movie(Base):
     genres = relationship("MovieGenre", back_populates="movie", cascade="all, delete-orphan")
     credits = relationship("MovieCredit", back_populates="movie", cascade="all, delete-orphan")
     moods = relationship("MovieMood", back_populates="movie", cascade="all, delete-orphan")
+    keywords = relationship("MovieKeyword", back_populates="movie", cascade="all, delete-orphan")
     embedding = relationship("MovieEmbedding", back_populates="movie", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
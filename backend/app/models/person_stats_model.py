@@ -0,0 +1,32 @@
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+from datetime import datetime
+
+
+class PersonStats(Base):
+    """演職人員統計表 - 每位人員每種角色一筆，由同步腳本從 movie_credits 重新計算（人員瀏覽不需要即時聚合）"""
+    __tablename__ = "person_stats"
+    __table_args__ = (
+        # 熱門人員列表：按角色篩選、按參與電影數排序
+        Index("ix_person_stats_role_count", "role", "movie_count", "person_id"),
+    )
+    
+    # Composite Primary Key
+    person_id = Column(String(36), ForeignKey("people.id", ondelete="CASCADE"), primary_key=True)
+    role = Column(String(50), primary_key=True)  # 'director' or 'actor'
+    
+    # Aggregates
+    movie_count = Column(Integer, nullable=False, default=0)
+    avg_rating = Column(Float)  # 參與電影的平均評分（沒有評分的電影不計入）
+    total_popularity = Column(Float)
+    latest_release_date = Column(Date)
+    
+    # Timestamp
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    # Relationships
+    person = relationship("Person")
+    
+    def __repr__(self):
+        return f"<PersonStats(person_id={self.person_id}, role={self.role}, movie_count={self.movie_count})>"
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, ForeignKey
+from sqlalchemy.orm import relationship
+from app.db.session import Base
+
+
+class PersonTopMovie(Base):
+    """人員代表作表 - 每位人員每種角色按人氣度排序的前幾部電影，與 person_stats 一起重新計算"""
+    __tablename__ = "person_top_movies"
+    
+    # Composite Primary Key
+    person_id = Column(String(36), ForeignKey("people.id", ondelete="CASCADE"), primary_key=True)
+    role = Column(String(50), primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 1 起算
+    
+    # Data
+    movie_id = Column(String(36), ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
+    
+    # Relationships
+    movie = relationship("Movie")
+    
+    def __repr__(self):
+        return f"<PersonTopMovie(person_id={self.person_id}, role={self.role}, rank={self.rank})>"
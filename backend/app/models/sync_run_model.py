@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
+from app.db.session import Base
+from datetime import datetime
+
+
+class SyncRun(Base):
+    """同步執行紀錄表 - 每次執行 sync_tmdb.py 一筆，記錄統計與增量同步的 watermark"""
+    __tablename__ = "sync_runs"
+    __table_args__ = (
+        # 查詢最近一次成功執行的 watermark
+        Index("ix_sync_runs_status_watermark", "status", "watermark"),
+    )
+    
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    
+    # Run Info
+    mode = Column(String(20), nullable=False)  # 'full' or 'delta'
+    status = Column(String(20), nullable=False, default="running")  # 'running'、'succeeded'、'failed'
+    watermark = Column(DateTime)  # 本次涵蓋到的時間點（開始時間），下次增量同步從這裡開始
+    
+    # Statistics
+    changes_seen = Column(Integer, nullable=False, default=0)  # 變更 feed 中的電影數（delta）
+    movies_added = Column(Integer, nullable=False, default=0)
+    movies_updated = Column(Integer, nullable=False, default=0)
+    embeddings_marked_stale = Column(Integer, nullable=False, default=0)
+    api_requests = Column(Integer, nullable=False, default=0)
+    api_failures = Column(Integer, nullable=False, default=0)
+    error = Column(Text)
+    
+    # Timestamps
+    started_at = Column(DateTime, default=datetime.now)
+    finished_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<SyncRun(id={self.id}, mode={self.mode}, status={self.status})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
+from app.db.session import Base
+from datetime import datetime
+
+
+class SyncState(Base):
+    """同步進度表 - 每個 TMDB 列表端點一筆，記錄最後完成的頁碼，讓中斷的同步從該頁之後繼續"""
+    __tablename__ = "sync_states"
+    
+    # Primary Key（端點，例如 'popular'）
+    endpoint = Column(String(50), primary_key=True)
+    
+    # Progress
+    run_id = Column(Integer, ForeignKey("sync_runs.id"))  # 最後推進進度的執行紀錄
+    last_completed_page = Column(Integer, nullable=False, default=0)
+    total_pages = Column(Integer)  # TMDB 回報的總頁數
+    status = Column(String(20), nullable=False, default="in_progress")  # 'in_progress' or 'completed'
+    failed_tmdb_ids = Column(JSON, nullable=False, default=list)  # 詳細資料獲取失敗、下次同步先重試的電影
+    
+    # Timestamp
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    def __repr__(self):
+        return f"<SyncState(endpoint={self.endpoint}, page={self.last_completed_page}, status={self.status})>"
@@ -0,0 +1,57 @@
+"""
+Data Version Repository
+負責資料版本號的讀取與遞增
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.data_version_model import DataVersion
+
+# 電影目錄（movies、genres、credits）的版本名稱
+CATALOG = "catalog"
+
+
+class DataVersionRepository:
+    """資料版本存取層"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_version(self, name: str = CATALOG) -> int:
+        """獲取目前版本號，尚未記錄時返回 0"""
+        version = (
+            self.db.query(DataVersion.version)
+            .filter(DataVersion.name == name)
+            .scalar()
+        )
+        return version or 0
+    
+    def bump_version(self, name: str = CATALOG) -> int:
+        """
+        遞增版本號（由呼叫端負責 commit）
+        
+        Returns:
+            遞增後的版本號
+        """
+        record = self.db.query(DataVersion).filter(DataVersion.name == name).first()
+        if record:
+            record.version += 1
+        else:
+            record = DataVersion(name=name, version=1)
+            self.db.add(record)
+        self.db.flush()
+        return record.version
+
+
+class AsyncDataVersionRepository:
+    """資料版本存取層（非同步版本，只讀）"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_version(self, name: str = CATALOG) -> int:
+        """獲取目前版本號，尚未記錄時返回 0"""
+        result = await self.db.execute(
+            select(DataVersion.version).where(DataVersion.name == name)
+        )
+        return result.scalar() or 0
@@ -0,0 +1,158 @@
+"""
+Embedding Repository
+負責電影向量（movie_embeddings）的讀寫
+"""
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.movie_embedding_model import MovieEmbedding
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+def pack_embedding(vector: np.ndarray, dtype: str = "float32") -> bytes:
+    """向量轉為 little-endian bytes"""
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    return np.asarray(vector, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+def hash_text(text: str) -> str:
+    """向量文本的 SHA-256（文本未改變時不需要重新編碼）"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def unpack_embedding(blob: bytes, dim: int, dtype: str = "float32") -> np.ndarray:
+    """bytes 轉回 float32 向量"""
+    vector = np.frombuffer(blob, dtype=np.dtype(dtype).newbyteorder("<"))
+    if vector.shape[0] != dim:
+        raise ValueError(f"Embedding has {vector.shape[0]} values, expected {dim}")
+    return vector.astype(np.float32)
+
+
+class EmbeddingRepository:
+    """電影向量資料存取層"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def upsert_embeddings(
+        self,
+        movie_ids: List[str],
+        vectors: np.ndarray,
+        texts: List[str],
+        model_version: str,
+        dtype: str = "float32"
+    ) -> int:
+        """
+        新增或更新一批電影向量（由呼叫端負責 commit）
+        
+        Returns:
+            寫入的筆數
+        """
+        existing = {
+            record.movie_id: record
+            for record in self.db.query(MovieEmbedding).filter(MovieEmbedding.movie_id.in_(movie_ids))
+        }
+        
+        for movie_id, vector, text in zip(movie_ids, vectors, texts):
+            record = existing.get(movie_id)
+            if record is None:
+                record = MovieEmbedding(movie_id=movie_id)
+                self.db.add(record)
+            record.embedding = pack_embedding(vector, dtype)
+            record.dim = int(vector.shape[-1])
+            record.dtype = dtype
+            record.model_version = model_version
+            record.embedding_text = text
+            record.text_hash = hash_text(text)
+            record.stale = False
+        
+        self.db.flush()
+        return len(movie_ids)
+    
+    def get_embeddings(self, movie_ids: List[str]) -> Dict[str, np.ndarray]:
+        """根據 movie_id 讀取向量 {movie_id: float32 向量}"""
+        rows = (
+            self.db.query(
+                MovieEmbedding.movie_id,
+                MovieEmbedding.embedding,
+                MovieEmbedding.dim,
+                MovieEmbedding.dtype
+            )
+            .filter(MovieEmbedding.movie_id.in_(movie_ids))
+            .all()
+        )
+        return {row.movie_id: unpack_embedding(row.embedding, row.dim, row.dtype) for row in rows}
+    
+    def load_all(self, model_version: Optional[str] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        一次讀取所有向量
+        
+        Args:
+            model_version: 只讀取指定模型產生的向量（None 為全部）
+            
+        Returns:
+            (movie_ids, float32 向量矩陣 (n, dim))
+        """
+        query = self.db.query(
+            MovieEmbedding.movie_id,
+            MovieEmbedding.embedding,
+            MovieEmbedding.dim,
+            MovieEmbedding.dtype
+        )
+        if model_version is not None:
+            query = query.filter(MovieEmbedding.model_version == model_version)
+        rows = query.order_by(MovieEmbedding.movie_id).all()
+        
+        if not rows:
+            return [], np.empty((0, 0), dtype=np.float32)
+        
+        formats = {(row.dim, row.dtype) for row in rows}
+        if len(formats) > 1:
+            raise ValueError(f"Mixed embedding formats in movie_embeddings: {sorted(formats)}")
+        dim, dtype = formats.pop()
+        
+        # 串接後一次轉換，避免逐筆建立小陣列
+        matrix = np.frombuffer(
+            b"".join(row.embedding for row in rows),
+            dtype=np.dtype(dtype).newbyteorder("<")
+        ).reshape(len(rows), dim)
+        return [row.movie_id for row in rows], matrix.astype(np.float32)
+    
+    def count(self, model_version: Optional[str] = None) -> int:
+        """向量數量"""
+        query = self.db.query(MovieEmbedding)
+        if model_version is not None:
+            query = query.filter(MovieEmbedding.model_version == model_version)
+        return query.count()
+    
+    def mark_stale(self, movie_ids: List[str]) -> int:
+        """
+        標記電影向量為待重新檢查（TMDB 增量同步更新電影後呼叫，由呼叫端負責 commit）
+        
+        Returns:
+            標記的向量數量（尚無向量的電影不計）
+        """
+        if not movie_ids:
+            return 0
+        return (
+            self.db.query(MovieEmbedding)
+            .filter(MovieEmbedding.movie_id.in_(movie_ids))
+            .update({MovieEmbedding.stale: True}, synchronize_session=False)
+        )
+    
+    def clear_stale(self, movie_ids: List[str]) -> int:
+        """清除已重新檢查（文本未改變）的向量的 stale 標記（由呼叫端負責 commit）"""
+        if not movie_ids:
+            return 0
+        return (
+            self.db.query(MovieEmbedding)
+            .filter(MovieEmbedding.movie_id.in_(movie_ids), MovieEmbedding.stale.is_(True))
+            .update({MovieEmbedding.stale: False}, synchronize_session=False)
+        )
+    
+    def count_stale(self) -> int:
+        """待重新檢查的向量數量"""
+        return self.db.query(MovieEmbedding).filter(MovieEmbedding.stale.is_(True)).count()
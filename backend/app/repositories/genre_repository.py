@@ -3,7 +3,9 @@ Genre Repository
 負責電影類型相關的資料庫操作
 """
 from typing import List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.genre_model import Genre
 
 
@@ -24,3 +26,19 @@ class GenreRepository:
     def get_genre_by_tmdb_id(self, tmdb_id: int) -> Optional[Genre]:
         """根據 TMDB ID 獲取類型"""
         return self.db.query(Genre).filter(Genre.tmdb_id == tmdb_id).first()
+
+
+class AsyncGenreRepository:
+    """電影類型資料存取層（非同步版本）"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_all_genres(self) -> List[Genre]:
+        """獲取所有電影類型"""
+        result = await self.db.execute(select(Genre).order_by(Genre.name))
+        return result.scalars().all()
+    
+    async def get_genre_by_id(self, genre_id: int) -> Optional[Genre]:
+        """根據 ID 獲取類型"""
+        return await self.db.get(Genre, genre_id)
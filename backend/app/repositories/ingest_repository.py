@@ -0,0 +1,186 @@
+"""
+Ingest Repository
+TMDB 同步的批量寫入：以 IN 查詢解析既有資料，以 INSERT ... ON CONFLICT 批量寫入電影、人員、關鍵字與關聯（類型、演職人員、關鍵字）
+（executemany 由 SQLAlchemy 合併為多列 INSERT，並依資料庫的參數上限自動分批）
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.keyword_model import Keyword
+from app.models.movie_credit_model import MovieCredit
+from app.models.movie_genre_model import MovieGenre
+from app.models.movie_keyword_model import MovieKeyword
+from app.models.movie_model import Movie
+from app.models.person_model import Person
+
+# 單一 IN 查詢的參數上限（SQLite 預設 32766，保留餘裕）
+IN_CHUNK_SIZE = 1000
+
+# 電影 upsert 時更新的欄位（id、tmdb_id、created_at 保持不變）
+MOVIE_UPDATE_COLUMNS = (
+    "title", "original_title", "overview", "release_date", "runtime",
+    "vote_average", "vote_count", "popularity", "poster_path", "backdrop_path",
+)
+
+
+def _chunks(values: List, size: int = IN_CHUNK_SIZE) -> Iterable[List]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class IdentityCache:
+    """
+    同步期間的 tmdb_id → 本地 id 快取（電影、人員、關鍵字、類型）
+    以 preload() 每個資料表一次查詢載入，寫入新資料列時同步更新，
+    整個同步流程（各列表端點）共用；寫入失敗回滾後不應繼續使用
+    """
+
+    def __init__(self):
+        self.movies: Dict[int, str] = {}
+        self.people: Dict[int, str] = {}
+        self.keywords: Dict[int, int] = {}
+        self.genres: Dict[int, int] = {}
+
+    @classmethod
+    def preload(cls, db: Session) -> "IdentityCache":
+        cache = cls()
+        cache.movies = dict(db.execute(select(Movie.tmdb_id, Movie.id)).all())
+        cache.people = dict(db.execute(select(Person.tmdb_id, Person.id)).all())
+        cache.keywords = dict(db.execute(select(Keyword.tmdb_id, Keyword.id)).all())
+        return cache
+
+
+class IngestRepository:
+    """TMDB 同步批量寫入層（由呼叫端負責 commit）"""
+
+    def __init__(self, db: Session, cache: Optional[IdentityCache] = None):
+        """
+        Args:
+            db: 資料庫 Session
+            cache: 已預先載入的 IdentityCache；提供時以快取取代 IN 查詢
+        """
+        self.db = db
+        self.cache = cache
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            self._insert = sqlite.insert
+        elif dialect == "postgresql":
+            self._insert = postgresql.insert
+        else:
+            raise ValueError(f"Bulk ingest does not support dialect: {dialect}")
+
+    def _lookup(self, column_key, column_value, keys: Iterable) -> Dict:
+        """以分段 IN 查詢返回 {key: value}"""
+        keys = list(keys)
+        result = {}
+        for chunk in _chunks(keys):
+            result.update(self.db.execute(select(column_key, column_value).where(column_key.in_(chunk))).all())
+        return result
+
+    def existing_movie_tmdb_ids(self, tmdb_ids: Iterable[int]) -> Set[int]:
+        """已入庫的電影 TMDB ID"""
+        if self.cache is not None:
+            return {tmdb_id for tmdb_id in tmdb_ids if tmdb_id in self.cache.movies}
+        return set(self._lookup(Movie.tmdb_id, Movie.id, tmdb_ids))
+
+    def upsert_movies(self, movies: List[Dict]) -> Dict[int, str]:
+        """
+        新增或更新電影（以 tmdb_id 判斷，已存在時保留原本的 id）
+
+        Args:
+            movies: Movie 欄位的字典列表（需包含 tmdb_id）
+
+        Returns:
+            {tmdb_id: 電影 id}
+        """
+        rows = list({row["tmdb_id"]: row for row in movies}.values())
+        if not rows:
+            return {}
+        now = datetime.now()
+        for row in rows:
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault("created_at", now)
+            row["updated_at"] = now
+
+        stmt = self._insert(Movie)
+        set_ = {column: stmt.excluded[column] for column in MOVIE_UPDATE_COLUMNS}
+        set_["updated_at"] = stmt.excluded.updated_at
+        stmt = stmt.on_conflict_do_update(index_elements=[Movie.tmdb_id], set_=set_).returning(Movie.tmdb_id, Movie.id)
+        movie_ids = dict(self.db.execute(stmt, rows).all())
+        if self.cache is not None:
+            self.cache.movies.update(movie_ids)
+        return movie_ids
+
+    def resolve_people(self, people: Dict[int, Dict]) -> Dict[int, str]:
+        """
+        解析已存在的人員（有快取時不查詢，否則一次 IN 查詢），其餘批量新增
+
+        Args:
+            people: {tmdb_id: {"name", "profile_path"}}
+
+        Returns:
+            {tmdb_id: 人員 id}
+        """
+        return self._resolve(
+            Person, people, self.cache.people if self.cache is not None else None,
+            lambda tmdb_id, data: {"id": str(uuid.uuid4()), "tmdb_id": tmdb_id, "name": data.get("name") or "",
+                                   "profile_path": data.get("profile_path")}
+        )
+
+    def resolve_keywords(self, keywords: Dict[int, str]) -> Dict[int, int]:
+        """
+        解析已存在的關鍵字（有快取時不查詢，否則一次 IN 查詢），其餘批量新增
+
+        Args:
+            keywords: {tmdb_id: name}
+
+        Returns:
+            {tmdb_id: 關鍵字 id}
+        """
+        return self._resolve(
+            Keyword, keywords, self.cache.keywords if self.cache is not None else None,
+            lambda tmdb_id, name: {"tmdb_id": tmdb_id, "name": name or ""}
+        )
+
+    def _resolve(self, model, items: Dict, cached: Optional[Dict], make_row: Callable[[int, Any], Dict]) -> Dict:
+        """
+        tmdb_id → id 解析的共用流程
+
+        Args:
+            model: Person 或 Keyword
+            items: {tmdb_id: TMDB 資料}
+            cached: 快取中的映射（就地更新），None 時以 IN 查詢
+            make_row: 由 tmdb_id 與 TMDB 資料產生新資料列
+        """
+        known = cached if cached is not None else self._lookup(model.tmdb_id, model.id, items)
+        rows = [make_row(tmdb_id, data) for tmdb_id, data in items.items() if tmdb_id not in known]
+        if rows:
+            stmt = (
+                self._insert(model)
+                .on_conflict_do_nothing(index_elements=[model.tmdb_id])
+                .returning(model.tmdb_id, model.id)
+            )
+            inserted = dict(self.db.execute(stmt, rows).all())
+            # 其他程序已先寫入的資料列不會返回，改以 IN 查詢取得其 id
+            conflicted = [row["tmdb_id"] for row in rows if row["tmdb_id"] not in inserted]
+            if conflicted:
+                inserted.update(self._lookup(model.tmdb_id, model.id, conflicted))
+            known.update(inserted)
+        return {tmdb_id: known[tmdb_id] for tmdb_id in items}
+
+    def delete_links(self, movie_ids: Iterable[str]) -> None:
+        """刪除電影的類型、關鍵字與演職人員關聯（重新寫入更新後的電影前呼叫）"""
+        movie_ids = list(movie_ids)
+        for model in (MovieGenre, MovieKeyword, MovieCredit):
+            for chunk in _chunks(movie_ids):
+                self.db.execute(delete(model).where(model.movie_id.in_(chunk)))
+
+    def insert_links(self, model, rows: List[Dict]) -> None:
+        """批量新增關聯（MovieGenre、MovieCredit、MovieKeyword），主鍵重複時略過"""
+        if rows:
+            self.db.execute(self._insert(model).on_conflict_do_nothing(), rows)
@@ -1,14 +1,41 @@
 """
 Movie Repository
 負責電影相關的資料庫操作
+
+查詢語句由模組層級的 builder 函式建立，同步（Session）與非同步（AsyncSession）
+兩種 Repository 共用相同的 SQL；非同步版本的列表查詢只選取列表欄位（Row），
+不建立 ORM 物件，供 API 的快速序列化路徑使用
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, func
+from typing import Dict, List, Optional, Tuple, Any
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, or_, func, text, tuple_, String, Float, Row, Select
+from app.db.movie_fts import (
+    FTS_TABLE,
+    FTS_BM25_WEIGHTS,
+    FTS_MIN_QUERY_LENGTH,
+    build_match_expression,
+    is_fts_available,
+)
 from app.models.movie_model import Movie
 from app.models.movie_genre_model import MovieGenre
 from app.models.movie_credit_model import MovieCredit
 
+# Keyset 分頁游標：(popularity, id)，對應 ix_movies_popularity_id 索引
+MovieCursor = Tuple[Any, str]
+
+# 列表回應需要的欄位（對應 MovieListItem，不含類型）
+LIST_COLUMNS = (
+    Movie.id,
+    Movie.tmdb_id,
+    Movie.title,
+    Movie.original_title,
+    Movie.release_date,
+    Movie.vote_average,
+    Movie.popularity,
+    Movie.poster_path,
+)
+
 
 class MovieRepository:
     """電影資料存取層"""
@@ -21,86 +48,289 @@ class MovieRepository:
         根據 ID 獲取電影詳細資訊
         使用 joinedload 預載關聯資料，避免 N+1 查詢問題
         """
-        return (
-            self.db.query(Movie)
-            .options(
-                joinedload(Movie.genres).joinedload(MovieGenre.genre),
-                joinedload(Movie.credits).joinedload(MovieCredit.person)
-            )
-            .filter(Movie.id == movie_id)
-            .first()
-        )
+        return self.db.execute(_movie_detail_stmt(movie_id)).unique().scalars().first()
     
-    def get_movies(self, skip: int = 0, limit: int = 20) -> List[Movie]:
+    def get_movies(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[MovieCursor] = None
+    ) -> List[Movie]:
         """
         獲取電影列表（分頁）
-        按照人氣度排序
+        按照人氣度排序；傳入 after 時使用 keyset 分頁並忽略 skip
         """
-        return (
-            self.db.query(Movie)
-            .options(
-                joinedload(Movie.genres).joinedload(MovieGenre.genre)
-            )
-            .order_by(Movie.popularity.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        return self.db.execute(_movies_stmt(skip, limit, after)).scalars().all()
     
     def get_total_count(self) -> int:
         """獲取電影總數"""
-        return self.db.query(func.count(Movie.id)).scalar()
+        return self.db.execute(_total_count_stmt()).scalar()
     
-    def search_movies(self, query: str, skip: int = 0, limit: int = 20) -> List[Movie]:
+    def search_movies(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[MovieCursor] = None,
+        keyset: bool = False
+    ) -> List[Movie]:
         """
         搜尋電影（支援中文）
-        在 title 和 original_title 中搜尋
+        在 title、original_title 和 overview 中搜尋
+        使用 FTS5 索引時按相關度（bm25）排序，否則按人氣度排序；
+        keyset=True 時（游標分頁，包含 after 為 None 的第一頁）一律按人氣度排序
         """
-        search_pattern = f"%{query}%"
-        return (
-            self.db.query(Movie)
-            .options(
-                joinedload(Movie.genres).joinedload(MovieGenre.genre)
-            )
-            .filter(
-                or_(
-                    Movie.title.like(search_pattern),
-                    Movie.original_title.like(search_pattern),
-                    Movie.overview.like(search_pattern)
-                )
-            )
-            .order_by(Movie.popularity.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        stmt = _search_stmt(query, self._use_fts(query), skip, limit, after, keyset=keyset)
+        return self.db.execute(stmt).scalars().all()
     
     def search_count(self, query: str) -> int:
         """獲取搜尋結果總數"""
-        search_pattern = f"%{query}%"
-        return (
-            self.db.query(func.count(Movie.id))
-            .filter(
-                or_(
-                    Movie.title.like(search_pattern),
-                    Movie.original_title.like(search_pattern),
-                    Movie.overview.like(search_pattern)
-                )
-            )
-            .scalar()
-        )
+        return self.db.execute(_search_count_stmt(query, self._use_fts(query))).scalar()
     
-    def get_movies_by_genre(self, genre_id: int, skip: int = 0, limit: int = 20) -> List[Movie]:
+    def get_movies_by_genre(
+        self,
+        genre_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[MovieCursor] = None
+    ) -> List[Movie]:
         """根據類型獲取電影"""
+        return self.db.execute(_movies_by_genre_stmt(genre_id, skip, limit, after)).scalars().all()
+    
+    def get_genre_counts(self) -> Dict[int, int]:
+        """一次查詢獲取所有類型的電影數量 {genre_id: count}（只掃描 movie_genres.genre_id 索引）"""
+        rows = self.db.execute(_genre_counts_stmt()).all()
+        return {genre_id: count for genre_id, count in rows}
+    
+    def _use_fts(self, query: str) -> bool:
+        """查詢長度足夠且資料庫已建立 FTS 索引時使用全文搜尋"""
         return (
-            self.db.query(Movie)
-            .join(Movie.genres)
-            .filter(MovieGenre.genre_id == genre_id)
-            .options(
-                joinedload(Movie.genres).joinedload(MovieGenre.genre)
+            len(query.strip()) >= FTS_MIN_QUERY_LENGTH
+            and is_fts_available(self.db.get_bind())
+        )
+
+
+class AsyncMovieRepository:
+    """電影資料存取層（非同步版本，供 async 讀取端點使用）"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_movie_by_id(self, movie_id: str) -> Optional[Movie]:
+        """根據 ID 獲取電影詳細資訊（含類型、演職人員）"""
+        result = await self.db.execute(_movie_detail_stmt(movie_id))
+        return result.unique().scalars().first()
+    
+    async def get_movies(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[MovieCursor] = None
+    ) -> List[Row]:
+        """獲取電影列表（分頁），按照人氣度排序；返回 LIST_COLUMNS 的 Row"""
+        result = await self.db.execute(_movies_stmt(skip, limit, after, rows=True))
+        return result.all()
+    
+    async def get_total_count(self) -> int:
+        """獲取電影總數"""
+        return (await self.db.execute(_total_count_stmt())).scalar()
+    
+    async def search_movies(
+        self,
+        query: str,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[MovieCursor] = None,
+        keyset: bool = False
+    ) -> List[Row]:
+        """搜尋電影（支援中文），排序規則同 MovieRepository.search_movies；返回 LIST_COLUMNS 的 Row"""
+        stmt = _search_stmt(query, await self._use_fts(query), skip, limit, after, rows=True, keyset=keyset)
+        result = await self.db.execute(stmt)
+        return result.all()
+    
+    async def search_count(self, query: str) -> int:
+        """獲取搜尋結果總數"""
+        stmt = _search_count_stmt(query, await self._use_fts(query))
+        return (await self.db.execute(stmt)).scalar()
+    
+    async def get_movies_by_genre(
+        self,
+        genre_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[MovieCursor] = None
+    ) -> List[Row]:
+        """根據類型獲取電影；返回 LIST_COLUMNS 的 Row"""
+        result = await self.db.execute(_movies_by_genre_stmt(genre_id, skip, limit, after, rows=True))
+        return result.all()
+    
+    async def get_genre_ids_for_movies(self, movie_ids: List[str]) -> Dict[str, List[int]]:
+        """
+        一次查詢獲取多部電影的類型 ID（類型名稱由 GenreRegistry 查詢）
+        
+        Returns:
+            {movie_id: [genre_id]}
+        """
+        if not movie_ids:
+            return {}
+        rows = (await self.db.execute(_movie_genre_ids_stmt(movie_ids))).all()
+        return _group_genre_ids(rows)
+    
+    async def get_genre_counts(self) -> Dict[int, int]:
+        """一次查詢獲取所有類型的電影數量 {genre_id: count}"""
+        rows = (await self.db.execute(_genre_counts_stmt())).all()
+        return {genre_id: count for genre_id, count in rows}
+    
+    async def _use_fts(self, query: str) -> bool:
+        """查詢長度足夠且資料庫已建立 FTS 索引時使用全文搜尋"""
+        if len(query.strip()) < FTS_MIN_QUERY_LENGTH:
+            return False
+        return await self.db.run_sync(lambda session: is_fts_available(session.get_bind()))
+
+
+# ---------------------------------------------------------------------------
+# Statement builders（同步與非同步 Repository 共用）
+# ---------------------------------------------------------------------------
+
+def _movie_detail_stmt(movie_id: str) -> Select:
+    return (
+        select(Movie)
+        .options(
+            joinedload(Movie.genres).joinedload(MovieGenre.genre),
+            joinedload(Movie.credits).joinedload(MovieCredit.person)
+        )
+        .where(Movie.id == movie_id)
+    )
+
+
+def _movies_stmt(skip: int, limit: int, after: Optional[MovieCursor], rows: bool = False) -> Select:
+    return _paginate(_list_select(rows), skip, limit, after)
+
+
+def _total_count_stmt() -> Select:
+    return select(func.count(Movie.id))
+
+
+def _search_stmt(
+    query: str,
+    use_fts: bool,
+    skip: int,
+    limit: int,
+    after: Optional[MovieCursor],
+    rows: bool = False,
+    keyset: bool = False
+) -> Select:
+    """
+    搜尋結果：FTS 預設按相關度排序；keyset 分頁的每一頁（包含第一頁）都必須與游標使用相同的
+    (popularity, id) 順序，否則第一頁最後一筆產生的游標會造成後續頁重複或遺漏
+    """
+    movies = _list_select(rows)
+
+    if use_fts:
+        matches = _fts_matches(query)
+        movies = movies.join(matches, matches.c.movie_id == Movie.id)
+        if not keyset and after is None:
+            return (
+                movies
+                .order_by(matches.c.rank, Movie.popularity.desc(), Movie.id.desc())
+                .offset(skip)
+                .limit(limit)
             )
-            .order_by(Movie.popularity.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+    else:
+        movies = movies.where(_like_filter(query))
+
+    return _paginate(movies, skip, limit, after)
+
+
+def _search_count_stmt(query: str, use_fts: bool):
+    if use_fts:
+        return text(
+            f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        ).bindparams(match=build_match_expression(query))
+    return select(func.count(Movie.id)).where(_like_filter(query))
+
+
+def _movies_by_genre_stmt(
+    genre_id: int,
+    skip: int,
+    limit: int,
+    after: Optional[MovieCursor],
+    rows: bool = False
+) -> Select:
+    stmt = (
+        _list_select(rows)
+        .join(Movie.genres)
+        .where(MovieGenre.genre_id == genre_id)
+    )
+    return _paginate(stmt, skip, limit, after)
+
+
+def _movie_genre_ids_stmt(movie_ids: List[str]) -> Select:
+    return select(MovieGenre.movie_id, MovieGenre.genre_id).where(MovieGenre.movie_id.in_(movie_ids))
+
+
+def _group_genre_ids(rows) -> Dict[str, List[int]]:
+    """(movie_id, genre_id) → {movie_id: [genre_id]}"""
+    by_movie: Dict[str, List[int]] = {}
+    for movie_id, genre_id in rows:
+        by_movie.setdefault(movie_id, []).append(genre_id)
+    return by_movie
+
+
+def _genre_counts_stmt() -> Select:
+    return select(MovieGenre.genre_id, func.count()).group_by(MovieGenre.genre_id)
+
+
+def _list_select(rows: bool) -> Select:
+    """列表查詢的 SELECT：rows=True 時只選取 LIST_COLUMNS，否則返回預載類型的 Movie"""
+    if rows:
+        return select(*LIST_COLUMNS)
+    return select(Movie).options(_genres_loader())
+
+
+def _genres_loader():
+    """
+    列表查詢的類型預載策略
+    使用 selectinload（額外一次 IN 查詢），避免 joinedload + LIMIT 產生子查詢包裝
+    """
+    return selectinload(Movie.genres).joinedload(MovieGenre.genre)
+
+
+def _paginate(stmt: Select, skip: int, limit: int, after: Optional[MovieCursor]) -> Select:
+    """
+    按 (popularity, id) 降序分頁
+    after 為上一頁最後一筆的 (popularity, id)，使用 keyset 條件取代 OFFSET；
+    popularity 為 NULL 的電影不會出現在 keyset 分頁結果中
+    """
+    stmt = stmt.order_by(Movie.popularity.desc(), Movie.id.desc())
+    if after is not None:
+        stmt = stmt.where(tuple_(Movie.popularity, Movie.id) < tuple_(*after))
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def _fts_matches(query: str):
+    """FTS 比對結果子查詢：(movie_id, rank)，rank 越小越相關"""
+    return (
+        text(
+            f"SELECT movie_id, bm25({FTS_TABLE}, {FTS_BM25_WEIGHTS}) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
         )
+        .bindparams(match=build_match_expression(query))
+        .columns(movie_id=String, rank=Float)
+        .subquery("fts_matches")
+    )
+
+
+def _like_filter(query: str):
+    """
+    LIKE 子字串比對（FTS 不可用或查詢少於 3 個字時的後備方案）
+    使用 ILIKE：PostgreSQL 的 LIKE 區分大小寫，與 SQLite 行為不一致
+    """
+    search_pattern = f"%{query}%"
+    return or_(
+        Movie.title.ilike(search_pattern),
+        Movie.original_title.ilike(search_pattern),
+        Movie.overview.ilike(search_pattern)
+    )
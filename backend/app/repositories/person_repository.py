@@ -1,12 +1,24 @@
 """
 Person Repository
 負責演職人員相關的資料庫操作
+
+人員列表與統計讀取預先計算的 person_stats / person_top_movies，
+由同步腳本在每次同步後以 refresh_stats() 從 movie_credits 重新計算
 """
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import DateTime, and_, case, delete, func, insert, literal, or_, select, Row, Select
+from app.models.movie_model import Movie
 from app.models.person_model import Person
 from app.models.movie_credit_model import MovieCredit
+from app.models.person_stats_model import PersonStats
+from app.models.person_top_movie_model import PersonTopMovie
+from app.repositories.movie_repository import LIST_COLUMNS
+
+# 每位人員每種角色保留的代表作數量
+TOP_MOVIES_PER_PERSON = 5
 
 
 class PersonRepository:
@@ -30,15 +42,150 @@ class PersonRepository:
     
     def get_popular_actors(self, limit: int = 10) -> List[tuple]:
         """
-        獲取熱門演員
+        獲取熱門演員（讀取 person_stats，不在查詢時聚合 movie_credits）
         返回 (Person, 電影數量) 的列表
         """
-        return (
-            self.db.query(Person, func.count(MovieCredit.id).label('movie_count'))
-            .join(MovieCredit)
-            .filter(MovieCredit.role == 'actor')
-            .group_by(Person.id)
-            .order_by(func.count(MovieCredit.id).desc())
-            .limit(limit)
-            .all()
+        return self.db.execute(_people_stmt("actor", 0, limit, with_stats=False)).all()
+    
+    def get_credit_edges(self, max_cast: int = 10) -> List[Row]:
+        """
+        電影與人員的關聯（所有導演 + 每部電影排名前 max_cast 的演員），供相似電影的合作關係圖使用
+        返回 (movie_id, person_id, role) 的 Row
+        """
+        stmt = select(MovieCredit.movie_id, MovieCredit.person_id, MovieCredit.role).where(
+            or_(
+                MovieCredit.role == "director",
+                and_(MovieCredit.role == "actor", func.coalesce(MovieCredit.order_num, max_cast) < max_cast)
+            )
+        )
+        return self.db.execute(stmt).all()
+    
+    def refresh_stats(self) -> Dict[str, int]:
+        """
+        從 movie_credits 重新計算 person_stats 與 person_top_movies（由呼叫端負責 commit）
+        
+        兩張表整批替換：一次 GROUP BY 計算統計，一次視窗函數（ROW_NUMBER）取得每人的代表作，
+        與同步寫入在同一個交易中提交，API 不會讀到只更新一半的統計
+        
+        Returns:
+            {"person_stats": 筆數, "person_top_movies": 筆數}
+        """
+        now = datetime.now()
+        # INSERT ... SELECT 不會觸發 autoflush：先寫出同一個 Session 中尚未 flush 的演職人員
+        self.db.flush()
+        self.db.execute(delete(PersonTopMovie))
+        self.db.execute(delete(PersonStats))
+        
+        stats = self.db.execute(
+            insert(PersonStats).from_select(
+                ["person_id", "role", "movie_count", "avg_rating", "total_popularity",
+                 "latest_release_date", "updated_at"],
+                _person_stats_select(now)
+            )
+        )
+        top_movies = self.db.execute(
+            insert(PersonTopMovie).from_select(
+                ["person_id", "role", "rank", "movie_id"],
+                _person_top_movies_select(TOP_MOVIES_PER_PERSON)
+            )
         )
+        return {"person_stats": stats.rowcount, "person_top_movies": top_movies.rowcount}
+
+
+class AsyncPersonRepository:
+    """演職人員資料存取層（非同步版本，供 async 讀取端點使用）"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_person_by_id(self, person_id: str) -> Optional[Person]:
+        """根據 ID 獲取演職人員（不載入參與的電影）"""
+        return await self.db.get(Person, person_id)
+    
+    async def get_people(self, role: str, skip: int = 0, limit: int = 20) -> List[Row]:
+        """
+        按角色列出人員，依參與電影數排序（ix_person_stats_role_count 索引）
+        返回 (Person, PersonStats) 的 Row
+        """
+        result = await self.db.execute(_people_stmt(role, skip, limit))
+        return result.all()
+    
+    async def count_people(self, role: str) -> int:
+        """某種角色的人員總數"""
+        stmt = select(func.count()).select_from(PersonStats).where(PersonStats.role == role)
+        return (await self.db.execute(stmt)).scalar()
+    
+    async def get_stats(self, person_id: str) -> List[PersonStats]:
+        """人員各角色的統計（按角色排序）"""
+        stmt = select(PersonStats).where(PersonStats.person_id == person_id).order_by(PersonStats.role)
+        return (await self.db.execute(stmt)).scalars().all()
+    
+    async def get_top_movies(self, person_id: str) -> List[Row]:
+        """
+        人員各角色的代表作
+        返回 (role, rank, LIST_COLUMNS...) 的 Row，按角色與名次排序
+        """
+        stmt = (
+            select(PersonTopMovie.role, PersonTopMovie.rank, *LIST_COLUMNS)
+            .join(Movie, Movie.id == PersonTopMovie.movie_id)
+            .where(PersonTopMovie.person_id == person_id)
+            .order_by(PersonTopMovie.role, PersonTopMovie.rank)
+        )
+        return (await self.db.execute(stmt)).all()
+
+
+# ---------------------------------------------------------------------------
+# Statement builders（同步與非同步 Repository 共用）
+# ---------------------------------------------------------------------------
+
+def _people_stmt(role: str, skip: int, limit: int, with_stats: bool = True) -> Select:
+    """按參與電影數排序的人員（with_stats=False 時只選取電影數量）"""
+    columns = (Person, PersonStats) if with_stats else (Person, PersonStats.movie_count)
+    return (
+        select(*columns)
+        .join(PersonStats, PersonStats.person_id == Person.id)
+        .where(PersonStats.role == role)
+        .order_by(PersonStats.movie_count.desc(), PersonStats.person_id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def _person_stats_select(now: datetime) -> Select:
+    """每位人員每種角色的聚合（沒有評分的電影不計入平均評分，平均評分取到小數第 2 位）"""
+    rated = case((Movie.vote_count > 0, Movie.vote_average))
+    return (
+        select(
+            MovieCredit.person_id,
+            MovieCredit.role,
+            func.count(MovieCredit.movie_id),
+            func.round(func.avg(rated), 2),
+            func.sum(Movie.popularity),
+            func.max(Movie.release_date),
+            literal(now, DateTime),
+        )
+        .join(Movie, Movie.id == MovieCredit.movie_id)
+        .group_by(MovieCredit.person_id, MovieCredit.role)
+    )
+
+
+def _person_top_movies_select(limit: int) -> Select:
+    """每位人員每種角色按人氣度排序的前 limit 部電影"""
+    ranked = (
+        select(
+            MovieCredit.person_id,
+            MovieCredit.role,
+            MovieCredit.movie_id,
+            func.row_number().over(
+                partition_by=(MovieCredit.person_id, MovieCredit.role),
+                order_by=(Movie.popularity.desc().nulls_last(), Movie.id.desc())
+            ).label("rank"),
+        )
+        .join(Movie, Movie.id == MovieCredit.movie_id)
+        .subquery()
+    )
+    return (
+        select(ranked.c.person_id, ranked.c.role, ranked.c.rank, ranked.c.movie_id)
+        .where(ranked.c.rank <= limit)
+    )
+
@@ -0,0 +1,69 @@
+"""
+Sync Run Repository
+負責同步執行紀錄（sync_runs）的建立、完成與 watermark 查詢
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from app.models.sync_run_model import SyncRun
+
+
+class SyncRunRepository:
+    """同步執行紀錄存取層"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def start_run(self, mode: str, watermark: datetime) -> SyncRun:
+        """
+        建立執行紀錄並立即 commit（失敗的執行也會留下紀錄）
+        
+        Args:
+            mode: 'full' 或 'delta'
+            watermark: 本次涵蓋到的時間點（通常為開始時間）
+        """
+        run = SyncRun(mode=mode, status="running", watermark=watermark, started_at=datetime.now())
+        self.db.add(run)
+        self.db.commit()
+        return run
+    
+    def finish_run(self, run: SyncRun, stats: Dict[str, int], error: Optional[str] = None) -> SyncRun:
+        """
+        記錄統計與結果並 commit
+        
+        Args:
+            run: start_run 返回的紀錄
+            stats: SyncRun 統計欄位的值（changes_seen、movies_added 等）
+            error: 失敗原因，None 代表成功
+        """
+        for key, value in stats.items():
+            setattr(run, key, value)
+        run.status = "failed" if error else "succeeded"
+        run.error = error
+        run.finished_at = datetime.now()
+        self.db.commit()
+        return run
+    
+    def get_last_watermark(self) -> Optional[datetime]:
+        """
+        增量同步的起始 watermark，沒有成功的執行時返回 None
+        
+        完整同步只新增尚未入庫的電影，不會更新已存在電影的變更，因此不推進增量同步的 watermark：
+        取最近一次成功的增量同步；還沒有增量同步時，取最早一次成功的完整同步（初次建立資料庫）
+        """
+        last_delta = (
+            self.db.query(SyncRun.watermark)
+            .filter(SyncRun.status == "succeeded", SyncRun.mode == "delta")
+            .order_by(SyncRun.watermark.desc())
+            .limit(1)
+            .scalar()
+        )
+        if last_delta is not None:
+            return last_delta
+        return (
+            self.db.query(SyncRun.watermark)
+            .filter(SyncRun.status == "succeeded", SyncRun.mode == "full")
+            .order_by(SyncRun.watermark.asc())
+            .limit(1)
+            .scalar()
+        )
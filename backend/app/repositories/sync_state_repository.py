@@ -0,0 +1,89 @@
+"""
+Sync State Repository
+負責 TMDB 列表端點同步進度（sync_states）的讀寫
+檢查點與該頁資料在同一交易中提交，中斷後從最後完成的頁碼之後繼續；
+詳細資料獲取失敗的電影與檢查點一起記錄，下次同步先重試，全部成功前端點不會標記為完成
+"""
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from app.models.sync_state_model import SyncState
+
+
+class SyncStateRepository:
+    """同步進度存取層（由呼叫端負責 commit）"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_state(self, endpoint: str) -> Optional[SyncState]:
+        return self.db.get(SyncState, endpoint)
+    
+    def begin(self, endpoint: str, run_id: Optional[int], restart: bool = False) -> int:
+        """
+        開始同步端點：上次未完成時沿用進度，否則從頭開始
+        
+        Args:
+            endpoint: 端點名稱
+            run_id: 目前的執行紀錄 ID
+            restart: 忽略上次未完成的進度
+        
+        Returns:
+            應開始同步的頁碼
+        """
+        state = self.get_state(endpoint)
+        if state is None:
+            state = SyncState(endpoint=endpoint)
+            self.db.add(state)
+        if restart or state.status != "in_progress":
+            state.last_completed_page = 0
+            state.total_pages = None
+            state.failed_tmdb_ids = []
+        state.status = "in_progress"
+        state.run_id = run_id
+        self.db.flush()
+        return state.last_completed_page + 1
+    
+    def checkpoint(
+        self,
+        endpoint: str,
+        page: int,
+        run_id: Optional[int],
+        total_pages: Optional[int] = None,
+        failed_tmdb_ids: Iterable[int] = ()
+    ):
+        """記錄已完成的頁碼與該頁獲取失敗的電影（與該頁的資料一起 commit）"""
+        state = self.get_state(endpoint)
+        state.last_completed_page = page
+        state.run_id = run_id
+        if total_pages is not None:
+            state.total_pages = total_pages
+        failed_tmdb_ids = list(failed_tmdb_ids)
+        if failed_tmdb_ids:
+            state.failed_tmdb_ids = sorted(set(state.failed_tmdb_ids or []) | set(failed_tmdb_ids))
+        self.db.flush()
+    
+    def get_failed(self, endpoint: str) -> List[int]:
+        """待重試的電影 TMDB ID"""
+        state = self.get_state(endpoint)
+        return list(state.failed_tmdb_ids or []) if state else []
+    
+    def set_failed(self, endpoint: str, tmdb_ids: Iterable[int]):
+        """重試後更新待重試的電影（與重試寫入的資料一起 commit）"""
+        state = self.get_state(endpoint)
+        state.failed_tmdb_ids = sorted(set(tmdb_ids))
+        self.db.flush()
+    
+    def complete(self, endpoint: str, run_id: Optional[int]):
+        """標記端點同步完成，下次從第 1 頁重新開始（呼叫端需確認已沒有待重試的電影）"""
+        state = self.get_state(endpoint)
+        state.status = "completed"
+        state.run_id = run_id
+        self.db.flush()
+    
+    def get_unfinished(self, run_id: Optional[int]) -> List[SyncState]:
+        """指定執行中未完成（中斷或仍有待重試的電影）的端點"""
+        return (
+            self.db.query(SyncState)
+            .filter(SyncState.run_id == run_id, SyncState.status == "in_progress")
+            .all()
+        )
@@ -98,5 +98,6 @@ class MovieListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # keyset 分頁游標，沒有下一頁時為 None
     
     model_config = ConfigDict(from_attributes=True)
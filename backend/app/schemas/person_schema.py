@@ -3,7 +3,8 @@ Person Schemas
 演職人員的 Pydantic 模型
 """
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import List, Optional
+from datetime import date
 
 
 class PersonBase(BaseModel):
@@ -29,3 +30,53 @@ class CreditSchema(BaseModel):
     order_num: Optional[int] = None
     
     model_config = ConfigDict(from_attributes=True)
+
+
+class PersonStatsSchema(BaseModel):
+    """人員在某種角色的統計（預先計算）"""
+    role: str  # 'actor' 或 'director'
+    movie_count: int
+    avg_rating: Optional[float] = None
+    total_popularity: Optional[float] = None
+    latest_release_date: Optional[date] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PersonListItem(PersonBase):
+    """人員列表項目"""
+    role: str
+    movie_count: int
+    avg_rating: Optional[float] = None
+    latest_release_date: Optional[date] = None
+
+
+class PersonListResponse(BaseModel):
+    """人員列表回應（分頁）"""
+    people: List[PersonListItem]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
+class PersonTopMovieSchema(BaseModel):
+    """人員代表作（按人氣度排序）"""
+    role: str
+    rank: int
+    id: str
+    tmdb_id: int
+    title: str
+    original_title: Optional[str] = None
+    release_date: Optional[date] = None
+    vote_average: Optional[float] = None
+    popularity: Optional[float] = None
+    poster_path: Optional[str] = None
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PersonDetail(PersonBase):
+    """人員詳細資訊（各角色統計與代表作）"""
+    stats: List[PersonStatsSchema] = []
+    top_movies: List[PersonTopMovieSchema] = []
@@ -7,6 +7,8 @@ from sqlalchemy.orm import Session
 import numpy as np
 import logging
 
+from app.core.config import settings
+from app.services.credit_graph import get_credit_graph
 from app.services.embedding_service import get_embedding_service
 from app.services.vector_store import get_vector_store
 from app.services.llm_service import get_llm_service
@@ -14,6 +16,9 @@ from app.repositories.movie_repository import MovieRepository
 
 logger = logging.getLogger(__name__)
 
+# 相似電影的計算方式
+SIMILAR_MODES = ("embedding", "credits", "hybrid")
+
 
 class AIService:
     """AI 推薦服務 - 混合檢索與智能推薦"""
@@ -29,6 +34,7 @@ class AIService:
         self.embedding_service = get_embedding_service()
         self.vector_store = get_vector_store()
         self.llm_service = get_llm_service()
+        self.credit_graph = get_credit_graph()
         
         # 載入向量存儲（如果尚未載入）
         if len(self.vector_store) == 0:
@@ -193,7 +199,8 @@ class AIService:
     def get_similar_movies(
         self, 
         movie_id: str, 
-        top_k: int = 10
+        top_k: int = 10,
+        mode: Optional[str] = None
     ) -> Dict:
         """
         根據電影找相似電影
@@ -201,6 +208,8 @@ class AIService:
         Args:
             movie_id: 電影 ID
             top_k: 返回數量
+            mode: embedding（只用向量相似度）| credits（共同導演 / 演員優先）|
+                  hybrid（兩者加權混合）；None 時使用 SIMILAR_MOVIES_MODE
             
         Returns:
             {
@@ -209,7 +218,10 @@ class AIService:
                 "total": int
             }
         """
-        logger.info(f"Finding similar movies for: {movie_id}")
+        mode = mode or settings.SIMILAR_MOVIES_MODE
+        if mode not in SIMILAR_MODES:
+            raise ValueError(f"Unknown similarity mode: {mode}")
+        logger.info(f"Finding similar movies for: {movie_id} (mode={mode})")
         
         # 從向量存儲獲取電影向量
         result = self.vector_store.get_by_movie_id(movie_id)
@@ -235,7 +247,17 @@ class AIService:
             (mid, sim, meta) 
             for mid, sim, meta in similar_results 
             if mid != movie_id
-        ][:top_k]
+        ]
+        
+        if mode == "embedding":
+            similar_results = similar_results[:top_k]
+        else:
+            # 共同導演 / 演員分數（稀疏矩陣乘積）與向量相似度混合後重新排序
+            weight = 1.0 if mode == "credits" else settings.SIMILAR_CREDITS_WEIGHT
+            self.credit_graph.refresh_sync(self.movie_repo.db)
+            similar_results = self.credit_graph.rerank(
+                self.vector_store, movie_id, vector, similar_results, top_k, weight
+            )
         
         # 組裝結果
         similar_movies = []
@@ -291,14 +313,15 @@ class AIService:
                     # 類型匹配，提高分數
                     match_score += 0.1 * genre_overlap
             
-            # 關鍵字匹配加分
+            # 關鍵字匹配加分（標題、簡介與 TMDB 關鍵字）
             if intent.get('keywords'):
-                overview = metadata.get('overview', '').lower()
+                overview = (metadata.get('overview') or '').lower()
                 title = metadata['title'].lower()
+                movie_keywords = ' '.join(metadata.get('keywords', [])).lower()
                 
                 keyword_matches = sum(
                     1 for kw in intent['keywords'] 
-                    if kw.lower() in overview or kw.lower() in title
+                    if kw.lower() in overview or kw.lower() in title or kw.lower() in movie_keywords
                 )
                 
                 if keyword_matches > 0:
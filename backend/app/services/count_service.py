@@ -0,0 +1,159 @@
+"""
+Count Service
+電影總數計算與行程內快取
+
+列表與搜尋的總數只在資料同步後才會改變，
+因此以資料版本號（data_versions）為快取鍵，同步腳本遞增版本後快取自動失效。
+查詢前記錄版本，查詢期間版本已改變時（結果可能是同步前的數量）不寫入快取。
+"""
+from collections import OrderedDict
+from typing import Dict, Optional
+import threading
+import time
+import logging
+
+from app.core.config import settings
+from app.repositories.movie_repository import AsyncMovieRepository
+from app.repositories.data_version_repository import AsyncDataVersionRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CountCache:
+    """行程內的總數快取（所有請求共用）"""
+    
+    def __init__(
+        self,
+        version_check_interval: float = 5.0,
+        max_search_entries: int = 1024
+    ):
+        """
+        Args:
+            version_check_interval: 檢查資料版本的間隔（秒）
+            max_search_entries: 搜尋總數 LRU 的最大筆數
+        """
+        self.version_check_interval = version_check_interval
+        self.max_search_entries = max_search_entries
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._clear()
+    
+    def _clear(self):
+        self.total: Optional[int] = None
+        self.genre_counts: Optional[Dict[int, int]] = None
+        self._search_counts: "OrderedDict[str, int]" = OrderedDict()
+    
+    @property
+    def version(self) -> Optional[int]:
+        return self._version
+    
+    def needs_version_check(self) -> bool:
+        """距離上次檢查版本是否已超過間隔"""
+        return time.monotonic() - self._checked_at >= self.version_check_interval
+    
+    def sync_version(self, version: int):
+        """記錄最新的資料版本，版本改變時清空快取"""
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    logger.info(f"Data version changed {self._version} -> {version}, clearing count cache")
+                self._version = version
+                self._clear()
+            self._checked_at = time.monotonic()
+    
+    def invalidate(self):
+        """立即清空快取（下次請求重新讀取版本）"""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+            self._clear()
+    
+    def get_search_count(self, query: str) -> Optional[int]:
+        with self._lock:
+            count = self._search_counts.get(query)
+            if count is not None:
+                self._search_counts.move_to_end(query)
+            return count
+    
+    def set_total(self, total: int, version: Optional[int]):
+        """寫入電影總數（version 為查詢前的版本，已改變時不寫入，以下同）"""
+        with self._lock:
+            if version == self._version:
+                self.total = total
+    
+    def set_genre_counts(self, genre_counts: Dict[int, int], version: Optional[int]):
+        with self._lock:
+            if version == self._version:
+                self.genre_counts = genre_counts
+    
+    def set_search_count(self, query: str, count: int, version: Optional[int]):
+        with self._lock:
+            if version != self._version:
+                return
+            self._search_counts[query] = count
+            self._search_counts.move_to_end(query)
+            while len(self._search_counts) > self.max_search_entries:
+                self._search_counts.popitem(last=False)
+
+
+class CountService:
+    """電影總數服務 - 列表與搜尋分頁共用"""
+    
+    def __init__(
+        self,
+        movie_repo: AsyncMovieRepository,
+        version_repo: AsyncDataVersionRepository,
+        cache: Optional[CountCache] = None
+    ):
+        self.movie_repo = movie_repo
+        self.version_repo = version_repo
+        self.cache = cache or get_count_cache()
+    
+    async def total_movies(self) -> int:
+        """電影總數"""
+        version = await self._refresh_version()
+        total = self.cache.total
+        if total is None:
+            total = await self.movie_repo.get_total_count()
+            self.cache.set_total(total, version)
+        return total
+    
+    async def genre_total(self, genre_id: int) -> int:
+        """指定類型的電影數量（首次呼叫時一次載入所有類型的數量）"""
+        version = await self._refresh_version()
+        genre_counts = self.cache.genre_counts
+        if genre_counts is None:
+            genre_counts = await self.movie_repo.get_genre_counts()
+            self.cache.set_genre_counts(genre_counts, version)
+        return genre_counts.get(genre_id, 0)
+    
+    async def search_total(self, query: str) -> int:
+        """搜尋結果總數"""
+        version = await self._refresh_version()
+        count = self.cache.get_search_count(query)
+        if count is None:
+            count = await self.movie_repo.search_count(query)
+            self.cache.set_search_count(query, count, version)
+        return count
+    
+    async def _refresh_version(self) -> Optional[int]:
+        """必要時檢查資料版本，返回目前的快取版本（查詢前記錄，寫入時比對）"""
+        if self.cache.needs_version_check():
+            self.cache.sync_version(await self.version_repo.get_version())
+        return self.cache.version
+
+
+# 全域單例
+_count_cache = None
+
+
+def get_count_cache() -> CountCache:
+    """獲取 Count Cache 單例"""
+    global _count_cache
+    if _count_cache is None:
+        _count_cache = CountCache(
+            version_check_interval=settings.COUNT_CACHE_VERSION_CHECK_SECONDS,
+            max_search_entries=settings.COUNT_CACHE_MAX_SEARCH_ENTRIES
+        )
+    return _count_cache
@@ -0,0 +1,279 @@
+"""
+Credit Graph
+電影 × 人員的稀疏矩陣（導演 + 每部電影前幾位演員），供相似電影計算「共同演職人員」分數
+
+矩陣以 CSR 格式（indptr / indices / data 三個 numpy 陣列，與 scipy.sparse 相同）保存兩份：
+電影 × 人員（取出來源電影的人員）與其轉置人員 × 電影（取出這些人員參與的所有電影）。
+來源電影 m 與所有電影的共同人員分數即稀疏矩陣乘積 A · A[m]ᵀ，只走訪來源電影人員的參與紀錄，
+再以列向量長度正規化為餘弦相似度；導演的權重高於演員。
+
+與 GenreRegistry 相同，整個行程共用一份，以資料版本號（data_versions）判斷是否需要重建。
+所有陣列組成一個不可變的 _Graph，重建時在鎖外建立完成後以一次賦值替換；
+讀取端先取得目前的 _Graph 再只使用這一份，不需要加鎖，也不會讀到新舊混合的陣列。
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import heapq
+import threading
+import time
+import logging
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.person_repository import PersonRepository
+
+logger = logging.getLogger(__name__)
+
+
+class _Graph(NamedTuple):
+    """一個資料版本的矩陣（建立後不再修改）"""
+    movie_index: Dict[str, int]
+    movie_ids: np.ndarray
+    # 電影 × 人員（CSR）
+    movie_indptr: np.ndarray
+    movie_people: np.ndarray
+    movie_weights: np.ndarray
+    # 人員 × 電影（轉置，CSR）
+    person_indptr: np.ndarray
+    person_movies: np.ndarray
+    person_weights: np.ndarray
+    norms: np.ndarray
+
+
+class CreditGraph:
+    """電影 × 人員稀疏矩陣（重建時整個 _Graph 一次替換，讀取不需要加鎖）"""
+
+    def __init__(
+        self,
+        max_cast: int = 10,
+        director_weight: float = 2.0,
+        version_check_interval: float = 5.0
+    ):
+        """
+        Args:
+            max_cast: 每部電影計入的演員數量（按演員順序）
+            director_weight: 導演關聯的權重（演員為 1）
+            version_check_interval: 檢查資料版本的間隔（秒）
+        """
+        self.max_cast = max_cast
+        self.director_weight = director_weight
+        self.version_check_interval = version_check_interval
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()  # 同一時間只有一個執行緒檢查版本與重建
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._graph = self._build([])
+
+    def _build(self, edges: Iterable[Tuple[str, str, str]]) -> _Graph:
+        movie_index: Dict[str, int] = {}
+        person_index: Dict[str, int] = {}
+        rows, cols, weights = [], [], []
+        for movie_id, person_id, role in edges:
+            rows.append(movie_index.setdefault(movie_id, len(movie_index)))
+            cols.append(person_index.setdefault(person_id, len(person_index)))
+            weights.append(self.director_weight if role == "director" else 1.0)
+
+        rows = np.asarray(rows, dtype=np.int32)
+        cols = np.asarray(cols, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float32)
+        n_movies, n_people = len(movie_index), len(person_index)
+
+        # 同一人同時是導演與演員時，兩筆關聯合併為一個矩陣元素（權重相加）
+        if len(rows):
+            keys = rows.astype(np.int64) * n_people + cols
+            keys, inverse = np.unique(keys, return_inverse=True)
+            weights = np.bincount(inverse, weights=weights).astype(np.float32)
+            rows, cols = (keys // n_people).astype(np.int32), (keys % n_people).astype(np.int32)
+
+        movie_indptr, movie_order = _csr(rows, n_movies)
+        person_indptr, person_order = _csr(cols, n_people)
+        norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=n_movies))
+
+        return _Graph(
+            movie_index=movie_index,
+            movie_ids=np.asarray(list(movie_index), dtype=object),
+            movie_indptr=movie_indptr,
+            movie_people=cols[movie_order],
+            movie_weights=weights[movie_order],
+            person_indptr=person_indptr,
+            person_movies=rows[person_order],
+            person_weights=weights[person_order],
+            norms=norms.astype(np.float32),
+        )
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    def needs_version_check(self) -> bool:
+        """尚未載入，或距離上次檢查版本已超過間隔"""
+        return not self.loaded or time.monotonic() - self._checked_at >= self.version_check_interval
+
+    def load(self, edges: Iterable[Tuple[str, str, str]], version: int):
+        """以 (movie_id, person_id, role) 關聯重建矩陣（在鎖外建立，完成後一次替換）"""
+        start = time.perf_counter()
+        graph = self._build(edges)
+        with self._lock:
+            self._graph = graph
+            self._version = version
+            self._checked_at = time.monotonic()
+        logger.info(
+            f"Credit graph built: {len(graph.movie_index)} movies, {len(graph.person_indptr) - 1} people, "
+            f"{len(graph.movie_people)} edges in {time.perf_counter() - start:.2f}s (data version {version})"
+        )
+
+    def refresh_sync(self, db: Session):
+        """
+        版本檢查間隔已過時讀取版本號，版本改變（或尚未載入）時重建矩陣
+
+        檢查與重建在 _build_lock 內進行，取得鎖後再次確認是否仍需檢查：
+        等待期間其他執行緒已完成重建時直接使用其結果，不會重複建立
+        """
+        if not self.needs_version_check():
+            return
+        with self._build_lock:
+            if not self.needs_version_check():
+                return
+            version = DataVersionRepository(db).get_version()
+            if version == self._version:
+                self._checked_at = time.monotonic()
+                return
+            self.load(PersonRepository(db).get_credit_edges(self.max_cast), version)
+
+    def invalidate(self):
+        """下次 refresh 時重建"""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+
+    @staticmethod
+    def _similar_rows(graph: _Graph, movie_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """與來源電影有共同人員的電影列索引（遞增）與加權餘弦相似度，不含來源電影本身"""
+        row = graph.movie_index.get(movie_id)
+        if row is None or graph.norms[row] == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        # A[m] 的非零元素：來源電影的人員與權重
+        start, end = graph.movie_indptr[row], graph.movie_indptr[row + 1]
+        people, source_weights = graph.movie_people[start:end], graph.movie_weights[start:end]
+
+        # A · A[m]ᵀ：只取出這些人員在轉置矩陣中的列，按電影累加權重乘積
+        starts, ends = graph.person_indptr[people], graph.person_indptr[people + 1]
+        lengths = ends - starts
+        positions = np.repeat(ends - lengths.cumsum(), lengths) + np.arange(lengths.sum())
+        products = graph.person_weights[positions] * np.repeat(source_weights, lengths)
+        dots = np.bincount(graph.person_movies[positions], weights=products, minlength=len(graph.norms))
+        dots[row] = 0
+
+        movies = np.flatnonzero(dots)
+        scores = (dots[movies] / (graph.norms[row] * graph.norms[movies])).astype(np.float32)
+        return movies, scores
+
+    def similar(self, movie_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        與來源電影有共同導演或演員的電影（不含來源電影本身）
+
+        Returns:
+            (movie_ids, scores)：scores 為人員向量的加權餘弦相似度（0-1），未排序
+        """
+        graph = self._graph
+        movies, scores = self._similar_rows(graph, movie_id)
+        return graph.movie_ids[movies], scores
+
+    def rerank(
+        self,
+        vector_store,
+        movie_id: str,
+        vector: np.ndarray,
+        vector_results: List[Tuple[str, float, Dict]],
+        top_k: int,
+        weight: float,
+        batch_size: int = 64
+    ) -> List[Tuple[str, float, Dict]]:
+        """
+        以 (1 - weight) × 向量相似度 + weight × 共同演職人員分數重新排序（同分時向量相似度高者優先）
+
+        結果與對全部電影計算混合分數相同：不在向量搜尋結果中的電影，向量相似度不高於結果中的最低值，
+        因此混合分數的上限只取決於共同人員分數。有共同人員的電影按分數由高到低分批向向量存儲查詢相似度，
+        上限低於目前第 top_k 名時即停止，其餘電影不需要計算
+
+        Args:
+            vector_store: VectorStore 或 PgVectorStore（score_movies）
+            movie_id: 來源電影 ID
+            vector: 來源電影的向量
+            vector_results: 向量搜尋結果（已移除來源電影，至少 top_k 筆或全部電影）
+            top_k: 返回數量
+            weight: 共同演職人員分數的比重（0-1）
+            batch_size: 第一批向向量存儲查詢的電影數量（之後每批加倍）
+
+        Returns:
+            List of (movie_id, 混合分數, metadata)
+        """
+        graph = self._graph
+        movies, credit_scores = self._similar_rows(graph, movie_id)
+
+        def credit_of(mid: str) -> float:
+            row = graph.movie_index.get(mid)
+            if row is None:
+                return 0.0
+            pos = np.searchsorted(movies, row)
+            return float(credit_scores[pos]) if pos < len(movies) and movies[pos] == row else 0.0
+
+        def best(items) -> List[Tuple[float, float, str, Dict]]:
+            return heapq.nlargest(top_k, items, key=lambda item: (item[0], item[1]))
+
+        seen = {mid for mid, _, _ in vector_results}
+        top = best(
+            ((1 - weight) * sim + weight * credit_of(mid), sim, mid, meta)
+            for mid, sim, meta in vector_results
+        )
+
+        if len(movies):
+            similarity_floor = min((sim for _, sim, _ in vector_results), default=-1.0)
+            order = np.argsort(-credit_scores, kind="stable")
+            batch_start = 0
+            while batch_start < len(order):
+                batch = order[batch_start:batch_start + batch_size]
+                bound = (1 - weight) * similarity_floor + weight * float(credit_scores[batch[0]])
+                if len(top) >= top_k and bound < top[-1][0]:
+                    break
+                # 未能停止時每批數量加倍，限制查詢次數
+                batch_start += len(batch)
+                batch_size *= 2
+                credit = dict(zip(graph.movie_ids[movies[batch]].tolist(), credit_scores[batch].tolist()))
+                missing = [mid for mid in credit if mid not in seen]
+                top = best(top + [
+                    ((1 - weight) * sim + weight * credit[mid], sim, mid, meta)
+                    for mid, sim, meta in vector_store.score_movies(vector, missing)
+                ])
+
+        return [(mid, score, meta) for score, _, mid, meta in top]
+
+    def __len__(self):
+        return len(self._graph.movie_index)
+
+
+def _csr(keys: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """依列索引排序，返回 (indptr, 排序順序)"""
+    order = np.argsort(keys, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=n), out=indptr[1:])
+    return indptr, order
+
+
+# 全域單例
+_credit_graph = None
+
+
+def get_credit_graph() -> CreditGraph:
+    """獲取 Credit Graph 單例"""
+    global _credit_graph
+    if _credit_graph is None:
+        _credit_graph = CreditGraph(
+            max_cast=settings.SIMILAR_MAX_CAST,
+            director_weight=settings.SIMILAR_DIRECTOR_WEIGHT,
+            version_check_interval=settings.COUNT_CACHE_VERSION_CHECK_SECONDS
+        )
+    return _credit_graph
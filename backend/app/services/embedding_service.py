@@ -3,29 +3,43 @@ Embedding Service
 使用 Sentence Transformers 生成電影描述的向量表示
 """
 from sentence_transformers import SentenceTransformer
-from typing import List
+from typing import List, Optional
 import numpy as np
+import os
+
+from app.core.config import settings
 
 
 class EmbeddingService:
     """向量嵌入服務"""
     
-    def __init__(self, model_name: str = "paraphrase-multilingual-mpnet-base-v2"):
+    def __init__(
+        self,
+        model_name: str = "paraphrase-multilingual-mpnet-base-v2",
+        max_seq_length: Optional[int] = None
+    ):
         """
         初始化 Embedding 模型
         
         Args:
             model_name: Hugging Face 模型名稱，預設使用支援中文的多語言模型
+            max_seq_length: 最大 token 數，超過的部分截斷（None 使用模型預設值）
         """
         self.model_name = model_name
+        self.max_seq_length = max_seq_length
         self.model = None
+        self.pool = None  # 多行程編碼池（start_pool 後啟用）
         self._load_model()
     
     def _load_model(self):
         """載入 Sentence Transformer 模型"""
         print(f"Loading embedding model: {self.model_name}...")
         self.model = SentenceTransformer(self.model_name)
-        print(f"✅ Model loaded successfully!")
+        if self.max_seq_length:
+            self.model.max_seq_length = self.max_seq_length
+        else:
+            self.max_seq_length = self.model.max_seq_length
+        print(f"✅ Model loaded successfully! (max_seq_length={self.max_seq_length})")
     
     def encode_text(self, text: str) -> np.ndarray:
         """
@@ -44,25 +58,116 @@ class EmbeddingService:
         embedding = self.model.encode(text, convert_to_numpy=True)
         return embedding
     
-    def encode_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+    def start_pool(self, workers: int):
+        """
+        啟動多行程編碼池（離線大量編碼用），之後的 encode_texts 會分散到各行程
+        每個 worker 載入一份模型，torch 執行緒數依 CPU 核心數平均分配，避免超額使用
+        
+        Args:
+            workers: worker 行程數量
+        """
+        if self.pool is not None:
+            return
+        
+        threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+        previous = os.environ.get("OMP_NUM_THREADS")
+        # worker 以 spawn 啟動，會在載入 torch 時讀取此環境變數
+        os.environ["OMP_NUM_THREADS"] = str(threads_per_worker)
+        try:
+            self.pool = self.model.start_multi_process_pool(target_devices=["cpu"] * workers)
+        finally:
+            if previous is None:
+                os.environ.pop("OMP_NUM_THREADS", None)
+            else:
+                os.environ["OMP_NUM_THREADS"] = previous
+        print(f"✅ Started {workers} encoding workers ({threads_per_worker} threads each)")
+    
+    def stop_pool(self):
+        """關閉多行程編碼池"""
+        if self.pool is not None:
+            SentenceTransformer.stop_multi_process_pool(self.pool)
+            self.pool = None
+    
+    def encode_texts(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        chunk_size: Optional[int] = None
+    ) -> np.ndarray:
         """
         批量編碼多個文本
+        按 token 長度分桶後編碼，超過 max_seq_length 的文本會被截斷，返回順序與輸入相同
         
         Args:
             texts: 文本列表
-            batch_size: 批次大小
+            batch_size: 批次大小（以 max_seq_length 長度的文本計；較短的文本每批可容納更多）
+            chunk_size: 多行程模式下每次分派給 worker 的文本數量（None 由函式庫決定）
             
         Returns:
             向量矩陣 (n_texts, 768)
         """
-        embeddings = self.model.encode(
-            texts, 
-            convert_to_numpy=True,
-            batch_size=batch_size,
-            show_progress_bar=True
-        )
+        if len(texts) == 0:
+            return np.empty((0, self.get_embedding_dimension()), dtype=np.float32)
+        
+        # 按 token 長度排序，長度相近的文本同批編碼以減少 padding，輸出時還原原始順序
+        lengths = self.token_lengths(texts)
+        order = np.argsort(lengths, kind="stable")
+        
+        if self.pool is not None:
+            sorted_embeddings = self.model.encode_multi_process(
+                [texts[i] for i in order],
+                self.pool,
+                batch_size=batch_size,
+                chunk_size=chunk_size
+            )
+            embeddings = np.empty_like(sorted_embeddings)
+            embeddings[order] = sorted_embeddings
+            return embeddings
+        
+        embeddings = None
+        for bucket in self.length_buckets(lengths[order], batch_size):
+            indices = order[bucket]
+            bucket_embeddings = self.model.encode(
+                [texts[i] for i in indices],
+                convert_to_numpy=True,
+                batch_size=len(indices),
+                show_progress_bar=False
+            )
+            if embeddings is None:
+                embeddings = np.empty((len(texts), bucket_embeddings.shape[1]), dtype=bucket_embeddings.dtype)
+            embeddings[indices] = bucket_embeddings
         return embeddings
     
+    def token_lengths(self, texts: List[str]) -> np.ndarray:
+        """每個文本的 token 數（含特殊 token，超過 max_seq_length 的以截斷後長度計）"""
+        input_ids = self.model.tokenizer(
+            list(texts),
+            add_special_tokens=True,
+            truncation=False,
+            return_attention_mask=False
+        )["input_ids"]
+        return np.minimum([len(ids) for ids in input_ids], self.max_seq_length)
+    
+    def length_buckets(self, sorted_lengths: np.ndarray, batch_size: int) -> List[slice]:
+        """
+        將已排序的長度切成批次
+        每批的 token 預算為 batch_size × max_seq_length（padding 後），短文本的批次可以容納更多文本
+        
+        Returns:
+            sorted_lengths 上的 slice 列表
+        """
+        token_budget = batch_size * self.max_seq_length
+        buckets = []
+        start = 0
+        for end in range(1, len(sorted_lengths) + 1):
+            # 升序排列，批次的 padding 長度即最後一筆的長度
+            if end - start > 1 and (end - start) * sorted_lengths[end - 1] > token_budget:
+                buckets.append(slice(start, end - 1))
+                start = end - 1
+        if start < len(sorted_lengths):
+            buckets.append(slice(start, len(sorted_lengths)))
+        return buckets
+    
     def create_movie_text(self, title: str, overview: str, genres: List[str]) -> str:
         """
         組合電影資訊為單一文本用於 embedding
@@ -124,5 +229,8 @@ def get_embedding_service() -> EmbeddingService:
     """獲取 Embedding Service 單例"""
     global _embedding_service
     if _embedding_service is None:
-        _embedding_service = EmbeddingService()
+        _embedding_service = EmbeddingService(
+            model_name=settings.EMBEDDING_MODEL,
+            max_seq_length=settings.EMBEDDING_MAX_SEQ_LENGTH or None
+        )
     return _embedding_service
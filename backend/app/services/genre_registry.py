@@ -0,0 +1,170 @@
+"""
+Genre Registry
+行程內的電影類型目錄（id ↔ tmdb_id ↔ name 查詢）
+
+類型只在同步後才會改變，因此整個行程共用一份目錄，以資料版本號（data_versions）判斷是否需要重新載入：
+與 CountCache 相同，每隔幾秒檢查一次版本，同步腳本遞增版本後下次檢查時重新載入。
+每個類型以一個字典表示（{"id", "tmdb_id", "name"}，與 GenreSchema 欄位相同），
+各查詢表與列表回應共用同一個字典，可直接交給 ORJSONResponse 序列化。
+所有查詢表組成一個不可變的 _Catalog，重新載入時建立完成後以一次賦值替換，讀取端不會讀到新舊混合的查詢表。
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+import asyncio
+import sys
+import threading
+import time
+import logging
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.genre_model import Genre
+from app.repositories.data_version_repository import AsyncDataVersionRepository, DataVersionRepository
+from app.repositories.genre_repository import AsyncGenreRepository, GenreRepository
+
+logger = logging.getLogger(__name__)
+
+GenreEntry = Dict[str, Any]
+
+
+class _Catalog(NamedTuple):
+    """一個資料版本的查詢表（建立後不再修改）"""
+    sorted: List[GenreEntry]
+    by_id: Dict[int, GenreEntry]
+    by_tmdb_id: Dict[int, GenreEntry]
+    by_name: Dict[str, GenreEntry]
+
+
+class GenreRegistry:
+    """類型目錄（所有請求共用；重新載入時整個 _Catalog 一次替換，讀取不需要加鎖）"""
+
+    def __init__(self, version_check_interval: float = 5.0):
+        """
+        Args:
+            version_check_interval: 檢查資料版本的間隔（秒）
+        """
+        self.version_check_interval = version_check_interval
+        self._lock = threading.Lock()
+        # 同一時間只有一個呼叫端檢查版本與重新載入（async 版本每個事件迴圈一把鎖）
+        self._build_lock = threading.Lock()
+        self._async_build_lock: Optional[asyncio.Lock] = None
+        self._async_build_lock_loop = None
+        self._version: Optional[int] = None
+        self._checked_at = 0.0
+        self._catalog = _build_catalog([])
+
+    @property
+    def loaded(self) -> bool:
+        return self._version is not None
+
+    def needs_version_check(self) -> bool:
+        """尚未載入，或距離上次檢查版本已超過間隔"""
+        return not self.loaded or time.monotonic() - self._checked_at >= self.version_check_interval
+
+    def load(self, genres: Iterable[Genre], version: int):
+        """以資料庫中的類型取代目錄"""
+        catalog = _build_catalog(genres)
+        with self._lock:
+            self._catalog = catalog
+            if self._version is not None and version != self._version:
+                logger.info(f"Data version changed {self._version} -> {version}, reloaded {len(catalog.by_id)} genres")
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def _async_lock(self) -> asyncio.Lock:
+        """目前事件迴圈的 build lock（asyncio.Lock 不能跨事件迴圈使用）"""
+        loop = asyncio.get_running_loop()
+        if self._async_build_lock_loop is not loop:
+            self._async_build_lock = asyncio.Lock()
+            self._async_build_lock_loop = loop
+        return self._async_build_lock
+
+    async def refresh(self, genre_repo: AsyncGenreRepository, version_repo: AsyncDataVersionRepository):
+        """
+        版本檢查間隔已過時讀取版本號，版本改變（或尚未載入）時重新載入類型
+
+        取得鎖後再次確認是否仍需檢查：等待期間其他請求已完成載入時直接使用其結果
+        """
+        if not self.needs_version_check():
+            return
+        async with self._async_lock():
+            if not self.needs_version_check():
+                return
+            version = await version_repo.get_version()
+            if version == self._version:
+                self._checked_at = time.monotonic()
+                return
+            self.load(await genre_repo.get_all_genres(), version)
+
+    def refresh_sync(self, db: Session):
+        """同步版本的 refresh（供腳本與 threadpool 中的端點使用）"""
+        if not self.needs_version_check():
+            return
+        with self._build_lock:
+            if not self.needs_version_check():
+                return
+            version = DataVersionRepository(db).get_version()
+            if version == self._version:
+                self._checked_at = time.monotonic()
+                return
+            self.load(GenreRepository(db).get_all_genres(), version)
+
+    def invalidate(self):
+        """下次 refresh 時重新載入"""
+        with self._lock:
+            self._version = None
+            self._checked_at = 0.0
+
+    def all(self) -> List[GenreEntry]:
+        """所有類型（按名稱排序）"""
+        return self._catalog.sorted
+
+    def get(self, genre_id: int) -> Optional[GenreEntry]:
+        return self._catalog.by_id.get(genre_id)
+
+    def get_by_tmdb_id(self, tmdb_id: int) -> Optional[GenreEntry]:
+        return self._catalog.by_tmdb_id.get(tmdb_id)
+
+    def get_by_name(self, name: str) -> Optional[GenreEntry]:
+        return self._catalog.by_name.get(name)
+
+    def lookup(self, genre_ids: Iterable[int]) -> List[GenreEntry]:
+        """類型 ID → 類型字典（略過目錄中不存在的 ID）"""
+        by_id = self._catalog.by_id
+        return [by_id[genre_id] for genre_id in genre_ids if genre_id in by_id]
+
+    def name_of(self, genre_id: int) -> Optional[str]:
+        entry = self._catalog.by_id.get(genre_id)
+        return entry["name"] if entry else None
+
+    def __len__(self):
+        return len(self._catalog.by_id)
+
+
+def _build_catalog(genres: Iterable[Genre]) -> _Catalog:
+    """由類型建立查詢表"""
+    # 名稱以 sys.intern 保存，向量存儲元資料中的類型名稱可共用同一個字串
+    entries = [
+        {"id": genre.id, "tmdb_id": genre.tmdb_id, "name": sys.intern(genre.name)}
+        for genre in genres
+    ]
+    return _Catalog(
+        sorted=sorted(entries, key=lambda entry: entry["name"]),
+        by_id={entry["id"]: entry for entry in entries},
+        by_tmdb_id={entry["tmdb_id"]: entry for entry in entries},
+        by_name={entry["name"]: entry for entry in entries},
+    )
+
+
+# 全域單例
+_genre_registry = None
+
+
+def get_genre_registry() -> GenreRegistry:
+    """獲取 Genre Registry 單例"""
+    global _genre_registry
+    if _genre_registry is None:
+        _genre_registry = GenreRegistry(
+            version_check_interval=settings.COUNT_CACHE_VERSION_CHECK_SECONDS
+        )
+    return _genre_registry
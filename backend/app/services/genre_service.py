@@ -2,19 +2,35 @@
 Genre Service
 電影類型業務邏輯
 """
-from typing import List
+from typing import List, Optional
 
-from app.repositories.genre_repository import GenreRepository
-from app.schemas.genre_schema import GenreSchema
+from app.repositories.data_version_repository import AsyncDataVersionRepository
+from app.repositories.genre_repository import AsyncGenreRepository
+from app.services.genre_registry import GenreEntry, GenreRegistry, get_genre_registry
 
 
 class GenreService:
-    """電影類型業務邏輯層"""
+    """電影類型業務邏輯層（讀取行程內的 GenreRegistry，資料版本改變時才查詢資料庫）"""
     
-    def __init__(self, genre_repo: GenreRepository):
+    def __init__(
+        self,
+        genre_repo: AsyncGenreRepository,
+        version_repo: AsyncDataVersionRepository,
+        registry: Optional[GenreRegistry] = None
+    ):
         self.genre_repo = genre_repo
+        self.version_repo = version_repo
+        self.registry = registry or get_genre_registry()
     
-    def get_all_genres(self) -> List[GenreSchema]:
-        """獲取所有電影類型"""
-        genres = self.genre_repo.get_all_genres()
-        return [GenreSchema.model_validate(genre) for genre in genres]
+    async def get_registry(self) -> GenreRegistry:
+        """返回最新的類型目錄"""
+        await self.registry.refresh(self.genre_repo, self.version_repo)
+        return self.registry
+    
+    async def get_all_genres(self) -> List[GenreEntry]:
+        """獲取所有電影類型（GenreSchema 結構的字典，按名稱排序）"""
+        return (await self.get_registry()).all()
+    
+    async def get_genre(self, genre_id: int) -> Optional[GenreEntry]:
+        """根據 ID 獲取類型，不存在時返回 None"""
+        return (await self.get_registry()).get(genre_id)
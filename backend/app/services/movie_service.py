@@ -2,37 +2,100 @@
 Movie Service
 電影相關業務邏輯
 """
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from decimal import Decimal, InvalidOperation
 from fastapi import HTTPException
+import base64
+import binascii
+import json
 import math
 
-from app.repositories.movie_repository import MovieRepository
-from app.repositories.genre_repository import GenreRepository
-from app.schemas.movie_schema import MovieDetail, MovieListItem, MovieListResponse
+from sqlalchemy import Row
+
+from app.models.movie_model import Movie
+from app.repositories.movie_repository import AsyncMovieRepository, MovieCursor
+from app.services.count_service import CountService
+from app.services.genre_service import GenreService
+from app.schemas.movie_schema import MovieDetail
+
+
+def encode_cursor(movie: Movie) -> str:
+    """將電影（Movie 或列表 Row）的 (popularity, id) 編碼為不透明的分頁游標"""
+    popularity = str(movie.popularity) if movie.popularity is not None else None
+    payload = json.dumps([popularity, movie.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[MovieCursor]:
+    """
+    解碼分頁游標
+    空字串代表 keyset 分頁的第一頁，返回 None；格式錯誤時拋出 400 錯誤
+    """
+    if cursor == "":
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        popularity, movie_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(movie_id, str):
+            raise ValueError("invalid movie id")
+        return (Decimal(popularity) if popularity is not None else None, movie_id)
+    except (ValueError, TypeError, InvalidOperation, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def movie_list_item(row: Row, genres: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    列表 Row → MovieListItem 結構的字典（不經過 Pydantic 驗證，直接交給 ORJSONResponse）
+    DECIMAL 欄位轉為 float，與 MovieListItem 的輸出相同
+    """
+    return {
+        "id": row.id,
+        "tmdb_id": row.tmdb_id,
+        "title": row.title,
+        "original_title": row.original_title,
+        "release_date": row.release_date,
+        "vote_average": float(row.vote_average) if row.vote_average is not None else None,
+        "popularity": float(row.popularity) if row.popularity is not None else None,
+        "poster_path": row.poster_path,
+        "genres": genres,
+    }
 
 
 class MovieService:
     """電影業務邏輯層"""
     
-    def __init__(self, movie_repo: MovieRepository, genre_repo: GenreRepository):
+    def __init__(
+        self,
+        movie_repo: AsyncMovieRepository,
+        genre_service: GenreService,
+        count_service: CountService
+    ):
         self.movie_repo = movie_repo
-        self.genre_repo = genre_repo
+        self.genre_service = genre_service
+        self.count_service = count_service
     
-    def get_movie_detail(self, movie_id: str) -> MovieDetail:
+    async def get_movie_detail(self, movie_id: str) -> MovieDetail:
         """
         獲取電影詳細資訊
         如果找不到，拋出 404 錯誤
         """
-        movie = self.movie_repo.get_movie_by_id(movie_id)
+        movie = await self.movie_repo.get_movie_by_id(movie_id)
         if not movie:
             raise HTTPException(status_code=404, detail=f"Movie with id {movie_id} not found")
         
         return MovieDetail.from_orm_movie(movie)
     
-    def list_movies(self, page: int = 1, page_size: int = 20, genre_id: Optional[int] = None) -> MovieListResponse:
+    async def list_movies(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        genre_id: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         獲取電影列表（分頁）
-        可選擇按類型篩選
+        可選擇按類型篩選；傳入 cursor 時使用 keyset 分頁（空字串代表第一頁）
+        返回 MovieListResponse 結構的字典
         """
         if page < 1:
             page = 1
@@ -40,36 +103,39 @@ class MovieService:
             page_size = 20
         
         skip = (page - 1) * page_size
+        after = decode_cursor(cursor) if cursor is not None else None
+        limit = page_size + 1 if cursor is not None else page_size
         
         # 根據是否有 genre_id 選擇不同的查詢方法
         if genre_id:
-            # 驗證 genre 是否存在
-            genre = self.genre_repo.get_genre_by_id(genre_id)
+            # 驗證 genre 是否存在（行程內的類型目錄，不查詢資料庫）
+            genre = await self.genre_service.get_genre(genre_id)
             if not genre:
                 raise HTTPException(status_code=404, detail=f"Genre with id {genre_id} not found")
             
-            movies = self.movie_repo.get_movies_by_genre(genre_id, skip, limit=page_size)
-            # TODO: 需要在 repository 中增加 get_movies_by_genre_count 方法
-            total = len(movies)  # 暫時使用這個，後續優化
+            movies = await self.movie_repo.get_movies_by_genre(genre_id, skip, limit=limit, after=after)
+            total = await self.count_service.genre_total(genre_id)
         else:
-            movies = self.movie_repo.get_movies(skip, limit=page_size)
-            total = self.movie_repo.get_total_count()
-        
-        total_pages = math.ceil(total / page_size) if total > 0 else 0
+            movies = await self.movie_repo.get_movies(skip, limit=limit, after=after)
+            total = await self.count_service.total_movies()
         
-        movie_items = [MovieListItem.from_orm_movie(movie) for movie in movies]
-        
-        return MovieListResponse(
-            movies=movie_items,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
+        return await self._build_list_response(
+            movies, total, page, page_size,
+            keyset=cursor is not None,
+            has_more=skip + len(movies) < total
         )
     
-    def search_movies(self, query: str, page: int = 1, page_size: int = 20) -> MovieListResponse:
+    async def search_movies(
+        self,
+        query: str,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         搜尋電影（支援中文）
+        預設按相關度排序；傳入 cursor 時改用按人氣度排序的 keyset 分頁
+        返回 MovieListResponse 結構的字典
         """
         if not query or len(query.strip()) == 0:
             raise HTTPException(status_code=400, detail="Search query cannot be empty")
@@ -80,18 +146,52 @@ class MovieService:
             page_size = 20
         
         skip = (page - 1) * page_size
+        after = decode_cursor(cursor) if cursor is not None else None
+        limit = page_size + 1 if cursor is not None else page_size
+        
+        movies = await self.movie_repo.search_movies(
+            query, skip, limit=limit, after=after, keyset=cursor is not None
+        )
+        total = await self.count_service.search_total(query)
         
-        movies = self.movie_repo.search_movies(query, skip, limit=page_size)
-        total = self.movie_repo.search_count(query)
+        # 相關度排序的結果與 keyset 游標順序不同，頁碼模式下不提供 next_cursor
+        return await self._build_list_response(
+            movies, total, page, page_size,
+            keyset=cursor is not None,
+            has_more=False
+        )
+    
+    async def _build_list_response(
+        self,
+        movies: List[Row],
+        total: int,
+        page: int,
+        page_size: int,
+        keyset: bool,
+        has_more: bool
+    ) -> Dict[str, Any]:
+        """
+        組裝分頁回應（列表欄位的 Row + 一次查詢取得的類型 ID，類型內容由 GenreRegistry 提供）
+        keyset 模式下多查詢一筆以判斷是否有下一頁
+        """
+        if keyset:
+            has_more = len(movies) > page_size
+            movies = movies[:page_size]
         
+        next_cursor = encode_cursor(movies[-1]) if has_more and movies else None
         total_pages = math.ceil(total / page_size) if total > 0 else 0
         
-        movie_items = [MovieListItem.from_orm_movie(movie) for movie in movies]
+        genre_ids = await self.movie_repo.get_genre_ids_for_movies([movie.id for movie in movies])
+        registry = await self.genre_service.get_registry()
         
-        return MovieListResponse(
-            movies=movie_items,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        return {
+            "movies": [
+                movie_list_item(movie, registry.lookup(genre_ids.get(movie.id, ())))
+                for movie in movies
+            ],
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages,
+            "next_cursor": next_cursor,
+        }
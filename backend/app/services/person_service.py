@@ -0,0 +1,83 @@
+"""
+Person Service
+演職人員相關業務邏輯（讀取同步後預先計算的人員統計）
+"""
+from typing import List
+from fastapi import HTTPException
+import math
+
+from app.repositories.person_repository import AsyncPersonRepository
+from app.schemas.person_schema import (
+    PersonDetail,
+    PersonListItem,
+    PersonListResponse,
+    PersonStatsSchema,
+    PersonTopMovieSchema,
+)
+
+# 可查詢的角色
+PERSON_ROLES = ("actor", "director")
+
+
+class PersonService:
+    """演職人員業務邏輯層"""
+    
+    def __init__(self, person_repo: AsyncPersonRepository):
+        self.person_repo = person_repo
+    
+    async def list_people(self, role: str = "actor", page: int = 1, page_size: int = 20) -> PersonListResponse:
+        """
+        按角色列出人員，依參與電影數排序（分頁）
+        角色不存在時拋出 400 錯誤
+        """
+        if role not in PERSON_ROLES:
+            raise HTTPException(status_code=400, detail=f"Role must be one of: {', '.join(PERSON_ROLES)}")
+        if page < 1:
+            page = 1
+        if page_size < 1 or page_size > 100:
+            page_size = 20
+        
+        skip = (page - 1) * page_size
+        rows = await self.person_repo.get_people(role, skip, limit=page_size)
+        total = await self.person_repo.count_people(role)
+        
+        people: List[PersonListItem] = [
+            PersonListItem(
+                id=person.id,
+                tmdb_id=person.tmdb_id,
+                name=person.name,
+                profile_path=person.profile_path,
+                role=stats.role,
+                movie_count=stats.movie_count,
+                avg_rating=stats.avg_rating,
+                latest_release_date=stats.latest_release_date,
+            )
+            for person, stats in rows
+        ]
+        return PersonListResponse(
+            people=people,
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=math.ceil(total / page_size) if total > 0 else 0
+        )
+    
+    async def get_person_detail(self, person_id: str) -> PersonDetail:
+        """
+        獲取人員資訊、各角色統計與代表作
+        如果找不到，拋出 404 錯誤
+        """
+        person = await self.person_repo.get_person_by_id(person_id)
+        if not person:
+            raise HTTPException(status_code=404, detail=f"Person with id {person_id} not found")
+        
+        stats = await self.person_repo.get_stats(person_id)
+        top_movies = await self.person_repo.get_top_movies(person_id)
+        return PersonDetail(
+            id=person.id,
+            tmdb_id=person.tmdb_id,
+            name=person.name,
+            profile_path=person.profile_path,
+            stats=[PersonStatsSchema.model_validate(item) for item in stats],
+            top_movies=[PersonTopMovieSchema.model_validate(row) for row in top_movies],
+        )
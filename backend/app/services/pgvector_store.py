@@ -0,0 +1,258 @@
+"""
+PgVector Store
+PostgreSQL + pgvector 向量存儲（多節點部署共用）
+API 與記憶體版 VectorStore 相同，向量以 vector(768) 欄位存放並建立 HNSW 索引
+"""
+import json
+import pickle
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+import logging
+
+import numpy as np
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value):
+    """元資料中的 Decimal（vote_average、popularity）轉為 float，其他型別轉為字串"""
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _vector_literal(vector: np.ndarray) -> str:
+    """numpy 向量轉為 pgvector 文字格式 '[x1,x2,...]'"""
+    return "[" + ",".join(repr(float(x)) for x in np.asarray(vector).ravel()) + "]"
+
+
+def _parse_vector(value: str) -> np.ndarray:
+    """pgvector 文字格式轉回 numpy 向量"""
+    return np.array(json.loads(value), dtype=np.float32)
+
+
+class PgVectorStore:
+    """向量存儲和檢索系統（PostgreSQL + pgvector）"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        embedding_dim: int = 768,
+        table: str = "movie_vectors",
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        hnsw_ef_search: int = 40
+    ):
+        """
+        初始化向量存儲（首次使用時建立 extension、資料表與索引）
+
+        Args:
+            engine: PostgreSQL engine
+            embedding_dim: 向量維度
+            table: 資料表名稱
+            hnsw_m: HNSW 每個節點的連結數
+            hnsw_ef_construction: 建立索引時的候選數量
+            hnsw_ef_search: 查詢時的候選數量（需大於 top_k）
+        """
+        self.engine = engine
+        self.embedding_dim = embedding_dim
+        self.table = table
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """建立 pgvector extension、資料表與索引（可重複執行）"""
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                f"movie_id VARCHAR(36) PRIMARY KEY, "
+                f"embedding vector({self.embedding_dim}) NOT NULL, "
+                f"genres TEXT[] NOT NULL DEFAULT '{{}}', "
+                f"metadata JSONB NOT NULL)"
+            ))
+            # 餘弦距離 HNSW 索引
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_embedding_hnsw ON {self.table} "
+                f"USING hnsw (embedding vector_cosine_ops) "
+                f"WITH (m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)})"
+            ))
+            # 類型篩選（genres @> ARRAY[...]）
+            conn.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_genres ON {self.table} USING gin (genres)"
+            ))
+
+    def add(self, movie_id: str, vector: np.ndarray, metadata: Dict):
+        """
+        添加向量到存儲（已存在時更新）
+
+        Args:
+            movie_id: 電影 ID
+            vector: 向量 (768,)
+            metadata: 電影元資料 (title, overview, genres, etc.)
+        """
+        self.add_batch([movie_id], np.asarray(vector).reshape(1, -1), [metadata])
+
+    def add_batch(self, movie_ids: List[str], vectors: np.ndarray, metadata_list: List[Dict]):
+        """
+        批量添加向量（單一交易內 upsert）
+
+        Args:
+            movie_ids: 電影 ID 列表
+            vectors: 向量矩陣 (n, 768)
+            metadata_list: 元資料列表
+        """
+        rows = [
+            {
+                "movie_id": movie_id,
+                "embedding": _vector_literal(vector),
+                "genres": list(metadata.get("genres") or []),
+                "metadata": json.dumps(metadata, ensure_ascii=False, default=_json_default),
+            }
+            for movie_id, vector, metadata in zip(movie_ids, vectors, metadata_list)
+        ]
+        if not rows:
+            return
+
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"INSERT INTO {self.table} (movie_id, embedding, genres, metadata) "
+                    f"VALUES (:movie_id, CAST(:embedding AS vector), :genres, CAST(:metadata AS jsonb)) "
+                    f"ON CONFLICT (movie_id) DO UPDATE SET "
+                    f"embedding = EXCLUDED.embedding, genres = EXCLUDED.genres, metadata = EXCLUDED.metadata"
+                ),
+                rows
+            )
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        top_k: int = 10,
+        filter_genre: Optional[str] = None
+    ) -> List[Tuple[str, float, Dict]]:
+        """
+        搜尋最相似的向量（HNSW 近似最近鄰；指定類型時為精確搜尋）
+
+        Args:
+            query_vector: 查詢向量 (768,)
+            top_k: 返回前 k 個結果
+            filter_genre: 可選的類型篩選
+
+        Returns:
+            List of (movie_id, similarity, metadata)
+        """
+        where = "WHERE genres @> ARRAY[CAST(:genre AS TEXT)]" if filter_genre else ""
+        params = {"query": _vector_literal(query_vector), "top_k": top_k}
+        if filter_genre:
+            params["genre"] = filter_genre
+
+        with self.engine.begin() as conn:
+            if filter_genre:
+                # HNSW 只取出約 ef_search 個候選後才套用 WHERE，稀有類型可能少於 top_k 筆甚至沒有結果；
+                # 類型篩選改為精確掃描（GIN 索引取出該類型的電影後按距離排序），結果與記憶體版本相同
+                conn.execute(text("SET LOCAL enable_indexscan = off"))
+            else:
+                # ef_search 需不小於 top_k，否則 HNSW 返回的結果數會少於 top_k
+                ef_search = max(int(self.hnsw_ef_search), int(top_k))
+                conn.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+            rows = conn.execute(
+                text(
+                    f"SELECT movie_id, 1 - (embedding <=> CAST(:query AS vector)) AS similarity, metadata "
+                    f"FROM {self.table} {where} "
+                    f"ORDER BY embedding <=> CAST(:query AS vector) "
+                    f"LIMIT :top_k"
+                ),
+                params
+            ).all()
+
+        return [(movie_id, float(similarity), metadata) for movie_id, similarity, metadata in rows]
+
+    def score_movies(self, query_vector: np.ndarray, movie_ids: List[str]) -> List[Tuple[str, float, Dict]]:
+        """計算指定電影與查詢向量的餘弦相似度（不在存儲中的 ID 略過）"""
+        if not movie_ids:
+            return []
+        stmt = text(
+            f"SELECT movie_id, 1 - (embedding <=> CAST(:query AS vector)) AS similarity, metadata "
+            f"FROM {self.table} WHERE movie_id IN :movie_ids"
+        ).bindparams(bindparam("movie_ids", expanding=True))
+        with self.engine.connect() as conn:
+            rows = conn.execute(stmt, {"query": _vector_literal(query_vector), "movie_ids": list(movie_ids)}).all()
+        scored = {movie_id: (movie_id, float(similarity), metadata) for movie_id, similarity, metadata in rows}
+        return [scored[movie_id] for movie_id in movie_ids if movie_id in scored]
+
+    def get_by_movie_id(self, movie_id: str) -> Optional[Tuple[np.ndarray, Dict]]:
+        """根據 movie_id 獲取向量和元資料"""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(f"SELECT embedding::text, metadata FROM {self.table} WHERE movie_id = :movie_id"),
+                {"movie_id": movie_id}
+            ).first()
+        if row is None:
+            return None
+        return _parse_vector(row[0]), row[1]
+
+    def save(self, filepath: str):
+        """匯出為與 VectorStore 相同格式的 pickle 快照（資料本身已存於資料庫）"""
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(f"SELECT movie_id, embedding::text, metadata FROM {self.table} ORDER BY movie_id")
+            ).all()
+
+        vectors = np.array([_parse_vector(row[1]) for row in rows]).reshape(-1, self.embedding_dim)
+        data = {
+            'embedding_dim': self.embedding_dim,
+            'vectors': vectors,
+            'metadata': [row[2] for row in rows],
+            'movie_id_to_index': {row[0]: i for i, row in enumerate(rows)}
+        }
+
+        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'wb') as f:
+            pickle.dump(data, f)
+
+        logger.info(f"Vector store exported to {filepath} ({len(rows)} vectors)")
+
+    def load(self, filepath: str):
+        """從 VectorStore 的 pickle 檔案匯入向量（upsert 到資料庫）"""
+        with open(filepath, 'rb') as f:
+            data = pickle.load(f)
+
+        if data['embedding_dim'] != self.embedding_dim:
+            raise ValueError(
+                f"Embedding dimension mismatch: file has {data['embedding_dim']}, "
+                f"table expects {self.embedding_dim}"
+            )
+
+        movie_ids = [None] * len(data['movie_id_to_index'])
+        for movie_id, index in data['movie_id_to_index'].items():
+            movie_ids[index] = movie_id
+
+        batch_size = 500
+        for start in range(0, len(movie_ids), batch_size):
+            end = start + batch_size
+            self.add_batch(movie_ids[start:end], data['vectors'][start:end], data['metadata'][start:end])
+
+        logger.info(f"Vector store imported from {filepath} ({len(movie_ids)} vectors)")
+
+    def __len__(self):
+        """返回存儲的向量數量"""
+        with self.engine.connect() as conn:
+            return conn.execute(text(f"SELECT count(*) FROM {self.table}")).scalar()
+
+    def get_stats(self) -> Dict:
+        """獲取統計資訊"""
+        with self.engine.connect() as conn:
+            total, size = conn.execute(
+                text(f"SELECT count(*), pg_total_relation_size('{self.table}') FROM {self.table}")
+            ).one()
+        return {
+            'total_vectors': total,
+            'embedding_dim': self.embedding_dim,
+            'memory_size_mb': size / (1024 * 1024)
+        }
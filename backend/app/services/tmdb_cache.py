@@ -0,0 +1,112 @@
+"""
+TMDB Response Cache
+TMDB API 回應的本機磁碟快取（gzip 壓縮的 JSON，以端點 + 查詢參數為鍵）
+
+模式:
+    off:       不使用快取
+    readwrite: TTL 內直接返回快取；過期時以 If-None-Match 帶 ETag 重新驗證（304 沿用快取），並寫入新回應
+    replay:    只從快取返回（忽略 TTL），不發出任何網路請求；快取中沒有的請求返回 None
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CACHE_MODES = ("off", "readwrite", "replay")
+
+
+class TMDBResponseCache:
+    """TMDB 回應的磁碟快取（執行緒安全：每個鍵一個檔案，以原子替換寫入）"""
+
+    def __init__(self, directory: str, mode: str = "readwrite", ttl: float = 86400.0):
+        """
+        Args:
+            directory: 快取目錄
+            mode: readwrite | replay（off 時不應建立快取）
+            ttl: 快取有效秒數，過期後重新驗證
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown TMDB cache mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "writes": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    def count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """返回命中、未命中、304 重新驗證與寫入次數"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    @staticmethod
+    def make_key(endpoint: str, params: Optional[Dict] = None) -> str:
+        """端點 + 排序後的查詢參數的 SHA-256"""
+        canonical = json.dumps([endpoint, sorted((params or {}).items())], ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        # 以前兩個字元分目錄，避免單一目錄有數十萬個檔案
+        return os.path.join(self.directory, key[:2], f"{key}.json.gz")
+
+    def get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+        """
+        讀取快取項目
+
+        Returns:
+            {"endpoint", "params", "etag", "fetched_at", "data"}，不存在或無法讀取時返回 None
+        """
+        path = self._path(self.make_key(endpoint, params))
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any], ttl: Optional[float] = None) -> bool:
+        """快取項目是否在 TTL 內（ttl 未指定時使用預設值）"""
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() - entry.get("fetched_at", 0) < ttl
+
+    def put(self, endpoint: str, params: Optional[Dict], data: Any, etag: Optional[str] = None):
+        """寫入快取項目（先寫入暫存檔再替換，並行寫入同一個鍵不會產生損壞的檔案）"""
+        path = self._path(self.make_key(endpoint, params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {"endpoint": endpoint, "params": params or {}, "etag": etag, "fetched_at": time.time(), "data": data}
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.count("writes")
+
+    def touch(self, endpoint: str, params: Optional[Dict], entry: Dict[str, Any]):
+        """304 Not Modified：沿用快取資料並重設 TTL"""
+        self.put(endpoint, params, entry["data"], entry.get("etag"))
+
+
+def create_response_cache(
+    mode: str,
+    directory: str,
+    ttl: float
+) -> Optional[TMDBResponseCache]:
+    """依設定建立快取，mode 為 off 時返回 None"""
+    if mode == "off":
+        return None
+    return TMDBResponseCache(directory, mode=mode, ttl=ttl)
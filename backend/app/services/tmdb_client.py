@@ -3,16 +3,93 @@ TMDB API Client
 提供與 TMDB API 互動的功能，包括獲取電影、類型、演職人員等資料
 """
 
+import random
 import requests
+import threading
 import time
-from typing import Optional, Dict, List, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, List, Any, Iterable, Sequence
+from requests.adapters import HTTPAdapter
 from app.core.config import settings
+from app.services.tmdb_cache import TMDBResponseCache, create_response_cache
+
+
+# 同步電影時隨詳細資料一併獲取的子資源
+SYNC_APPEND_TO_RESPONSE = ("credits", "keywords")
+
+
+class TokenBucket:
+    """
+    Token bucket 速率限制器（執行緒安全）
+    每秒補充 rate 個 token，最多累積 capacity 個；所有執行緒共用同一個 bucket
+    伺服器要求暫停（429 Retry-After）時以 pause() 暫停整個 bucket，所有執行緒都等到暫停結束
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._pause_until = 0.0
+        self._lock = threading.Lock()
+    
+    def pause(self, seconds: float):
+        """
+        暫停發放 token seconds 秒（與進行中的暫停取較晚者）
+        暫停期間不累積 token，結束後從空的 bucket 開始補充，避免恢復時一次送出大量請求
+        """
+        with self._lock:
+            pause_until = time.monotonic() + seconds
+            if pause_until > self._pause_until:
+                self._pause_until = pause_until
+                self._tokens = 0.0
+                self._updated_at = pause_until
+    
+    def acquire(self):
+        """取得一個 token，不足或暫停中時等待"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._pause_until:
+                    wait = self._pause_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                    self._updated_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
 
 
 class TMDBClient:
     """TMDB API 客戶端"""
     
-    def __init__(self):
+    # 可重試的狀態碼（429 另外依 Retry-After 處理）
+    RETRY_STATUS_CODES = {500, 502, 503, 504}
+    
+    def __init__(
+        self,
+        rate_limit: float = settings.TMDB_RATE_LIMIT_PER_SECOND,
+        max_workers: int = settings.TMDB_MAX_WORKERS,
+        max_retries: int = settings.TMDB_MAX_RETRIES,
+        backoff_base: float = settings.TMDB_BACKOFF_BASE,
+        backoff_max: float = settings.TMDB_BACKOFF_MAX,
+        timeout: float = settings.TMDB_TIMEOUT,
+        cache: Optional[TMDBResponseCache] = None
+    ):
+        """
+        Args:
+            rate_limit: 每秒最多請求數（所有執行緒共用）
+            max_workers: 並行請求的執行緒數量
+            max_retries: 5xx、逾時、連線錯誤與 429 的最多重試次數
+            backoff_base: 指數退避的基準秒數（第 n 次重試最多等待 base × 2^n）
+            backoff_max: 單次退避的最長秒數
+            timeout: 單一請求的逾時秒數
+            cache: 回應的磁碟快取（None 時不使用快取）
+        """
         self.api_key = settings.TMDB_API_KEY
         self.access_token = settings.TMDB_READ_ACCESS_TOKEN
         self.base_url = settings.TMDB_BASE_URL
@@ -24,30 +101,99 @@ class TMDBClient:
             "Content-Type": "application/json;charset=utf-8"
         }
         
-        # 速率限制：TMDB 免費版每秒最多 40 requests
-        self.rate_limit_delay = 0.025  # 25ms between requests
-        self.last_request_time = 0
+        # 速率限制：TMDB 每秒最多約 40 requests，允許 1 秒內的突發
+        self.rate_limiter = TokenBucket(rate_limit)
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        
+        # 重試設定
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        
+        # 共用連線池（keep-alive），大小與並行數相同，避免每個請求重新建立 TLS 連線
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_workers))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        # 回應快取（readwrite / replay）
+        self.cache = cache
+        
+        # 請求統計
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "failures": 0}
     
     def _wait_for_rate_limit(self):
         """等待以符合速率限制"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+        self.rate_limiter.acquire()
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """並行請求的執行緒池（首次使用時建立）"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tmdb")
+        return self._executor
+    
+    def submit(self, func, *args, **kwargs) -> Future:
+        """在執行緒池中執行請求，返回 Future"""
+        return self.executor.submit(func, *args, **kwargs)
+    
+    def close(self):
+        """關閉執行緒池與連線"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
+    
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def get_stats(self) -> Dict[str, int]:
+        """返回請求、重試、429 與最終失敗的次數（使用快取時加上 cache_ 開頭的快取統計）"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        if self.cache is not None:
+            stats.update({f"cache_{key}": value for key, value in self.cache.get_stats().items()})
+        return stats
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """指數退避 + full jitter：在 [0, min(max, base × 2^attempt)] 之間隨機等待"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
+    def _retry_after_delay(self, response: requests.Response, attempt: int) -> float:
+        """429 時依 Retry-After（秒數或 HTTP 日期）等待，缺少時使用指數退避"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        return self._backoff_delay(attempt)
+    
+    def _make_request(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Optional[Dict]:
         """
         發送 API 請求
         
         Args:
             endpoint: API 端點（例如 "/movie/popular"）
             params: 查詢參數
+            cache_ttl: 此請求的快取有效秒數（None 使用快取預設值，0 代表每次以 ETag 重新驗證）
         
         Returns:
-            API 回應的 JSON 資料，失敗時返回 None
+            API 回應的 JSON 資料，重試後仍失敗時返回 None
         """
-        self._wait_for_rate_limit()
-        
         url = f"{self.base_url}{endpoint}"
         
         # 默認使用繁體中文
@@ -56,13 +202,62 @@ class TMDBClient:
         if "language" not in params:
             params["language"] = "zh-TW"
         
-        try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API 請求失敗 [{endpoint}]: {e}")
-            return None
+        # 快取：TTL 內（或 replay 模式）不發出請求，也不佔用速率限制名額
+        entry = None
+        headers = None
+        if self.cache is not None:
+            entry = self.cache.get(endpoint, params)
+            if entry is not None and (self.cache.replay or self.cache.is_fresh(entry, cache_ttl)):
+                self.cache.count("hits")
+                return entry["data"]
+            self.cache.count("misses")
+            if self.cache.replay:
+                return None
+            if entry is not None and entry.get("etag"):
+                headers = {"If-None-Match": entry["etag"]}
+        
+        self._wait_for_rate_limit()
+        
+        for attempt in range(self.max_retries + 1):
+            self._count("requests")
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                error, delay = e, self._backoff_delay(attempt)
+            else:
+                if response.status_code == 429:
+                    # 暫停共用的 bucket：所有執行緒（包含本執行緒的重試）都等到 Retry-After 之後才送出請求
+                    self._count("rate_limited")
+                    self.rate_limiter.pause(self._retry_after_delay(response, attempt))
+                    error, delay = "429 Too Many Requests", 0.0
+                elif response.status_code in self.RETRY_STATUS_CODES:
+                    error, delay = f"{response.status_code} Server Error", self._backoff_delay(attempt)
+                elif response.status_code == 304 and entry is not None:
+                    # 內容未變更：沿用快取並重設 TTL
+                    self.cache.count("revalidated")
+                    self.cache.touch(endpoint, params, entry)
+                    return entry["data"]
+                else:
+                    try:
+                        response.raise_for_status()
+                        data = response.json()
+                        if self.cache is not None:
+                            self.cache.put(endpoint, params, data, response.headers.get("ETag"))
+                        return data
+                    except (requests.exceptions.RequestException, ValueError) as e:
+                        # 4xx（例如 404）與無效的回應不重試
+                        self._count("failures")
+                        print(f"API 請求失敗 [{endpoint}]: {e}")
+                        return None
+            
+            if attempt < self.max_retries:
+                self._count("retries")
+                time.sleep(delay)
+                self._wait_for_rate_limit()
+        
+        self._count("failures")
+        print(f"API 請求失敗 [{endpoint}]（已重試 {self.max_retries} 次）: {error}")
+        return None
     
     def get_genres(self) -> List[Dict[str, Any]]:
         """
@@ -112,17 +307,26 @@ class TMDBClient:
         """
         return self._make_request("/movie/now_playing", {"page": page})
     
-    def get_movie_details(self, movie_id: int) -> Optional[Dict]:
+    def get_movie_details(
+        self,
+        movie_id: int,
+        append_to_response: Optional[Sequence[str]] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Optional[Dict]:
         """
         獲取電影詳細資料
         
         Args:
             movie_id: TMDB 電影 ID
+            append_to_response: 一併返回的子資源（例如 ["credits", "keywords", "release_dates"]），
+                                只佔一個請求與一個速率限制名額
+            cache_ttl: 快取有效秒數（已知有變更的電影傳入 0，以 ETag 重新驗證）
         
         Returns:
-            電影詳細資訊
+            電影詳細資訊；附加的子資源以同名欄位返回（credits、keywords、release_dates）
         """
-        return self._make_request(f"/movie/{movie_id}")
+        params = {"append_to_response": ",".join(append_to_response)} if append_to_response else None
+        return self._make_request(f"/movie/{movie_id}", params, cache_ttl=cache_ttl)
     
     def get_movie_credits(self, movie_id: int) -> Optional[Dict]:
         """
@@ -136,6 +340,47 @@ class TMDBClient:
         """
         return self._make_request(f"/movie/{movie_id}/credits")
     
+    def get_movie_changes(self, start_date: date, end_date: date, page: int = 1) -> Optional[Dict]:
+        """
+        獲取期間內資料有變更的電影 ID（TMDB 每次查詢最多 14 天）
+        
+        Args:
+            start_date: 開始日期
+            end_date: 結束日期
+            page: 頁碼（每頁 100 筆）
+        
+        Returns:
+            包含 results（id、adult）與 total_pages 的字典
+        """
+        # 變更清單每次都重新驗證，避免快取讓增量同步漏掉新的變更
+        return self._make_request("/movie/changes", {
+            "start_date": start_date.isoformat(),
+            "end_date": end_date.isoformat(),
+            "page": page
+        }, cache_ttl=0)
+    
+    def prefetch_movies(
+        self,
+        tmdb_ids: Iterable[int],
+        append_to_response: Sequence[str] = SYNC_APPEND_TO_RESPONSE,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[int, Future]:
+        """
+        並行獲取多部電影的詳細資料（預設一併返回演職人員與關鍵字）
+        
+        Args:
+            tmdb_ids: TMDB 電影 ID 列表
+            append_to_response: 一併返回的子資源
+            cache_ttl: 快取有效秒數（見 get_movie_details）
+        
+        Returns:
+            {tmdb_id: Future}，Future 結果與 get_movie_details 相同
+        """
+        return {
+            tmdb_id: self.submit(self.get_movie_details, tmdb_id, append_to_response, cache_ttl)
+            for tmdb_id in tmdb_ids
+        }
+    
     def get_image_url(self, path: str, size: str = "original") -> str:
         """
         構建完整的圖片 URL
@@ -166,4 +411,6 @@ class TMDBClient:
 
 
 # 單例實例
-tmdb_client = TMDBClient()
+tmdb_client = TMDBClient(cache=create_response_cache(
+    settings.TMDB_CACHE_MODE, settings.TMDB_CACHE_DIR, settings.TMDB_CACHE_TTL_SECONDS
+))
@@ -2,13 +2,23 @@
 Vector Store
 自定義向量存儲系統（替代 ChromaDB）
 使用 numpy 實現基於餘弦相似度的向量搜尋
+
+正規化後的向量矩陣與類型索引（類型名稱 → 向量索引）在首次搜尋時建立並快取，
+新增或載入向量後失效；元資料中的類型名稱以 sys.intern 共用同一個字串
 """
 import numpy as np
+import os
 import pickle
-from typing import List, Dict, Tuple, Optional
+import sys
+from typing import List, Dict, Tuple, Optional, Union, TYPE_CHECKING
 from pathlib import Path
 import logging
 
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.pgvector_store import PgVectorStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +36,37 @@ class VectorStore:
         self.vectors = np.array([]).reshape(0, embedding_dim)  # (n_vectors, dim)
         self.metadata = []  # List of dicts containing movie info
         self.movie_id_to_index = {}  # movie_id -> vector index mapping
+        self._invalidate()
+    
+    def _invalidate(self):
+        """向量或元資料改變後清除快取的正規化矩陣與類型索引"""
+        self._normalized: Optional[np.ndarray] = None
+        self._genre_index: Optional[Dict[str, np.ndarray]] = None
+    
+    @staticmethod
+    def _intern_genres(metadata: Dict) -> Dict:
+        """類型名稱改用 intern 字串（所有電影共用，pickle 時也只保存一次）"""
+        if metadata.get('genres'):
+            metadata['genres'] = [sys.intern(genre) for genre in metadata['genres']]
+        return metadata
+    
+    @property
+    def normalized_vectors(self) -> np.ndarray:
+        """L2 正規化後的向量矩陣（快取，搜尋時不必每次重新計算）"""
+        if self._normalized is None:
+            norms = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+            self._normalized = self.vectors / (norms + 1e-10)
+        return self._normalized
+    
+    def genre_indices(self, genre: str) -> np.ndarray:
+        """屬於指定類型的向量索引（首次呼叫時一次建立所有類型的索引）"""
+        if self._genre_index is None:
+            index: Dict[str, List[int]] = {}
+            for i, metadata in enumerate(self.metadata):
+                for name in metadata.get('genres') or ():
+                    index.setdefault(name, []).append(i)
+            self._genre_index = {name: np.asarray(ids, dtype=np.int64) for name, ids in index.items()}
+        return self._genre_index.get(genre, np.empty(0, dtype=np.int64))
     
     def add(self, movie_id: str, vector: np.ndarray, metadata: Dict):
         """
@@ -36,6 +77,8 @@ class VectorStore:
             vector: 向量 (768,)
             metadata: 電影元資料 (title, overview, genres, etc.)
         """
+        self._invalidate()
+        metadata = self._intern_genres(metadata)
         if movie_id in self.movie_id_to_index:
             # 更新現有向量
             index = self.movie_id_to_index[movie_id]
@@ -50,14 +93,35 @@ class VectorStore:
     def add_batch(self, movie_ids: List[str], vectors: np.ndarray, metadata_list: List[Dict]):
         """
         批量添加向量
+        已存在的 movie_id 原地更新，新的向量一次 vstack 附加（避免逐筆複製整個矩陣）
         
         Args:
             movie_ids: 電影 ID 列表
             vectors: 向量矩陣 (n, 768)
             metadata_list: 元資料列表
         """
-        for movie_id, vector, metadata in zip(movie_ids, vectors, metadata_list):
-            self.add(movie_id, vector, metadata)
+        vectors = np.asarray(vectors).reshape(len(movie_ids), -1)
+        self._invalidate()
+        metadata_list = [self._intern_genres(metadata) for metadata in metadata_list]
+        new_rows = {}  # movie_id -> 批次內的位置（同一 ID 重複時以最後一筆為準）
+        
+        for i, (movie_id, metadata) in enumerate(zip(movie_ids, metadata_list)):
+            if movie_id in self.movie_id_to_index:
+                index = self.movie_id_to_index[movie_id]
+                self.vectors[index] = vectors[i]
+                self.metadata[index] = metadata
+            else:
+                new_rows[movie_id] = i
+        
+        if not new_rows:
+            return
+        
+        positions = list(new_rows.values())
+        start = len(self.metadata)
+        self.vectors = np.vstack([self.vectors, vectors[positions]])
+        for offset, (movie_id, i) in enumerate(new_rows.items()):
+            self.metadata.append(metadata_list[i])
+            self.movie_id_to_index[movie_id] = start + offset
     
     def search(
         self, 
@@ -83,32 +147,24 @@ class VectorStore:
         # 正規化查詢向量
         query_norm = query_vector / (np.linalg.norm(query_vector) + 1e-10)
         
-        # 正規化所有向量
-        vectors_norm = self.vectors / (np.linalg.norm(self.vectors, axis=1, keepdims=True) + 1e-10)
-        
-        # 計算相似度
-        similarities = np.dot(vectors_norm, query_norm)
-        
-        # 類型篩選
+        # 類型篩選：只計算該類型電影的相似度
         if filter_genre:
-            valid_indices = []
-            for idx, metadata in enumerate(self.metadata):
-                genres = metadata.get('genres', [])
-                if filter_genre in genres:
-                    valid_indices.append(idx)
-            
-            if not valid_indices:
+            candidates = self.genre_indices(filter_genre)
+            if len(candidates) == 0:
                 return []
-            
-            # 只保留符合類型的結果
-            filtered_similarities = [(idx, similarities[idx]) for idx in valid_indices]
-            filtered_similarities.sort(key=lambda x: x[1], reverse=True)
-            top_indices = [idx for idx, _ in filtered_similarities[:top_k]]
-            top_similarities = [sim for _, sim in filtered_similarities[:top_k]]
+            similarities = self.normalized_vectors[candidates] @ query_norm
         else:
-            # 獲取 top-k
-            top_indices = np.argsort(similarities)[::-1][:top_k]
-            top_similarities = similarities[top_indices]
+            candidates = None
+            similarities = self.normalized_vectors @ query_norm
+        
+        # 獲取 top-k（argpartition 取出前 k 個後只排序這 k 個）
+        k = min(top_k, len(similarities))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top], kind="stable")]
+        top_similarities = similarities[top]
+        top_indices = candidates[top] if candidates is not None else top
         
         # 準備結果
         results = []
@@ -119,6 +175,23 @@ class VectorStore:
         
         return results
     
+    def score_movies(self, query_vector: np.ndarray, movie_ids: List[str]) -> List[Tuple[str, float, Dict]]:
+        """
+        計算指定電影與查詢向量的餘弦相似度（不在存儲中的 ID 略過）
+        
+        Returns:
+            List of (movie_id, similarity, metadata)，順序與 movie_ids 相同
+        """
+        indices = [self.movie_id_to_index[movie_id] for movie_id in movie_ids if movie_id in self.movie_id_to_index]
+        if not indices:
+            return []
+        query_norm = query_vector / (np.linalg.norm(query_vector) + 1e-10)
+        similarities = self.normalized_vectors[indices] @ query_norm
+        return [
+            (self.metadata[idx]['movie_id'], float(sim), self.metadata[idx])
+            for idx, sim in zip(indices, similarities)
+        ]
+    
     def get_by_movie_id(self, movie_id: str) -> Optional[Tuple[np.ndarray, Dict]]:
         """根據 movie_id 獲取向量和元資料"""
         if movie_id not in self.movie_id_to_index:
@@ -128,7 +201,10 @@ class VectorStore:
         return self.vectors[index], self.metadata[index]
     
     def save(self, filepath: str):
-        """保存向量存儲到檔案"""
+        """
+        保存向量存儲到檔案
+        先寫入暫存檔再以 os.replace 取代，寫入中斷時不會留下損毀的檔案
+        """
         data = {
             'embedding_dim': self.embedding_dim,
             'vectors': self.vectors,
@@ -137,8 +213,12 @@ class VectorStore:
         }
         
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'wb') as f:
-            pickle.dump(data, f)
+        tmp_path = f"{filepath}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
         
         logger.info(f"Vector store saved to {filepath} ({len(self.metadata)} vectors)")
     
@@ -151,6 +231,9 @@ class VectorStore:
         self.vectors = data['vectors']
         self.metadata = data['metadata']
         self.movie_id_to_index = data['movie_id_to_index']
+        self._invalidate()
+        for metadata in self.metadata:
+            self._intern_genres(metadata)
         
         logger.info(f"Vector store loaded from {filepath} ({len(self.metadata)} vectors)")
     
@@ -167,13 +250,43 @@ class VectorStore:
         }
 
 
+def create_vector_store(
+    database_url: str = settings.DATABASE_URL,
+    backend: str = settings.VECTOR_STORE_BACKEND
+) -> Union[VectorStore, "PgVectorStore"]:
+    """
+    根據設定建立向量存儲
+    
+    Args:
+        database_url: 資料庫 URL（pgvector 後端使用）
+        backend: auto | memory | pgvector；auto 依 database_url 判斷
+    """
+    if backend == "auto":
+        backend = "pgvector" if database_url.startswith("postgresql") else "memory"
+    
+    if backend == "memory":
+        return VectorStore()
+    if backend != "pgvector":
+        raise ValueError(f"Unknown vector store backend: {backend}")
+    
+    from app.db.session import engine, create_db_engine
+    from app.services.pgvector_store import PgVectorStore
+    
+    return PgVectorStore(
+        engine if database_url == settings.DATABASE_URL else create_db_engine(database_url),
+        hnsw_m=settings.PGVECTOR_HNSW_M,
+        hnsw_ef_construction=settings.PGVECTOR_HNSW_EF_CONSTRUCTION,
+        hnsw_ef_search=settings.PGVECTOR_HNSW_EF_SEARCH
+    )
+
+
 # 全域單例
 _vector_store = None
 
 
-def get_vector_store() -> VectorStore:
-    """獲取 Vector Store 單例"""
+def get_vector_store() -> Union[VectorStore, "PgVectorStore"]:
+    """獲取 Vector Store 單例（後端由 VECTOR_STORE_BACKEND / DATABASE_URL 決定）"""
     global _vector_store
     if _vector_store is None:
-        _vector_store = VectorStore()
+        _vector_store = create_vector_store()
     return _vector_store
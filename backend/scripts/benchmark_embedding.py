@@ -0,0 +1,153 @@
+"""
+Benchmark Embedding Throughput
+以資料庫中的電影文本（create_movie_text）測量不同 worker 數量的編碼吞吐量，
+以及 token 長度分桶相對於 SentenceTransformer 預設批次的效果
+
+用法:
+    python scripts/benchmark_embedding.py --workers 1 2 4 8 16 32 --texts 20000
+    python scripts/benchmark_embedding.py --compare-bucketing --texts 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy.orm import selectinload
+
+from app.db.session import SessionLocal
+from app.models.movie_model import Movie
+from app.models.movie_genre_model import MovieGenre
+from app.services.embedding_service import get_embedding_service
+
+
+def load_movie_texts(embedding_service, limit: int, seed: int = 0) -> list:
+    """從資料庫取樣電影文本（保留真實的長度分佈）"""
+    db = SessionLocal()
+    try:
+        movies = (
+            db.query(Movie)
+            .options(selectinload(Movie.genres).joinedload(MovieGenre.genre))
+            .order_by(Movie.id)
+            .limit(limit)
+            .all()
+        )
+        texts = [
+            embedding_service.create_movie_text(
+                title=movie.title,
+                overview=movie.overview or "",
+                genres=[mg.genre.name for mg in movie.genres]
+            )
+            for movie in movies
+        ]
+    finally:
+        db.close()
+
+    if not texts:
+        raise SystemExit("❌ 資料庫沒有電影，請先執行 scripts/sync_tmdb.py")
+
+    # 資料庫電影數量不足時重複取樣
+    rng = random.Random(seed)
+    while len(texts) < limit:
+        texts.append(rng.choice(texts))
+    return texts
+
+
+def time_encode(embedding_service, texts: list, batch_size: int) -> float:
+    """返回編碼所有文本的秒數（先以少量文本預熱）"""
+    embedding_service.encode_texts(texts[:batch_size], batch_size=batch_size)
+    start = time.perf_counter()
+    embedding_service.encode_texts(texts, batch_size=batch_size)
+    return time.perf_counter() - start
+
+
+def padding_efficiency(lengths: np.ndarray, batches: list) -> float:
+    """有效 token 佔 padding 後 token 的比例（1.0 代表沒有浪費）"""
+    padded = sum(len(batch) * lengths[batch].max() for batch in batches)
+    return lengths.sum() / padded
+
+
+def compare_bucketing(embedding_service, texts: list, batch_size: int):
+    """比較 SentenceTransformer 預設批次（按字元長度排序）與 token 長度分桶"""
+    lengths = embedding_service.token_lengths(texts)
+    print(f"\n📏 token 長度: p50={np.percentile(lengths, 50):.0f} "
+          f"p90={np.percentile(lengths, 90):.0f} max={lengths.max()} "
+          f"（max_seq_length={embedding_service.max_seq_length}，"
+          f"截斷 {np.mean(lengths >= embedding_service.max_seq_length) * 100:.1f}%）")
+
+    # SentenceTransformer.encode 內部按字元長度降序排列後切成固定大小的批次
+    char_order = np.argsort([-len(text) for text in texts], kind="stable")
+    default_batches = [char_order[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    token_order = np.argsort(lengths, kind="stable")
+    bucket_batches = [
+        token_order[bucket]
+        for bucket in embedding_service.length_buckets(lengths[token_order], batch_size)
+    ]
+
+    embedding_service.model.encode(texts[:batch_size], batch_size=batch_size, show_progress_bar=False)
+    start = time.perf_counter()
+    baseline = embedding_service.model.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    default_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bucketed = embedding_service.encode_texts(texts, batch_size=batch_size)
+    bucket_seconds = time.perf_counter() - start
+
+    cosine = np.sum(baseline * bucketed, axis=1) / (
+        np.linalg.norm(baseline, axis=1) * np.linalg.norm(bucketed, axis=1) + 1e-10
+    )
+
+    print("\n" + "=" * 60)
+    print(f"{'':<14}{'batches':>10}{'padding eff.':>14}{'texts/s':>12}")
+    print("=" * 60)
+    print(f"{'預設批次':<12}{len(default_batches):>10}"
+          f"{padding_efficiency(lengths, default_batches):>14.1%}{len(texts) / default_seconds:>12.1f}")
+    print(f"{'長度分桶':<12}{len(bucket_batches):>10}"
+          f"{padding_efficiency(lengths, bucket_batches):>14.1%}{len(texts) / bucket_seconds:>12.1f}")
+    print(f"\n  加速: {default_seconds / bucket_seconds:.2f}x，向量最小餘弦相似度: {cosine.min():.6f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding throughput per worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="要測試的 worker 數量")
+    parser.add_argument("--texts", type=int, default=5000, help="編碼的文本數量")
+    parser.add_argument("--batch-size", type=int, default=32, help="模型每次 forward 的文本數量")
+    parser.add_argument("--compare-bucketing", action="store_true", help="比較預設批次與 token 長度分桶")
+    args = parser.parse_args()
+
+    embedding_service = get_embedding_service()
+    texts = load_movie_texts(embedding_service, args.texts)
+    print(f"📦 {len(texts)} 部電影文本，平均 {sum(map(len, texts)) / len(texts):.0f} 字元")
+    print(f"🖥️  CPU 核心數: {os.cpu_count()}")
+
+    if args.compare_bucketing:
+        compare_bucketing(embedding_service, texts, args.batch_size)
+        return
+
+    results = []
+    for workers in args.workers:
+        if workers > 1:
+            embedding_service.start_pool(workers)
+        try:
+            seconds = time_encode(embedding_service, texts, args.batch_size)
+        finally:
+            embedding_service.stop_pool()
+        results.append((workers, len(texts) / seconds))
+        print(f"   workers={workers:<3} {len(texts) / seconds:8.1f} texts/s")
+
+    baseline = results[0][1]
+    print("\n" + "=" * 60)
+    print(f"{'workers':>8}{'texts/s':>12}{'per worker':>14}{'speedup':>10}")
+    print("=" * 60)
+    for workers, throughput in results:
+        print(f"{workers:>8}{throughput:>12.1f}{throughput / workers:>14.1f}{throughput / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Benchmark Ingest
+以合成的 TMDB 詳細資料（與 Fake TMDB Server 相同的確定性資料）量測同步寫入階段，不經過網路：
+比較逐部 ORM 寫入（批量寫入前 sync_movie/sync_person 的做法）、ingest_movies 的批量 upsert，
+以及搭配 IdentityCache（sync_tmdb.py main() 的做法）的批量 upsert
+
+用法:
+    python scripts/benchmark_ingest.py --movies 2000 --page-size 20
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import Base, create_db_engine
+from app.models.genre_model import Genre
+from app.models.keyword_model import Keyword
+from app.models.movie_credit_model import MovieCredit
+from app.models.movie_genre_model import MovieGenre
+from app.models.movie_keyword_model import MovieKeyword
+from app.models.movie_model import Movie
+from app.models.person_model import Person
+from app.repositories.ingest_repository import IdentityCache
+from fake_tmdb_server import GENRES, SUB_RESOURCES, movie_details
+from sync_tmdb import ingest_movies, parse_release_date
+
+
+def make_payloads(n_movies: int) -> list:
+    """合成 append_to_response=credits,keywords 的詳細資料"""
+    payloads = []
+    for tmdb_id in range(1, n_movies + 1):
+        details = movie_details(tmdb_id)
+        details["credits"] = SUB_RESOURCES["credits"](tmdb_id)
+        details["keywords"] = SUB_RESOURCES["keywords"](tmdb_id)
+        payloads.append(details)
+    return payloads
+
+
+def get_or_create(db: Session, model, tmdb_id: int, **values):
+    """逐筆查詢，不存在時新增並 flush"""
+    existing = db.query(model).filter(model.tmdb_id == tmdb_id).first()
+    if existing:
+        return existing
+    record = model(tmdb_id=tmdb_id, **values)
+    db.add(record)
+    db.flush()
+    return record
+
+
+def ingest_row_by_row(db: Session, details_list: list, genre_map: dict) -> int:
+    """批量寫入前的做法：每部電影一次 SELECT，每位人員與關鍵字一次 SELECT + flush"""
+    for details in details_list:
+        if db.query(Movie).filter(Movie.tmdb_id == details["id"]).first():
+            continue
+        movie = Movie(
+            id=str(uuid.uuid4()), tmdb_id=details["id"], title=details["title"],
+            original_title=details["original_title"], overview=details["overview"],
+            release_date=parse_release_date(details["release_date"]), runtime=details["runtime"],
+            vote_average=details["vote_average"], vote_count=details["vote_count"],
+            popularity=details["popularity"], poster_path=details["poster_path"],
+            backdrop_path=details["backdrop_path"],
+        )
+        db.add(movie)
+        db.flush()
+        for genre in details["genres"]:
+            db.add(MovieGenre(movie_id=movie.id, genre_id=genre_map[genre["id"]]))
+        for keyword_data in details["keywords"]["keywords"]:
+            keyword = get_or_create(db, Keyword, keyword_data["id"], name=keyword_data["name"])
+            db.add(MovieKeyword(movie_id=movie.id, keyword_id=keyword.id))
+        for i, cast in enumerate(details["credits"]["cast"][:10]):
+            person = get_or_create(db, Person, cast["id"], id=str(uuid.uuid4()), name=cast["name"])
+            db.add(MovieCredit(movie_id=movie.id, person_id=person.id, role="actor",
+                               character=cast["character"], order_num=i))
+        for crew in details["credits"]["crew"]:
+            if crew["job"] == "Director":
+                person = get_or_create(db, Person, crew["id"], id=str(uuid.uuid4()), name=crew["name"])
+                db.add(MovieCredit(movie_id=movie.id, person_id=person.id, role="director",
+                                   character="", order_num=0))
+    return len(details_list)
+
+
+def run(label: str, ingest, payloads: list, page_size: int, use_cache: bool = False) -> dict:
+    """在全新的 SQLite 資料庫逐頁寫入並提交，計算 SQL 執行次數（包含快取預載）"""
+    path = os.path.join(tempfile.mkdtemp(), "ingest.db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    genres = [Genre(tmdb_id=g["id"], name=g["name"]) for g in GENRES]
+    db.add_all(genres)
+    db.commit()
+    genre_map = {genre.tmdb_id: genre.id for genre in genres}
+
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    extra = (IdentityCache.preload(db),) if use_cache else ()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for offset in range(0, len(payloads), page_size):
+            ingest(db, payloads[offset:offset + page_size], genre_map, *extra)
+            db.commit()
+    seconds = time.perf_counter() - start
+    event.remove(engine, "before_cursor_execute", count)
+
+    result = {
+        "label": label,
+        "seconds": seconds,
+        "statements": statements,
+        "movies": db.query(Movie).count(),
+        "people": db.query(Person).count(),
+        "credits": db.query(MovieCredit).count(),
+        "keywords": db.query(MovieKeyword).count(),
+    }
+    db.close()
+    engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TMDB sync ingest stage on synthetic payloads")
+    parser.add_argument("--movies", type=int, default=2000, help="合成的電影數量")
+    parser.add_argument("--page-size", type=int, default=20, help="每次提交的電影數量（TMDB 一頁 20 部）")
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.movies)
+    print(f"📦 {len(payloads)} 部電影，每頁 {args.page_size} 部")
+
+    results = [
+        run("逐部寫入", ingest_row_by_row, payloads, args.page_size),
+        run("批量 upsert", ingest_movies, payloads, args.page_size),
+        run("批量 + 快取", ingest_movies, payloads, args.page_size, use_cache=True),
+    ]
+
+    print("\n" + "=" * 84)
+    print(f"{'模式':<10}{'movies/s':>10}{'SQL 次數':>10}{'SQL/部':>9}{'movies':>9}{'people':>9}{'credits':>9}{'keywords':>10}")
+    print("=" * 84)
+    for r in results:
+        print(f"{r['label']:<9}{r['movies'] / r['seconds']:>10.1f}{r['statements']:>10}"
+              f"{r['statements'] / r['movies']:>9.1f}{r['movies']:>9}{r['people']:>9}{r['credits']:>9}{r['keywords']:>10}")
+    print(f"\n  加速: 批量 {results[0]['seconds'] / results[1]['seconds']:.1f}x，"
+          f"批量 + 快取 {results[0]['seconds'] / results[2]['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
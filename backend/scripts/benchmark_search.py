@@ -0,0 +1,142 @@
+"""
+Benchmark Movie Search
+在合成資料庫上比較 LIKE 與 FTS5 全文搜尋的效能
+
+用法:
+    python scripts/benchmark_search.py --movies 500000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.db.movie_fts import ensure_movie_fts
+from app.repositories.movie_repository import MovieRepository
+import app.models  # noqa: F401  註冊所有 models
+
+
+WORDS = [
+    "星際", "太空", "探險", "愛情", "故事", "時間", "旅行", "城市", "英雄", "復仇",
+    "家庭", "秘密", "戰爭", "夢想", "魔法", "森林", "海洋", "機器人", "末日", "友情",
+    "偵探", "謀殺", "逃亡", "校園", "青春", "音樂", "舞蹈", "怪獸", "外星人", "殭屍",
+    "space", "love", "war", "city", "night", "dream", "hero", "ghost", "robot", "ocean",
+]
+
+# 額外的隨機詞彙，讓查詢選擇性接近真實資料
+_vocab_rng = random.Random(0)
+VOCABULARY = WORDS + [
+    "".join(chr(_vocab_rng.randint(0x4E00, 0x9FA5)) for _ in range(_vocab_rng.randint(2, 3)))
+    for _ in range(3000)
+]
+
+QUERIES = ["星際探險", "外星人", "時間旅行", "robot", "復仇者", "末日殭屍", "night city"]
+
+
+class LikeMovieRepository(MovieRepository):
+    """強制使用 LIKE 搜尋的 Repository（作為對照組）"""
+
+    def _use_fts(self, query: str) -> bool:
+        return False
+
+
+def random_text(rng: random.Random, n_words: int) -> str:
+    return "".join(rng.choice(VOCABULARY) for _ in range(n_words))
+
+
+def build_database(path: str, n_movies: int, seed: int = 42):
+    """建立含 n_movies 部合成電影的 SQLite 資料庫"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO genres (id, tmdb_id, name) VALUES (?, ?, ?)",
+        [(i, i, f"類型{i}") for i in range(1, 20)]
+    )
+
+    chunk = 50_000
+    for start in range(0, n_movies, chunk):
+        movies = []
+        movie_genres = []
+        for i in range(start, min(start + chunk, n_movies)):
+            movie_id = str(uuid.UUID(int=rng.getrandbits(128)))
+            movies.append((
+                movie_id,
+                i + 1,
+                random_text(rng, 3),
+                random_text(rng, 2),
+                random_text(rng, 40),
+                round(rng.uniform(0, 10), 1),
+                rng.randint(0, 20000),
+                round(rng.expovariate(0.05), 3),
+            ))
+            for genre_id in rng.sample(range(1, 20), 2):
+                movie_genres.append((movie_id, genre_id))
+        conn.executemany(
+            "INSERT INTO movies (id, tmdb_id, title, original_title, overview, "
+            "vote_average, vote_count, popularity) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            movies
+        )
+        conn.executemany("INSERT INTO movie_genres (movie_id, genre_id) VALUES (?, ?)", movie_genres)
+        conn.commit()
+    conn.close()
+
+
+def time_search(repo: MovieRepository, queries, repeat: int) -> float:
+    """返回每次搜尋請求（結果 + 總數）的平均毫秒數"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            repo.search_movies(q, skip=0, limit=20)
+            repo.search_count(q)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(queries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LIKE vs FTS5 movie search")
+    parser.add_argument("--movies", type=int, default=500_000, help="合成電影數量")
+    parser.add_argument("--repeat", type=int, default=3, help="每個查詢重複次數")
+    parser.add_argument("--db", help="資料庫路徑（預設使用暫存檔）")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "benchmark_search.db")
+    if not os.path.exists(path):
+        print(f"📦 建立合成資料庫 ({args.movies} 部電影): {path}")
+        t0 = time.perf_counter()
+        build_database(path, args.movies)
+        print(f"   完成，耗時 {time.perf_counter() - t0:.1f}s")
+
+    engine = create_engine(f"sqlite:///{path}")
+    t0 = time.perf_counter()
+    ensure_movie_fts(engine)
+    print(f"🔎 FTS 索引就緒，耗時 {time.perf_counter() - t0:.1f}s")
+
+    db = sessionmaker(bind=engine)()
+    try:
+        like_ms = time_search(LikeMovieRepository(db), QUERIES, args.repeat)
+        fts_ms = time_search(MovieRepository(db), QUERIES, args.repeat)
+    finally:
+        db.close()
+
+    print("\n" + "=" * 60)
+    print("📊 搜尋效能（每次請求 = 結果 + 總數）")
+    print("=" * 60)
+    print(f"  LIKE: {like_ms:8.1f} ms/request")
+    print(f"  FTS5: {fts_ms:8.1f} ms/request")
+    print(f"  加速: {like_ms / fts_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
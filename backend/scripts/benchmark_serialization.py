@@ -0,0 +1,110 @@
+"""
+Benchmark Listing Serialization
+量測電影列表每頁的 CPU 時間：ORM 路徑（selectinload 預載類型 → MovieListItem.from_orm_movie →
+MovieListResponse → response_model 驗證 → json.dumps）與快速路徑（只選取列表欄位的 Row →
+一次查詢取得類型 ID → GenreRegistry 查詢類型 → 組裝字典 → orjson）
+
+兩種路徑都包含資料庫查詢（SQLite 在行程內執行，也計入 CPU 時間），使用相同的分頁 SQL
+
+用法:
+    python scripts/benchmark_serialization.py --page-size 20 100 --pages 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.movie_model import Movie
+from app.repositories.movie_repository import _group_genre_ids, _movie_genre_ids_stmt, _movies_stmt
+from app.schemas.movie_schema import MovieListItem, MovieListResponse
+from app.services.genre_registry import get_genre_registry
+from app.services.movie_service import movie_list_item
+
+
+def orm_page(db: Session, skip: int, page_size: int) -> bytes:
+    """調整前的列表路徑"""
+    movies = db.execute(_movies_stmt(skip, page_size, None)).scalars().all()
+    response = MovieListResponse(
+        movies=[MovieListItem.from_orm_movie(movie) for movie in movies],
+        total=0, page=1, page_size=page_size, total_pages=0
+    )
+    # FastAPI 依 response_model 重新驗證後以 JSONResponse（json.dumps）輸出
+    validated = MovieListResponse.model_validate(response)
+    return json.dumps(validated.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_page(db: Session, skip: int, page_size: int) -> bytes:
+    """列表欄位 Row + 類型 ID 查詢 + orjson（與 MovieService._build_list_response 相同）"""
+    movies = db.execute(_movies_stmt(skip, page_size, None, rows=True)).all()
+    genre_ids = {}
+    if movies:
+        genre_ids = _group_genre_ids(db.execute(_movie_genre_ids_stmt([movie.id for movie in movies])).all())
+    registry = get_genre_registry()
+    registry.refresh_sync(db)
+    return orjson.dumps({
+        "movies": [movie_list_item(movie, registry.lookup(genre_ids.get(movie.id, ()))) for movie in movies],
+        "total": 0, "page": 1, "page_size": page_size, "total_pages": 0, "next_cursor": None,
+    })
+
+
+def measure(render, db: Session, page_size: int, pages: int, n_movies: int) -> dict:
+    """依序讀取多頁，返回每頁平均 CPU 時間（毫秒）與輸出大小"""
+    max_skip = max(1, n_movies - page_size)
+    render(db, 0, page_size)  # 預熱（編譯 SQL、載入 schema）
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    size = 0
+    for i in range(pages):
+        size += len(render(db, (i * page_size) % max_skip, page_size))
+        db.expunge_all()
+    return {
+        "cpu_ms": (time.process_time() - cpu_start) * 1000 / pages,
+        "wall_ms": (time.perf_counter() - wall_start) * 1000 / pages,
+        "bytes": size / pages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark movie listing serialization per page")
+    parser.add_argument("--page-size", type=int, nargs="+", default=[20, 100], help="每頁電影數量")
+    parser.add_argument("--pages", type=int, default=200, help="每種設定讀取的頁數")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        n_movies = db.query(Movie).count()
+        if not n_movies:
+            raise SystemExit("❌ 資料庫沒有電影，請先執行 scripts/sync_tmdb.py")
+        print(f"📦 {n_movies} 部電影，每種設定 {args.pages} 頁")
+
+        # 兩種路徑的 JSON 內容必須相同
+        check = 1 if n_movies > 1 else 0
+        orm_json = json.loads(orm_page(db, check, max(args.page_size)))
+        fast_json = json.loads(fast_page(db, check, max(args.page_size)))
+        for item in orm_json["movies"] + fast_json["movies"]:
+            item["genres"].sort(key=lambda genre: genre["id"])
+        if orm_json != fast_json:
+            raise SystemExit("❌ 快速路徑的輸出與 ORM 路徑不同")
+        db.expunge_all()
+
+        print("\n" + "=" * 72)
+        print(f"{'page_size':>10}{'路徑':>8}{'CPU ms/頁':>14}{'wall ms/頁':>14}{'bytes/頁':>12}{'speedup':>10}")
+        print("=" * 72)
+        for page_size in args.page_size:
+            orm = measure(orm_page, db, page_size, args.pages, n_movies)
+            fast = measure(fast_page, db, page_size, args.pages, n_movies)
+            for label, r in (("ORM", orm), ("fast", fast)):
+                print(f"{page_size:>10}{label:>8}{r['cpu_ms']:>14.2f}{r['wall_ms']:>14.2f}{r['bytes']:>12.0f}"
+                      f"{orm['cpu_ms'] / r['cpu_ms']:>9.2f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
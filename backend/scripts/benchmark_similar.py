@@ -0,0 +1,126 @@
+"""
+Benchmark Similar Movies
+量測相似電影三種模式（embedding / credits / hybrid）的延遲，並以暴力法（對全部電影計算混合分數）
+驗證 CreditGraph.rerank 的前 top_k 結果正確
+
+向量存儲沒有資料庫中的電影時（或指定 --synthetic），以隨機向量代替（共同演職人員分數不受影響）
+
+用法:
+    python scripts/benchmark_similar.py --samples 200 --top-k 10
+    python scripts/benchmark_similar.py --synthetic
+    python scripts/benchmark_similar.py --synthetic --clusters 0   # 最壞情況：向量分數沒有鑑別力
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.movie_model import Movie
+from app.services.credit_graph import CreditGraph
+from app.services.vector_store import VectorStore
+
+
+def synthetic_store(movie_ids: list, clusters: int, dim: int = 768, seed: int = 0) -> VectorStore:
+    """
+    以隨機向量建立向量存儲（每部電影 1 個類型）
+    clusters > 0 時向量為類型中心 + 雜訊（同類型的餘弦相似度約 0.5，接近真實嵌入的分佈）；
+    0 時為純雜訊（所有相似度接近 0，向量分數幾乎無法排除候選，是 rerank 的最壞情況）
+    """
+    rng = np.random.default_rng(seed)
+    store = VectorStore(embedding_dim=dim)
+    genre_ids = np.arange(len(movie_ids)) % max(clusters, 1)
+    vectors = rng.normal(size=(len(movie_ids), dim)).astype(np.float32)
+    if clusters > 0:
+        vectors += rng.normal(size=(clusters, dim)).astype(np.float32)[genre_ids]
+    metadata = [
+        {'movie_id': movie_id, 'title': f"Movie {i}", 'genres': [f"Genre {genre_ids[i]}"]}
+        for i, movie_id in enumerate(movie_ids)
+    ]
+    store.add_batch(movie_ids, vectors, metadata)
+    return store
+
+
+def brute_force(store: VectorStore, graph: CreditGraph, movie_id: str, top_k: int, weight: float) -> list:
+    """對全部電影計算混合分數的前 top_k 名（驗證用）"""
+    vector, _ = store.get_by_movie_id(movie_id)
+    similarities = store.normalized_vectors @ (vector / (np.linalg.norm(vector) + 1e-10))
+    credit = np.zeros(len(store))
+    neighbor_ids, scores = graph.similar(movie_id)
+    for mid, score in zip(neighbor_ids, scores):
+        if mid in store.movie_id_to_index:
+            credit[store.movie_id_to_index[mid]] = score
+    blended = (1 - weight) * similarities + weight * credit
+    blended[store.movie_id_to_index[movie_id]] = -np.inf
+    order = np.lexsort((-similarities, -blended))[:top_k]
+    return [store.metadata[i]['movie_id'] for i in order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark similar-movie modes")
+    parser.add_argument("--samples", type=int, default=200, help="取樣的來源電影數量")
+    parser.add_argument("--top-k", type=int, default=10, help="返回數量")
+    parser.add_argument("--synthetic", action="store_true", help="使用隨機向量（不載入 data/vector_store.pkl）")
+    parser.add_argument("--clusters", type=int, default=19, help="隨機向量的類型中心數量（0 為純雜訊）")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        movie_ids = [movie_id for (movie_id,) in db.query(Movie.id).order_by(Movie.id)]
+        if not movie_ids:
+            raise SystemExit("❌ 資料庫沒有電影，請先執行 scripts/sync_tmdb.py")
+
+        store = VectorStore()
+        store_path = backend_dir / 'data' / 'vector_store.pkl'
+        if not args.synthetic and store_path.exists():
+            store.load(str(store_path))
+        if not any(movie_id in store.movie_id_to_index for movie_id in movie_ids[:100]):
+            print("ℹ️  向量存儲沒有資料庫中的電影，改用隨機向量")
+            store = synthetic_store(movie_ids, args.clusters)
+
+        graph = CreditGraph(max_cast=settings.SIMILAR_MAX_CAST, director_weight=settings.SIMILAR_DIRECTOR_WEIGHT)
+        start = time.perf_counter()
+        graph.refresh_sync(db)
+        print(f"📦 {len(store)} 個向量，{len(graph)} 部電影有演職人員"
+              f"（建立矩陣 {time.perf_counter() - start:.2f}s）")
+    finally:
+        db.close()
+
+    rng = np.random.default_rng(1)
+    sources = [movie_ids[i] for i in rng.choice(len(movie_ids), min(args.samples, len(movie_ids)), replace=False)]
+    sources = [movie_id for movie_id in sources if movie_id in store.movie_id_to_index]
+    store.normalized_vectors  # 預先建立正規化矩陣（API 行程中只建立一次）
+
+    print("\n" + "=" * 64)
+    print(f"{'mode':>10}{'avg ms':>12}{'p95 ms':>12}{'rerank ms':>12}{'正確':>10}")
+    print("=" * 64)
+    for mode, weight in (("embedding", None), ("credits", 1.0), ("hybrid", settings.SIMILAR_CREDITS_WEIGHT)):
+        latencies, rerank_times, correct = [], [], 0
+        for movie_id in sources:
+            start = time.perf_counter()
+            vector, _ = store.get_by_movie_id(movie_id)
+            results = [r for r in store.search(vector, top_k=args.top_k + 1) if r[0] != movie_id]
+            if weight is None:
+                results = results[:args.top_k]
+            else:
+                rerank_start = time.perf_counter()
+                results = graph.rerank(store, movie_id, vector, results, args.top_k, weight)
+                rerank_times.append(time.perf_counter() - rerank_start)
+            latencies.append(time.perf_counter() - start)
+            if weight is not None:
+                correct += [mid for mid, _, _ in results] == brute_force(store, graph, movie_id, args.top_k, weight)
+
+        latencies = np.array(latencies) * 1000
+        rerank_ms = f"{np.mean(rerank_times) * 1000:.3f}" if rerank_times else "-"
+        accuracy = f"{correct}/{len(sources)}" if weight is not None else "-"
+        print(f"{mode:>10}{latencies.mean():>12.3f}{np.percentile(latencies, 95):>12.3f}{rerank_ms:>12}{accuracy:>10}")
+
+
+if __name__ == "__main__":
+    main()
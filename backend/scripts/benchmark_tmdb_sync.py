@@ -0,0 +1,141 @@
+"""
+Benchmark TMDB Sync
+以本機 Fake TMDB Server（模擬網路延遲）量測 sync_movies_from_endpoint 在不同並行數下的 movies/s
+
+用法:
+    python scripts/benchmark_tmdb_sync.py --workers 1 4 8 --pages 5 --latency-ms 80
+    python scripts/benchmark_tmdb_sync.py --workers 1 8 --rate-limit 1000   # 不受 TMDB 速率限制時的上限
+    python scripts/benchmark_tmdb_sync.py --workers 8 --compare-cache      # 回應快取：首次、重複執行與 replay
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+import sync_tmdb
+from app.core.config import settings
+from app.db.session import Base, create_db_engine
+from app.models.movie_model import Movie
+from app.models.movie_credit_model import MovieCredit
+from app.services.tmdb_cache import TMDBResponseCache
+from app.services.tmdb_client import TMDBClient
+from fake_tmdb_server import start_fake_tmdb_server
+
+
+def run_sync(server, workers: int, rate_limit: float, pages: int, cache: TMDBResponseCache = None) -> dict:
+    """在全新的 SQLite 資料庫執行一次熱門電影同步"""
+    path = os.path.join(tempfile.mkdtemp(), "sync.db")
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+
+    client = TMDBClient(rate_limit=rate_limit, max_workers=workers, cache=cache)
+    client.base_url = server.base_url
+    sync_tmdb.tmdb_client = client
+
+    try:
+        genre_map = sync_tmdb.sync_genres(db)
+        requests_before = server.request_count
+        start = time.perf_counter()
+        synced = sync_tmdb.sync_movies_from_endpoint(
+            db, "熱門電影", client.get_popular_movies, genre_map, max_pages=pages
+        )
+        seconds = time.perf_counter() - start
+        n_requests = server.request_count - requests_before
+        credits = db.query(MovieCredit).count()
+        movies = db.query(Movie).count()
+    finally:
+        client.close()
+        db.close()
+        engine.dispose()
+
+    return {"workers": workers, "synced": synced, "movies": movies, "credits": credits,
+            "requests": n_requests, "seconds": seconds}
+
+
+def compare_cache(server, workers: int, rate_limit: float, pages: int):
+    """同一個快取目錄依序執行：首次（寫入）、重複（TTL 內）、過期（ETag 重新驗證）、replay（不連網）"""
+    directory = tempfile.mkdtemp()
+    passes = [
+        ("首次 readwrite", TMDBResponseCache(directory, mode="readwrite")),
+        ("重複 readwrite", TMDBResponseCache(directory, mode="readwrite")),
+        ("過期 readwrite", TMDBResponseCache(directory, mode="readwrite", ttl=0)),
+        ("replay", TMDBResponseCache(directory, mode="replay")),
+    ]
+    results = []
+    for label, cache in passes:
+        not_modified_before = server.not_modified_count
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            result = run_sync(server, workers, rate_limit, pages, cache)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        result.update(label=label, not_modified=server.not_modified_count - not_modified_before, **cache.get_stats())
+        results.append(result)
+        print(f"   {label:<14} {result['synced'] / result['seconds']:8.1f} movies/s")
+
+    print("\n" + "=" * 80)
+    print(f"{'模式':<14}{'movies':>8}{'requests':>10}{'304':>6}{'hits':>7}{'misses':>8}{'seconds':>10}{'movies/s':>12}")
+    print("=" * 80)
+    for r in results:
+        print(f"{r['label']:<13}{r['movies']:>8}{r['requests']:>10}{r['not_modified']:>6}{r['hits']:>7}"
+              f"{r['misses']:>8}{r['seconds']:>10.2f}{r['synced'] / r['seconds']:>12.1f}")
+    size = sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory) for name in names)
+    print(f"\n  快取大小: {size / 1024:.0f} KB（{results[0]['writes']} 個回應）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TMDB sync throughput against a local fake server")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="要測試的並行請求數量")
+    parser.add_argument("--pages", type=int, default=5, help="同步的列表頁數（每頁 20 部）")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="模擬的每個請求延遲")
+    parser.add_argument("--rate-limit", type=float, default=settings.TMDB_RATE_LIMIT_PER_SECOND,
+                        help="每秒最多請求數")
+    parser.add_argument("--compare-cache", action="store_true",
+                        help="以第一個 workers 值比較回應快取的首次執行、重複執行（TTL 內與過期後 304）與 replay")
+    args = parser.parse_args()
+
+    server = start_fake_tmdb_server(latency_ms=args.latency_ms)
+    print(f"🎬 Fake TMDB API: {server.base_url}（延遲 {args.latency_ms:.0f} ms，"
+          f"速率限制 {args.rate_limit:.0f} req/s）")
+
+    if args.compare_cache:
+        compare_cache(server, args.workers[0], args.rate_limit, args.pages)
+        server.shutdown()
+        return
+
+    # 同步過程的逐部輸出不影響結果，只保留摘要
+    results = []
+    for workers in args.workers:
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            result = run_sync(server, workers, args.rate_limit, args.pages)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        results.append(result)
+        print(f"   workers={workers:<3} {result['synced'] / result['seconds']:8.1f} movies/s")
+
+    baseline = results[0]["synced"] / results[0]["seconds"]
+    print("\n" + "=" * 76)
+    print(f"{'workers':>8}{'movies':>9}{'credits':>10}{'requests':>10}{'seconds':>10}{'movies/s':>12}{'speedup':>10}")
+    print("=" * 76)
+    for r in results:
+        throughput = r["synced"] / r["seconds"]
+        print(f"{r['workers']:>8}{r['movies']:>9}{r['credits']:>10}{r['requests']:>10}{r['seconds']:>10.2f}"
+              f"{throughput:>12.1f}{throughput / baseline:>9.2f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
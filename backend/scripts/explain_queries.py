@@ -0,0 +1,150 @@
+"""
+Explain Repository Queries
+對每個 Repository 查詢執行 EXPLAIN QUERY PLAN，
+若任何查詢對大型資料表進行全表掃描（SCAN 且未使用索引）則以 exit code 1 結束
+
+用法:
+    python scripts/explain_queries.py [--db 資料庫路徑]
+"""
+import argparse
+import os
+import re
+import sys
+from typing import Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.session import engine as default_engine, Base
+from app.db.movie_fts import ensure_movie_fts
+from app.models.movie_model import Movie
+from app.models.genre_model import Genre
+from app.models.person_model import Person
+from app.repositories.movie_repository import MovieRepository
+from app.repositories.genre_repository import GenreRepository
+from app.repositories.person_repository import PersonRepository
+from app.repositories.data_version_repository import DataVersionRepository
+
+# 資料量會隨目錄成長的表，不允許全表掃描
+LARGE_TABLES = {"movies", "movie_genres", "movie_credits", "people", "movie_embeddings"}
+
+# "SCAN movies" 或 "SCAN movies_1"（SQLAlchemy 別名），未接 USING INDEX 即為全表掃描
+FULL_SCAN_PATTERN = re.compile(r"^SCAN (\w+?)(?:_\d+)?(?: |$)(?!.*USING)")
+
+
+def sample_values(db: Session) -> dict:
+    """從資料庫取樣查詢參數（空資料庫時使用假值，查詢計畫相同）"""
+    movie = db.query(Movie.id, Movie.title, Movie.popularity).order_by(Movie.popularity.desc()).first()
+    genre = db.query(Genre.id, Genre.tmdb_id).first()
+    person = db.query(Person.id, Person.tmdb_id).first()
+
+    title = movie.title if movie and movie.title and len(movie.title) >= 3 else "星際效應"
+    return {
+        "movie_id": movie.id if movie else "00000000-0000-0000-0000-000000000000",
+        "cursor": (movie.popularity, movie.id) if movie else (0, ""),
+        "query": title[:3],
+        "genre_id": genre.id if genre else 1,
+        "genre_tmdb_id": genre.tmdb_id if genre else 28,
+        "person_id": person.id if person else "00000000-0000-0000-0000-000000000000",
+        "person_tmdb_id": person.tmdb_id if person else 1,
+    }
+
+
+def repository_calls(db: Session, v: dict) -> List[Tuple[str, Callable]]:
+    """所有需要檢查的 Repository 查詢"""
+    movies = MovieRepository(db)
+    genres = GenreRepository(db)
+    people = PersonRepository(db)
+    versions = DataVersionRepository(db)
+
+    # 注意：少於 3 個字的搜尋會退回 LIKE 全表掃描（trigram 限制），不在檢查範圍內
+    return [
+        ("MovieRepository.get_movie_by_id", lambda: movies.get_movie_by_id(v["movie_id"])),
+        ("MovieRepository.get_movies", lambda: movies.get_movies(skip=40, limit=20)),
+        ("MovieRepository.get_movies(after)", lambda: movies.get_movies(limit=20, after=v["cursor"])),
+        ("MovieRepository.get_total_count", lambda: movies.get_total_count()),
+        ("MovieRepository.search_movies", lambda: movies.search_movies(v["query"], skip=0, limit=20)),
+        ("MovieRepository.search_movies(after)", lambda: movies.search_movies(v["query"], limit=20, after=v["cursor"])),
+        ("MovieRepository.search_count", lambda: movies.search_count(v["query"])),
+        ("MovieRepository.get_movies_by_genre", lambda: movies.get_movies_by_genre(v["genre_id"], skip=0, limit=20)),
+        ("MovieRepository.get_movies_by_genre(after)", lambda: movies.get_movies_by_genre(v["genre_id"], limit=20, after=v["cursor"])),
+        ("MovieRepository.get_genre_counts", lambda: movies.get_genre_counts()),
+        ("GenreRepository.get_all_genres", lambda: genres.get_all_genres()),
+        ("GenreRepository.get_genre_by_id", lambda: genres.get_genre_by_id(v["genre_id"])),
+        ("GenreRepository.get_genre_by_tmdb_id", lambda: genres.get_genre_by_tmdb_id(v["genre_tmdb_id"])),
+        ("PersonRepository.get_person_by_id", lambda: people.get_person_by_id(v["person_id"])),
+        ("PersonRepository.get_person_by_tmdb_id", lambda: people.get_person_by_tmdb_id(v["person_tmdb_id"])),
+        ("PersonRepository.get_popular_actors", lambda: people.get_popular_actors()),
+        ("DataVersionRepository.get_version", lambda: versions.get_version()),
+    ]
+
+
+def explain(conn, statement: str, params) -> List[str]:
+    """執行 EXPLAIN QUERY PLAN 並返回每一行的描述"""
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def find_full_scans(plan: List[str]) -> List[str]:
+    """找出對大型資料表的全表掃描"""
+    violations = []
+    for line in plan:
+        match = FULL_SCAN_PATTERN.match(line)
+        if match and match.group(1) in LARGE_TABLES:
+            violations.append(line)
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN QUERY PLAN for every repository query")
+    parser.add_argument("--db", help="SQLite 資料庫路徑（預設使用 DATABASE_URL）")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.db}") if args.db else default_engine
+    if engine.dialect.name != "sqlite":
+        print("❌ 此工具只支援 SQLite")
+        sys.exit(1)
+    Base.metadata.create_all(bind=engine)
+    ensure_movie_fts(engine)
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    db = sessionmaker(bind=engine)()
+    failures = 0
+    try:
+        calls = repository_calls(db, sample_values(db))
+        event.listen(engine, "before_cursor_execute", capture)
+
+        for name, call in calls:
+            captured.clear()
+            call()
+            statements = list(captured)
+
+            print(f"\n🔍 {name}")
+            with engine.connect() as conn:
+                for statement, params in statements:
+                    plan = explain(conn, statement, params)
+                    violations = find_full_scans(plan)
+                    for line in plan:
+                        marker = "❌" if line in violations else "  "
+                        print(f"   {marker} {line}")
+                    failures += len(violations)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+        db.close()
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ 發現 {failures} 個大型資料表的全表掃描")
+        sys.exit(1)
+    print("✅ 所有查詢都使用索引")
+
+
+if __name__ == "__main__":
+    main()
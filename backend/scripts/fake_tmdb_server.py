@@ -0,0 +1,274 @@
+"""
+Fake TMDB Server
+本機模擬 TMDB API（確定性的假資料 + 可設定的延遲），用於同步流程的測試與效能量測，不消耗 TMDB 配額
+可用 server.add_fault() 注入錯誤回應（5xx、帶 Retry-After 的 429、逾時）測試重試邏輯，
+server.changed_ids 中的電影會出現在 /movie/changes，且詳細資料的評分與人氣度不同；
+回應帶有內容雜湊的 ETag，If-None-Match 相符時返回 304
+
+用法:
+    python scripts/fake_tmdb_server.py --port 8765 --latency-ms 80
+    TMDB_BASE_URL=http://127.0.0.1:8765/3 python scripts/sync_tmdb.py
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Union
+from urllib.parse import parse_qs, urlparse
+
+GENRES = [
+    {"id": 28, "name": "動作"}, {"id": 12, "name": "冒險"}, {"id": 16, "name": "動畫"},
+    {"id": 35, "name": "喜劇"}, {"id": 80, "name": "犯罪"}, {"id": 18, "name": "劇情"},
+    {"id": 14, "name": "奇幻"}, {"id": 27, "name": "恐怖"}, {"id": 10749, "name": "愛情"},
+    {"id": 878, "name": "科幻"}, {"id": 53, "name": "驚悚"},
+]
+
+# 各列表端點的 TMDB ID 起點；相鄰列表有部分重疊，與真實資料相同會出現已存在的電影
+LIST_OFFSETS = {"popular": 1, "top_rated": 61, "now_playing": 121}
+PAGE_SIZE = 20
+TOTAL_PAGES = 500
+N_PEOPLE = 5000
+N_KEYWORDS = 300
+
+Fault = Union[int, tuple, str]
+
+
+def movie_summary(tmdb_id: int) -> dict:
+    return {"id": tmdb_id, "title": f"測試電影 {tmdb_id}", "genre_ids": movie_genre_ids(tmdb_id)}
+
+
+def movie_genre_ids(tmdb_id: int) -> list:
+    return [GENRES[tmdb_id % len(GENRES)]["id"], GENRES[(tmdb_id * 3) % len(GENRES)]["id"]]
+
+
+def movie_details(tmdb_id: int) -> dict:
+    return {
+        "id": tmdb_id,
+        "title": f"測試電影 {tmdb_id}",
+        "original_title": f"Test Movie {tmdb_id}",
+        "overview": f"第 {tmdb_id} 部測試電影的劇情簡介。" * 3,
+        "release_date": f"{1980 + tmdb_id % 45}-{1 + tmdb_id % 12:02d}-{1 + tmdb_id % 28:02d}",
+        "runtime": 80 + tmdb_id % 70,
+        "vote_average": round(5 + (tmdb_id % 50) / 10, 1),
+        "vote_count": tmdb_id * 13 % 20000,
+        "popularity": round(1000 / (1 + tmdb_id % 300), 3),
+        "poster_path": f"/poster_{tmdb_id}.jpg",
+        "backdrop_path": f"/backdrop_{tmdb_id}.jpg",
+        "genres": [g for g in GENRES if g["id"] in movie_genre_ids(tmdb_id)],
+    }
+
+
+def movie_credits(tmdb_id: int) -> dict:
+    # 人員 ID 由電影 ID 推導，不同電影會共用部分演員
+    cast = [
+        {"id": (tmdb_id * 7 + k * 31) % N_PEOPLE + 1, "name": f"演員 {(tmdb_id * 7 + k * 31) % N_PEOPLE + 1}",
+         "character": f"角色 {k}", "profile_path": None}
+        for k in range(15)
+    ]
+    crew = [
+        {"id": N_PEOPLE + tmdb_id % 400 + 1, "name": f"導演 {tmdb_id % 400 + 1}", "job": "Director",
+         "profile_path": None},
+        {"id": N_PEOPLE + 1000 + tmdb_id % 800, "name": f"編劇 {tmdb_id % 800}", "job": "Screenplay",
+         "profile_path": None},
+    ]
+    return {"id": tmdb_id, "cast": cast, "crew": crew}
+
+
+def movie_keywords(tmdb_id: int) -> dict:
+    keyword_ids = sorted({(tmdb_id * 11 + k * 37) % N_KEYWORDS + 1 for k in range(6)})
+    return {"id": tmdb_id, "keywords": [{"id": kid, "name": f"keyword {kid}"} for kid in keyword_ids]}
+
+
+def movie_release_dates(tmdb_id: int) -> dict:
+    release_date = movie_details(tmdb_id)["release_date"]
+    return {"id": tmdb_id, "results": [
+        {"iso_3166_1": "TW", "release_dates": [
+            {"certification": "保護級", "type": 3, "release_date": f"{release_date}T00:00:00.000Z"}
+        ]}
+    ]}
+
+
+# append_to_response 與子資源路徑可用的子資源
+SUB_RESOURCES = {"credits": movie_credits, "keywords": movie_keywords, "release_dates": movie_release_dates}
+
+
+class FakeTMDBHandler(BaseHTTPRequestHandler):
+    """依路徑返回確定性的 JSON，每個請求先等待 server.latency 秒"""
+
+    protocol_version = "HTTP/1.1"
+    # keep-alive 連線上標頭與內容分開寫出，未關閉 Nagle 時每個請求會多出 delayed ACK 的 40 ms
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        # 每個 TCP 連線建立一個 handler，用於確認 keep-alive
+        super().setup()
+        self.server.count_connection()
+
+    def route(self, path: str, query: dict) -> Optional[dict]:
+        page = int(query.get("page", ["1"])[0])
+        if path == "/genre/movie/list":
+            return {"genres": GENRES}
+        if path == "/movie/changes":
+            changed = sorted(self.server.changed_ids)
+            start = (page - 1) * 100
+            return {
+                "page": page,
+                "results": [{"id": tmdb_id, "adult": False} for tmdb_id in changed[start:start + 100]],
+                "total_pages": max(1, (len(changed) + 99) // 100),
+                "total_results": len(changed),
+            }
+        match = re.fullmatch(r"/movie/(popular|top_rated|now_playing)", path)
+        if match:
+            start = LIST_OFFSETS[match.group(1)] + (page - 1) * PAGE_SIZE
+            return {
+                "page": page,
+                "results": [movie_summary(tmdb_id) for tmdb_id in range(start, start + PAGE_SIZE)],
+                "total_pages": TOTAL_PAGES,
+                "total_results": TOTAL_PAGES * PAGE_SIZE,
+            }
+        match = re.fullmatch(r"/movie/(\d+)(?:/(credits|keywords|release_dates))?", path)
+        if match:
+            tmdb_id = int(match.group(1))
+            if match.group(2):
+                return SUB_RESOURCES[match.group(2)](tmdb_id)
+            details = movie_details(tmdb_id)
+            if tmdb_id in self.server.changed_ids:
+                details["vote_count"] += 1000
+                details["popularity"] = round(details["popularity"] * 2, 3)
+            for name in query.get("append_to_response", [""])[0].split(","):
+                if name in SUB_RESOURCES:
+                    details[name] = SUB_RESOURCES[name](tmdb_id)
+            return details
+        return None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        path = url.path[len(self.server.prefix):] if url.path.startswith(self.server.prefix) else url.path
+        self.server.count_request()
+        time.sleep(self.server.latency)
+
+        fault = self.server.next_fault(path)
+        if fault == "timeout":
+            time.sleep(self.server.timeout_delay)
+            fault = None
+        if fault is not None:
+            status, retry_after = fault if isinstance(fault, tuple) else (fault, None)
+            self.send_json(status, {"status_message": "Injected fault"},
+                           {"Retry-After": str(retry_after)} if retry_after is not None else {})
+            return
+
+        payload = self.route(path, parse_qs(url.query))
+        if payload is None:
+            self.send_json(404, {"status_message": "Not found"})
+            return
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.server.count_not_modified()
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_json(200, payload, {"ETag": etag}, body)
+
+    def send_json(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None,
+                  body: Optional[bytes] = None):
+        if body is None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json;charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeTMDBServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, prefix: str = "/3"):
+        super().__init__(address, FakeTMDBHandler)
+        self.latency = latency
+        self.prefix = prefix
+        self.request_count = 0
+        self.connection_count = 0
+        self.not_modified_count = 0
+        self.timeout_delay = 1.0
+        self.faults: Dict[str, List[Fault]] = {}
+        self.changed_ids: Set[int] = set()
+        self._count_lock = threading.Lock()
+
+    def count_request(self):
+        with self._count_lock:
+            self.request_count += 1
+
+    def count_not_modified(self):
+        with self._count_lock:
+            self.not_modified_count += 1
+
+    def count_connection(self):
+        with self._count_lock:
+            self.connection_count += 1
+
+    def add_fault(self, path: str, *faults: Fault):
+        """
+        指定路徑接下來的請求依序返回錯誤，用完後恢復正常回應
+
+        Args:
+            path: 不含前綴的路徑（例如 "/movie/550"）
+            faults: 狀態碼（503）、(429, Retry-After 秒數)，或 "timeout"（延遲 timeout_delay 秒後才回應）
+        """
+        with self._count_lock:
+            self.faults.setdefault(path, []).extend(faults)
+
+    def next_fault(self, path: str) -> Optional[Fault]:
+        with self._count_lock:
+            pending = self.faults.get(path)
+            return pending.pop(0) if pending else None
+
+    def handle_error(self, request, client_address):
+        # 注入逾時後客戶端已斷線，寫回應時的 BrokenPipe 屬預期行為
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+
+def start_fake_tmdb_server(port: int = 0, latency_ms: float = 0.0) -> FakeTMDBServer:
+    """在背景執行緒啟動伺服器（port=0 時自動選擇），以 server.base_url 作為 TMDB_BASE_URL"""
+    server = FakeTMDBServer(("127.0.0.1", port), latency=latency_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake TMDB API server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="每個請求的模擬網路延遲")
+    parser.add_argument("--changed", type=int, nargs="*", default=[], help="/movie/changes 返回的 TMDB ID")
+    args = parser.parse_args()
+
+    server = FakeTMDBServer(("127.0.0.1", args.port), latency=args.latency_ms / 1000)
+    server.changed_ids = set(args.changed)
+    print(f"🎬 Fake TMDB API: {server.base_url}（延遲 {args.latency_ms:.0f} ms）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+API Load Test
+以多個並發客戶端對執行中的 API 發送讀取請求，回報吞吐量（req/s）與延遲
+
+比較同步與非同步端點時，分別對兩個版本的伺服器執行相同參數：
+    uvicorn app.main:app --port 8000
+    python scripts/load_test_api.py --base-url http://localhost:8000 --concurrency 32 --duration 20
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+API_PREFIX = "/api/v1"
+
+# 讀取流量組成：(路徑, 權重)
+ENDPOINTS = [
+    ("/movies?page={page}&page_size=20", 5),
+    ("/movies/search?q={query}&page_size=20", 3),
+    ("/movies/{movie_id}", 3),
+    ("/genres", 1),
+]
+
+QUERIES = ["星際", "外星人", "時間旅行", "復仇者", "愛情故事", "robot"]
+
+
+def load_movie_ids(session: requests.Session, base_url: str, n: int = 100) -> list:
+    """取得熱門電影 ID 作為詳細頁的請求對象"""
+    response = session.get(f"{base_url}{API_PREFIX}/movies", params={"page_size": n}, timeout=30)
+    response.raise_for_status()
+    return [movie["id"] for movie in response.json()["movies"]]
+
+
+def client(base_url: str, deadline: float, movie_ids: list, seed: int, results: list, lock: threading.Lock):
+    """單一客戶端：在期限前不斷發送請求"""
+    rng = random.Random(seed)
+    paths = [path for path, _ in ENDPOINTS]
+    weights = [weight for _, weight in ENDPOINTS]
+    latencies = []
+    errors = 0
+
+    with requests.Session() as session:
+        while time.time() < deadline:
+            path = rng.choices(paths, weights)[0].format(
+                page=rng.randint(1, 50),
+                query=rng.choice(QUERIES),
+                movie_id=rng.choice(movie_ids) if movie_ids else "missing",
+            )
+            start = time.perf_counter()
+            try:
+                response = session.get(f"{base_url}{API_PREFIX}{path}", timeout=30)
+                if response.status_code >= 500:
+                    errors += 1
+                    continue
+            except requests.RequestException:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    with lock:
+        results.append((latencies, errors))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for read endpoints")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API 伺服器位址")
+    parser.add_argument("--concurrency", type=int, default=32, help="並發客戶端數量")
+    parser.add_argument("--duration", type=float, default=20.0, help="測試秒數")
+    args = parser.parse_args()
+
+    with requests.Session() as session:
+        movie_ids = load_movie_ids(session, args.base_url)
+
+    print(f"⏱️  {args.concurrency} 個並發客戶端，{args.duration:.0f} 秒: {args.base_url}")
+    results = []
+    lock = threading.Lock()
+    deadline = time.time() + args.duration
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for i in range(args.concurrency):
+            executor.submit(client, args.base_url, deadline, movie_ids, i, results, lock)
+
+    latencies = sorted(latency for batch, _ in results for latency in batch)
+    errors = sum(n for _, n in results)
+    if not latencies:
+        print("❌ 沒有成功的請求")
+        return
+
+    print("\n" + "=" * 60)
+    print(f"  請求數:   {len(latencies)}（錯誤 {errors}）")
+    print(f"  吞吐量:   {len(latencies) / args.duration:.1f} req/s")
+    print(f"  p50:      {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"  p95:      {latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms")
+    print(f"  p99:      {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+將 movie_embeddings.embedding 從 JSON 文字轉為 float32 BLOB，並添加 dim、dtype、model_version、text_hash 欄位
+（SQLite 無法修改欄位型別，因此重建資料表；既有的 JSON 向量會轉換保留）
+
+用法:
+    python scripts/migrate_embedding_blob.py [資料庫路徑，預設 cinemood.db] [--model 模型名稱]
+"""
+import argparse
+import json
+import sqlite3
+import sys
+
+import numpy as np
+
+DEFAULT_MODEL = "paraphrase-multilingual-mpnet-base-v2"
+
+CREATE_TABLE = """
+CREATE TABLE movie_embeddings_new (
+    movie_id VARCHAR(36) NOT NULL PRIMARY KEY REFERENCES movies (id) ON DELETE CASCADE,
+    embedding BLOB NOT NULL,
+    dim INTEGER NOT NULL,
+    dtype VARCHAR(10) NOT NULL,
+    model_version VARCHAR(200) NOT NULL,
+    embedding_text TEXT,
+    text_hash VARCHAR(64),
+    stale BOOLEAN NOT NULL DEFAULT 0,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+
+def migrate_embedding_blob(db_path: str = 'cinemood.db', model_version: str = DEFAULT_MODEL):
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('PRAGMA table_info(movie_embeddings)')
+        columns = {row[1]: row[2] for row in cursor.fetchall()}
+
+        if not columns:
+            print("✅ movie_embeddings 尚未建立，啟動 API 或同步腳本時會以新結構建立")
+            return
+        if 'dim' in columns:
+            print("✅ movie_embeddings 已是 BLOB 結構")
+            if 'text_hash' not in columns:
+                print("📝 添加 text_hash 欄位...")
+                cursor.execute('ALTER TABLE movie_embeddings ADD COLUMN text_hash VARCHAR(64)')
+                conn.commit()
+                print("✅ 成功添加 text_hash 欄位（下次同步時重新計算）")
+            return
+
+        print("📝 重建 movie_embeddings（JSON → float32 BLOB）...")
+        cursor.execute(CREATE_TABLE)
+
+        converted = 0
+        rows = cursor.execute(
+            'SELECT movie_id, embedding, embedding_text, created_at FROM movie_embeddings'
+        ).fetchall()
+        for movie_id, embedding_json, embedding_text, created_at in rows:
+            vector = np.asarray(json.loads(embedding_json), dtype='<f4')
+            cursor.execute(
+                'INSERT INTO movie_embeddings_new '
+                '(movie_id, embedding, dim, dtype, model_version, embedding_text, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (movie_id, vector.tobytes(), vector.shape[0], 'float32', model_version,
+                 embedding_text, created_at, created_at)
+            )
+            converted += 1
+
+        cursor.execute('DROP TABLE movie_embeddings')
+        cursor.execute('ALTER TABLE movie_embeddings_new RENAME TO movie_embeddings')
+        conn.commit()
+        print(f"✅ 成功轉換 {converted} 筆向量")
+
+        cursor.execute('PRAGMA table_info(movie_embeddings)')
+        print("\n更新後的 movie_embeddings 表結構:")
+        for row in cursor.fetchall():
+            print(f"  {row}")
+
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ 錯誤: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert movie_embeddings to binary vectors")
+    parser.add_argument("db_path", nargs="?", default="cinemood.db", help="SQLite 資料庫路徑")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="既有向量的模型名稱")
+    args = parser.parse_args()
+    migrate_embedding_blob(args.db_path, args.model)
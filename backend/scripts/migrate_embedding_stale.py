@@ -0,0 +1,43 @@
+"""
+為現有資料庫添加 stale 欄位到 movie_embeddings 表（增量 TMDB 同步標記需要重新檢查的向量）
+sync_runs 表由同步腳本的 init_db 自動建立
+
+用法:
+    python scripts/migrate_embedding_stale.py [資料庫路徑，預設 cinemood.db]
+"""
+import argparse
+import sqlite3
+import sys
+
+
+def add_stale_to_embeddings(db_path: str = 'cinemood.db'):
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        # 檢查 stale 是否已存在
+        cursor.execute('PRAGMA table_info(movie_embeddings)')
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if not columns:
+            print("✅ movie_embeddings 尚未建立，啟動 API 或同步腳本時會以新結構建立")
+        elif 'stale' in columns:
+            print("✅ stale 欄位已存在")
+        else:
+            print("📝 添加 stale 欄位...")
+            cursor.execute('ALTER TABLE movie_embeddings ADD COLUMN stale BOOLEAN NOT NULL DEFAULT 0')
+            conn.commit()
+            print("✅ 成功添加 stale 欄位")
+
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ 錯誤: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the stale flag to movie_embeddings")
+    parser.add_argument("db_path", nargs="?", default="cinemood.db", help="SQLite 資料庫路徑")
+    args = parser.parse_args()
+    add_stale_to_embeddings(args.db_path)
@@ -0,0 +1,33 @@
+"""
+為現有資料庫建立電影全文搜尋索引（FTS5 trigram）
+執行 VACUUM 後請加上 --rebuild 重建索引
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import engine
+from app.db.movie_fts import ensure_movie_fts, rebuild_movie_fts
+
+
+def migrate_movie_fts(rebuild: bool = False):
+    try:
+        if not ensure_movie_fts(engine):
+            print("⚠️  資料庫不支援 FTS5 trigram，搜尋將使用 LIKE 後備方案")
+            return
+
+        if rebuild:
+            print("📝 重建 movies_fts 索引...")
+            count = rebuild_movie_fts(engine)
+            print(f"✅ 索引重建完成，共 {count} 部電影")
+        else:
+            print("✅ movies_fts 索引與同步 triggers 已就緒")
+
+    except Exception as e:
+        print(f"❌ 錯誤: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    migrate_movie_fts(rebuild="--rebuild" in sys.argv)
@@ -0,0 +1,65 @@
+"""
+為現有資料庫添加熱門查詢所需的索引
+（新建的資料庫由 Base.metadata.create_all 自動建立）
+
+用法:
+    python scripts/migrate_movie_indexes.py [資料庫路徑，預設 cinemood.db]
+"""
+import sqlite3
+import sys
+
+INDEXES = [
+    # 列表排序與 keyset 分頁 (popularity DESC, id DESC)
+    ("ix_movies_popularity_id", "movies", "popularity, id"),
+    # 按類型列表與計數（覆蓋索引）
+    ("ix_movie_genres_genre_movie", "movie_genres", "genre_id, movie_id"),
+    # 按人員查詢作品與統計參演數（覆蓋索引）
+    ("ix_movie_credits_person_role_movie", "movie_credits", "person_id, role, movie_id"),
+]
+
+# 已被上方複合索引取代的單欄索引
+OBSOLETE_INDEXES = [
+    "ix_movie_genres_genre_id",
+    "ix_movie_credits_person_id",
+]
+
+
+def add_movie_indexes(db_path: str = 'cinemood.db'):
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        for name, table, columns in INDEXES:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+            )
+            if cursor.fetchone():
+                print(f"✅ {name} 已存在")
+                continue
+
+            print(f"📝 建立索引 {name} ON {table} ({columns})...")
+            cursor.execute(f"CREATE INDEX {name} ON {table} ({columns})")
+            print(f"✅ 成功建立 {name}")
+
+        for name in OBSOLETE_INDEXES:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)
+            )
+            if cursor.fetchone():
+                cursor.execute(f"DROP INDEX {name}")
+                print(f"🗑️  移除多餘索引 {name}")
+
+        conn.commit()
+
+        # 更新統計資訊，讓查詢規劃器選用新索引
+        print("📊 ANALYZE...")
+        cursor.execute("ANALYZE")
+        conn.commit()
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ 錯誤: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    add_movie_indexes(sys.argv[1] if len(sys.argv) > 1 else 'cinemood.db')
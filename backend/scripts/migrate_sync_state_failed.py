@@ -0,0 +1,42 @@
+"""
+為現有資料庫添加 failed_tmdb_ids 欄位到 sync_states 表（記錄詳細資料獲取失敗、下次同步先重試的電影）
+
+用法:
+    python scripts/migrate_sync_state_failed.py [資料庫路徑，預設 cinemood.db]
+"""
+import argparse
+import sqlite3
+import sys
+
+
+def add_failed_to_sync_states(db_path: str = 'cinemood.db'):
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        # 檢查 failed_tmdb_ids 是否已存在
+        cursor.execute('PRAGMA table_info(sync_states)')
+        columns = [row[1] for row in cursor.fetchall()]
+
+        if not columns:
+            print("✅ sync_states 尚未建立，同步腳本會以新結構建立")
+        elif 'failed_tmdb_ids' in columns:
+            print("✅ failed_tmdb_ids 欄位已存在")
+        else:
+            print("📝 添加 failed_tmdb_ids 欄位...")
+            cursor.execute("ALTER TABLE sync_states ADD COLUMN failed_tmdb_ids JSON NOT NULL DEFAULT '[]'")
+            conn.commit()
+            print("✅ 成功添加 failed_tmdb_ids 欄位")
+
+        conn.close()
+
+    except Exception as e:
+        print(f"❌ 錯誤: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add failed_tmdb_ids to sync_states")
+    parser.add_argument("db_path", nargs="?", default="cinemood.db", help="SQLite 資料庫路徑")
+    args = parser.parse_args()
+    add_failed_to_sync_states(args.db_path)
@@ -0,0 +1,82 @@
+"""
+Refresh Person Stats
+為現有資料庫建立 person_stats / person_top_movies 並從 movie_credits 重新計算
+（sync_tmdb.py 每次同步後會自動重新計算，只有升級既有資料庫或手動修改資料後需要執行）
+
+用法:
+    python scripts/refresh_person_stats.py
+    python scripts/refresh_person_stats.py --compare   # 同時比較熱門演員查詢：即時聚合 vs 讀取統計表
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 將 backend 目錄加入 Python 路徑
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import func
+
+from app.db.session import SessionLocal, engine
+from app.models.movie_credit_model import MovieCredit
+from app.models.person_model import Person
+from app.models.person_stats_model import PersonStats
+from app.models.person_top_movie_model import PersonTopMovie
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.person_repository import PersonRepository
+
+
+def popular_actors_aggregate(db, limit: int):
+    """調整前的熱門演員查詢：每次請求 GROUP BY movie_credits"""
+    return (
+        db.query(Person, func.count(MovieCredit.movie_id).label('movie_count'))
+        .join(MovieCredit)
+        .filter(MovieCredit.role == 'actor')
+        .group_by(Person.id)
+        .order_by(func.count(MovieCredit.movie_id).desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    """執行 repeat 次，返回平均毫秒數"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild precomputed person aggregates")
+    parser.add_argument("--compare", action="store_true", help="比較熱門演員查詢的耗時")
+    parser.add_argument("--repeat", type=int, default=20, help="比較時每種查詢的執行次數")
+    args = parser.parse_args()
+
+    PersonStats.__table__.create(bind=engine, checkfirst=True)
+    PersonTopMovie.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        counts = PersonRepository(db).refresh_stats()
+        # 遞增資料版本，讓 API 的回應快取失效
+        version = DataVersionRepository(db).bump_version()
+        db.commit()
+        print(f"✅ 人員統計 {counts['person_stats']} 筆，代表作 {counts['person_top_movies']} 筆"
+              f"（{time.perf_counter() - start:.2f}s，資料版本 {version}）")
+
+        if args.compare:
+            repo = PersonRepository(db)
+            aggregate_ms = timed(lambda: popular_actors_aggregate(db, 20), args.repeat)
+            stats_ms = timed(lambda: repo.get_popular_actors(20), args.repeat)
+            print(f"📊 熱門演員（前 20 名）: 即時聚合 {aggregate_ms:.2f} ms，統計表 {stats_ms:.2f} ms"
+                  f"（{aggregate_ms / stats_ms:.1f}x）")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+SQLite Concurrency Stress Test
+多個讀取行程（模擬 API workers）與一個寫入行程（模擬 sync_tmdb.py）同時存取資料庫，
+比較預設設定（rollback journal）與調校後設定（WAL + pragmas）的吞吐量、延遲與鎖定錯誤
+
+用法:
+    python scripts/stress_sqlite_concurrency.py --readers 8 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import create_db_engine
+from app.repositories.movie_repository import MovieRepository
+from benchmark_search import build_database
+
+
+def make_engine(mode: str, path: str):
+    """baseline：調校前 app/db/session.py 的設定；tuned：create_db_engine"""
+    if mode == "baseline":
+        return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    return create_db_engine(f"sqlite:///{path}")
+
+
+def reader(mode: str, path: str, deadline: float, n_movies: int, results):
+    """模擬 API worker：列表頁 + 總數"""
+    Session = sessionmaker(bind=make_engine(mode, path), autocommit=False, autoflush=False)
+    rng = random.Random()
+    latencies = []
+    locked = 0
+    while time.time() < deadline:
+        db = Session()
+        start = time.perf_counter()
+        try:
+            repo = MovieRepository(db)
+            repo.get_movies(skip=rng.randrange(0, 2000), limit=20)
+            repo.get_total_count()
+            latencies.append(time.perf_counter() - start)
+        except OperationalError as e:
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        finally:
+            db.close()
+    results.put(("read", latencies, locked))
+
+
+def writer(mode: str, path: str, deadline: float, n_movies: int, results):
+    """模擬 sync_tmdb.py：每頁新增 20 部電影、更新人氣度後提交"""
+    Session = sessionmaker(bind=make_engine(mode, path), autocommit=False, autoflush=False)
+    rng = random.Random(1)
+    tmdb_id = n_movies + 1
+    writes = 0
+    locked = 0
+    while time.time() < deadline:
+        db = Session()
+        try:
+            for _ in range(20):
+                db.execute(
+                    text(
+                        "INSERT INTO movies (id, tmdb_id, title, original_title, overview, popularity) "
+                        "VALUES (:id, :tmdb_id, :title, :title, :overview, :popularity)"
+                    ),
+                    {
+                        "id": str(uuid.uuid4()),
+                        "tmdb_id": tmdb_id,
+                        "title": f"壓力測試電影 {tmdb_id}",
+                        "overview": "並發寫入測試" * 20,
+                        "popularity": rng.uniform(0, 100),
+                    }
+                )
+                tmdb_id += 1
+            lo = rng.randint(1, n_movies)
+            db.execute(
+                text("UPDATE movies SET popularity = popularity + 0.001 WHERE tmdb_id BETWEEN :lo AND :hi"),
+                {"lo": lo, "hi": lo + 200}
+            )
+            db.commit()
+            writes += 1
+        except OperationalError as e:
+            db.rollback()
+            if "locked" not in str(e):
+                raise
+            locked += 1
+        finally:
+            db.close()
+    results.put(("write", writes, locked))
+
+
+def run(label: str, mode: str, path: str, n_readers: int, duration: float, n_movies: int) -> dict:
+    """以獨立行程執行讀寫（與多個 uvicorn workers + sync 腳本相同）"""
+    results = multiprocessing.Queue()
+    deadline = time.time() + duration
+    processes = [multiprocessing.Process(target=writer, args=(mode, path, deadline, n_movies, results))]
+    processes += [
+        multiprocessing.Process(target=reader, args=(mode, path, deadline, n_movies, results))
+        for _ in range(n_readers)
+    ]
+    for p in processes:
+        p.start()
+
+    latencies, writes, locked = [], 0, 0
+    for _ in processes:
+        kind, value, n_locked = results.get()
+        if kind == "read":
+            latencies.extend(value)
+        else:
+            writes = value
+        locked += n_locked
+    for p in processes:
+        p.join()
+
+    latencies.sort()
+    return {
+        "label": label,
+        "reads_per_sec": len(latencies) / duration,
+        "writes_per_sec": writes / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+        "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        "locked_errors": locked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite concurrent read/write stress test")
+    parser.add_argument("--movies", type=int, default=20_000, help="初始電影數量")
+    parser.add_argument("--readers", type=int, default=8, help="讀取行程數量")
+    parser.add_argument("--duration", type=float, default=10.0, help="每種設定的測試秒數")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    results = []
+
+    for label, mode in [("預設設定", "baseline"), ("調校設定", "tuned")]:
+        path = os.path.join(workdir, f"{mode}.db")
+        build_database(path, args.movies)
+        print(f"⏱️  {label}：{args.readers} 個讀取行程 + 1 個寫入行程，{args.duration:.0f} 秒...")
+        results.append(run(label, mode, path, args.readers, args.duration, args.movies))
+
+    print("\n" + "=" * 78)
+    print(f"{'設定':<10}{'讀取/s':>10}{'寫入/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'locked':>10}")
+    print("=" * 78)
+    for r in results:
+        print(
+            f"{r['label']:<10}{r['reads_per_sec']:>10.1f}{r['writes_per_sec']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_ms']:>10.1f}{r['locked_errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,94 +1,363 @@
 """
 Sync Embeddings
-為所有電影生成向量嵌入並存儲
+為所有電影生成向量嵌入，寫入 movie_embeddings 表並存儲到向量存儲
+
+用法:
+    python scripts/sync_embeddings.py            # 增量同步：只編碼新增或內容改變的電影
+    python scripts/sync_embeddings.py --full     # 重新編碼所有電影並重建向量存儲
+    python scripts/sync_embeddings.py --from-db  # 從 movie_embeddings 重建向量存儲（不重新編碼）
+    python scripts/sync_embeddings.py --stale-only  # 只處理增量 TMDB 同步標記為 stale 或尚無向量的電影
+    python scripts/sync_embeddings.py --full --workers 8  # 多行程編碼（離線大量編碼）
 """
+import argparse
+import queue
 import sys
+import threading
 from pathlib import Path
+from typing import Optional
 
 # 將 backend 目錄加入 Python 路徑
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
+import numpy as np
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.movie_model import Movie
+from app.models.movie_embedding_model import MovieEmbedding
+from app.models.movie_keyword_model import MovieKeyword
+from app.repositories.embedding_repository import EmbeddingRepository, hash_text
 from app.services.embedding_service import get_embedding_service
+from app.services.genre_registry import get_genre_registry
 from app.services.vector_store import get_vector_store
 from tqdm import tqdm
 
 
-def sync_embeddings():
-    """同步所有電影的向量嵌入"""
-    print("Starting embedding sync...")
+def build_metadata(movie: Movie, genre_names: list) -> dict:
+    """向量存儲中每部電影的元資料（keywords 供推薦重排序使用）"""
+    return {
+        'movie_id': str(movie.id),
+        'title': movie.title,
+        'overview': movie.overview,
+        'genres': genre_names,
+        'keywords': [mk.keyword.name for mk in movie.keywords],
+        'release_date': str(movie.release_date) if movie.release_date else None,
+        'poster_path': movie.poster_path,
+        'backdrop_path': movie.backdrop_path,
+        'vote_average': movie.vote_average,
+        'popularity': movie.popularity
+    }
+
+
+def save_vector_store(vector_store):
+    """保存向量存儲並顯示統計"""
+    store_path = backend_dir / 'data' / 'vector_store.pkl'
+    vector_store.save(str(store_path))
+
+    stats = vector_store.get_stats()
+    print(f"\n✅ Embedding sync completed!")
+    print(f"   Total vectors: {stats['total_vectors']}")
+    print(f"   Embedding dimension: {stats['embedding_dim']}")
+    print(f"   Memory size: {stats['memory_size_mb']:.2f} MB")
+    print(f"   Saved to: {store_path}")
+
+
+def produce_batches(
+    out_queue: queue.Queue,
+    embedding_service,
+    model_version: str,
+    full: bool,
+    batch_size: int,
+    read_chunk: int,
+    stale_only: bool = False
+):
+    """
+    Producer（背景執行緒）：串流讀取電影並組裝文本，分批放入佇列
+    佇列有上限，編碼較慢時讀取會暫停，記憶體只保留少數批次
+    
+    佇列項目：("changed", [(movie_id, text, metadata)]) 需要編碼，
+              ("unchanged", [(movie_id, metadata)]) 只需更新元資料，
+              ("error", exception)，最後以 None 結束
+    """
+    db = SessionLocal()
+    try:
+        # 類型名稱由 GenreRegistry 查詢，不需要為每部電影載入 Genre
+        genres = get_genre_registry()
+        genres.refresh_sync(db)
+        
+        # 同一查詢帶出目前模型的文本雜湊，不需要在記憶體中保存所有雜湊
+        query = (
+            movies_to_check(db.query(Movie, MovieEmbedding.text_hash), model_version, stale_only)
+            .options(
+                selectinload(Movie.genres),
+                selectinload(Movie.keywords).joinedload(MovieKeyword.keyword)
+            )
+            .order_by(Movie.id)
+            .yield_per(read_chunk)
+        )
+
+        changed = []
+        unchanged = []
+        for movie, stored_hash in query:
+            genre_names = [genre["name"] for genre in genres.lookup(mg.genre_id for mg in movie.genres)]
+
+            # 創建電影文本
+            text = embedding_service.create_movie_text(
+                title=movie.title,
+                overview=movie.overview or "",
+                genres=genre_names
+            )
+            metadata = build_metadata(movie, genre_names)
+
+            if not full and stored_hash == hash_text(text):
+                unchanged.append((str(movie.id), metadata))
+                if len(unchanged) >= read_chunk:
+                    out_queue.put(("unchanged", unchanged))
+                    unchanged = []
+            else:
+                changed.append((str(movie.id), text, metadata))
+                if len(changed) >= batch_size:
+                    out_queue.put(("changed", changed))
+                    changed = []
+
+        if unchanged:
+            out_queue.put(("unchanged", unchanged))
+        if changed:
+            out_queue.put(("changed", changed))
+    except Exception as e:
+        out_queue.put(("error", e))
+    finally:
+        db.close()
+        out_queue.put(None)
+
+
+def movies_to_check(query, model_version: str, stale_only: bool = False):
+    """
+    外部連接目前模型的向量；stale_only 時只保留尚無向量或被標記為 stale 的電影
+    """
+    query = query.outerjoin(
+        MovieEmbedding,
+        and_(MovieEmbedding.movie_id == Movie.id, MovieEmbedding.model_version == model_version)
+    )
+    if stale_only:
+        query = query.filter(or_(MovieEmbedding.movie_id.is_(None), MovieEmbedding.stale.is_(True)))
+    return query
+
+
+def sync_embeddings(
+    full: bool = False,
+    batch_size: Optional[int] = None,
+    queue_size: int = 4,
+    read_chunk: int = 1000,
+    workers: int = 1,
+    model_batch_size: int = 32,
+    stale_only: bool = False
+):
+    """
+    同步電影的向量嵌入
+    預設為增量模式：只編碼尚無向量或文本（create_movie_text）改變的電影，
+    其餘電影只更新向量存儲中的元資料；full=True 時重新編碼全部並重建向量存儲
+    （已刪除電影的向量只會在 --full 時清除）
+    
+    讀取（producer 執行緒）與模型編碼（主執行緒）透過有界佇列並行，
+    每批編碼後立即寫入資料庫與向量存儲
+    
+    Args:
+        full: 重新編碼所有電影
+        batch_size: 每批送入 encode_texts 的電影數量（預設 256 × workers，讓每個 worker 都分到文本）
+        queue_size: 佇列中最多等待編碼的批次數
+        read_chunk: 資料庫串流讀取的批次大小（yield_per）
+        workers: 編碼行程數量，大於 1 時使用多行程編碼池
+        model_batch_size: 模型每次 forward 的文本數量
+        stale_only: 只處理尚無向量或被增量 TMDB 同步標記為 stale 的電影
+    """
+    print(f"Starting embedding sync ({'full' if full else 'stale only' if stale_only else 'incremental'})...")
     
     # 初始化服務
     db = SessionLocal()
     embedding_service = get_embedding_service()
     vector_store = get_vector_store()
+    embedding_repo = EmbeddingRepository(db)
+    model_version = embedding_service.model_name
+    store_path = backend_dir / 'data' / 'vector_store.pkl'
+    batch_size = batch_size or 256 * max(1, workers)
     
     try:
-        # 獲取所有電影
-        movies = db.query(Movie).all()
-        print(f"Found {len(movies)} movies in database")
+        if not full and len(vector_store) == 0 and store_path.exists():
+            vector_store.load(str(store_path))
+        if workers > 1:
+            embedding_service.start_pool(workers)
         
-        # 批量處理
-        batch_size = 32
-        for i in tqdm(range(0, len(movies), batch_size), desc="Generating embeddings"):
-            batch_movies = movies[i:i + batch_size]
+        total = movies_to_check(db.query(Movie), model_version, stale_only and not full).count()
+        print(f"Found {total} movies to check")
             
-            # 準備文本
-            movie_ids = []
-            texts = []
-            metadata_list = []
+        batches = queue.Queue(maxsize=queue_size)
+        producer = threading.Thread(
+            target=produce_batches,
+            args=(batches, embedding_service, model_version, full, batch_size, read_chunk, stale_only and not full),
+            daemon=True
+        )
+        producer.start()
             
-            for movie in batch_movies:
-                # 獲取類型名稱（通過 MovieGenre 關聯到 Genre）
-                genre_names = [mg.genre.name for mg in movie.genres]
+        encoded = refreshed = restored = 0
+        progress = tqdm(total=total, desc="Syncing embeddings")
+        while True:
+            item = batches.get()
+            if item is None:
+                break
+            kind, payload = item
+            if kind == "error":
+                raise payload
                 
-                # 創建電影文本
-                text = embedding_service.create_movie_text(
-                    title=movie.title,
-                    overview=movie.overview or "",
-                    genres=genre_names
-                )
+            if kind == "unchanged":
+                n_refreshed, n_restored = refresh_unchanged(payload, vector_store, embedding_repo)
+                embedding_repo.clear_stale([movie_id for movie_id, _ in payload])
+                db.commit()
+                refreshed += n_refreshed
+                restored += n_restored
+            else:
+                encode_batch(payload, embedding_service, vector_store, embedding_repo, model_version, model_batch_size)
+                db.commit()
+                encoded += len(payload)
+            progress.update(len(payload))
                 
-                # 準備元資料
-                metadata = {
-                    'movie_id': str(movie.id),
-                    'title': movie.title,
-                    'overview': movie.overview,
-                    'genres': genre_names,
-                    'release_date': str(movie.release_date) if movie.release_date else None,
-                    'poster_path': movie.poster_path,
-                    'backdrop_path': movie.backdrop_path,
-                    'vote_average': movie.vote_average,
-                    'popularity': movie.popularity
-                }
+        producer.join()
+        progress.close()
+        print(f"   Encoded: {encoded}, metadata refreshed: {refreshed}, restored from database: {restored}")
                 
-                movie_ids.append(str(movie.id))
-                texts.append(text)
-                metadata_list.append(metadata)
+        save_vector_store(vector_store)
             
-            # 生成向量
-            embeddings = embedding_service.encode_texts(texts)
+    finally:
+        embedding_service.stop_pool()
+        db.close()
             
-            # 添加到向量存儲
-            vector_store.add_batch(movie_ids, embeddings, metadata_list)
         
-        # 保存向量存儲
-        store_path = backend_dir / 'data' / 'vector_store.pkl'
-        vector_store.save(str(store_path))
+def encode_batch(
+    batch: list,
+    embedding_service,
+    vector_store,
+    embedding_repo: EmbeddingRepository,
+    model_version: str,
+    model_batch_size: int = 32
+):
+    """編碼一批電影，寫入資料庫與向量存儲"""
+    movie_ids = [movie_id for movie_id, _, _ in batch]
+    texts = [text for _, text, _ in batch]
+    metadata_list = [metadata for _, _, metadata in batch]
         
-        # 顯示統計
-        stats = vector_store.get_stats()
-        print(f"\n✅ Embedding sync completed!")
-        print(f"   Total vectors: {stats['total_vectors']}")
-        print(f"   Embedding dimension: {stats['embedding_dim']}")
-        print(f"   Memory size: {stats['memory_size_mb']:.2f} MB")
-        print(f"   Saved to: {store_path}")
+    # 生成向量
+    embeddings = embedding_service.encode_texts(texts, batch_size=model_batch_size)
+
+    # 寫入資料庫，之後可直接從資料庫重建向量存儲
+    embedding_repo.upsert_embeddings(
+        movie_ids, embeddings, texts,
+        model_version=model_version,
+        dtype=settings.EMBEDDING_STORAGE_DTYPE
+    )
+
+    # 添加到向量存儲
+    vector_store.add_batch(movie_ids, embeddings, metadata_list)
+
+
+def refresh_unchanged(unchanged: list, vector_store, embedding_repo: EmbeddingRepository):
+    """
+    文本未改變的電影不重新編碼
+    元資料（人氣度、評分等）改變時以既有向量更新；不在向量存儲中的向量從資料庫讀取
+    
+    Returns:
+        (更新元資料的數量, 從資料庫還原的數量)
+    """
+    stale = []
+    missing = []
+    for movie_id, metadata in unchanged:
+        existing = vector_store.get_by_movie_id(movie_id)
+        if existing is None:
+            missing.append((movie_id, metadata))
+        elif existing[1] != metadata:
+            stale.append((movie_id, existing[0], metadata))
+
+    if stale:
+        vector_store.add_batch(
+            [movie_id for movie_id, _, _ in stale],
+            np.array([vector for _, vector, _ in stale]),
+            [metadata for _, _, metadata in stale]
+        )
+
+    if missing:
+        vectors = embedding_repo.get_embeddings([movie_id for movie_id, _ in missing])
+        vector_store.add_batch(
+            [movie_id for movie_id, _ in missing],
+            np.array([vectors[movie_id] for movie_id, _ in missing]),
+            [metadata for _, metadata in missing]
+        )
+
+    return len(stale), len(missing)
+
+
+def rebuild_from_db():
+    """從 movie_embeddings 一次讀取所有向量重建向量存儲（不需要載入模型）"""
+    print("Rebuilding vector store from database...")
+
+    db = SessionLocal()
+    vector_store = get_vector_store()
+
+    try:
+        movie_ids, embeddings = EmbeddingRepository(db).load_all(model_version=settings.EMBEDDING_MODEL)
+        if not movie_ids:
+            print("⚠️  movie_embeddings 沒有符合目前模型的向量，請先執行完整同步")
+            return
+        print(f"Loaded {len(movie_ids)} embeddings ({embeddings.shape[1]} dims)")
+
+        genres = get_genre_registry()
+        genres.refresh_sync(db)
+        movies = {
+            movie.id: movie
+            for movie in db.query(Movie)
+            .join(Movie.embedding)
+            .options(
+                selectinload(Movie.genres),
+                selectinload(Movie.keywords).joinedload(MovieKeyword.keyword)
+            )
+        }
+        keep = [i for i, movie_id in enumerate(movie_ids) if movie_id in movies]
+        metadata_list = [
+            build_metadata(movies[movie_ids[i]], [
+                genre["name"] for genre in genres.lookup(mg.genre_id for mg in movies[movie_ids[i]].genres)
+            ])
+            for i in keep
+        ]
+
+        vector_store.add_batch([movie_ids[i] for i in keep], embeddings[keep], metadata_list)
+        save_vector_store(vector_store)
         
     finally:
         db.close()
 
 
 if __name__ == '__main__':
-    sync_embeddings()
+    parser = argparse.ArgumentParser(description="Generate movie embeddings and build the vector store")
+    parser.add_argument("--full", action="store_true", help="重新編碼所有電影並重建向量存儲")
+    parser.add_argument("--batch-size", type=int, help="每批編碼的電影數量（預設 256 × workers）")
+    parser.add_argument("--workers", type=int, default=1, help="編碼行程數量（大於 1 時使用多行程編碼）")
+    parser.add_argument("--model-batch-size", type=int, default=32, help="模型每次 forward 的文本數量")
+    parser.add_argument("--queue-size", type=int, default=4, help="等待編碼的最大批次數")
+    parser.add_argument("--read-chunk", type=int, default=1000, help="資料庫串流讀取的批次大小")
+    parser.add_argument("--from-db", action="store_true", help="從 movie_embeddings 重建向量存儲，不重新編碼")
+    parser.add_argument("--stale-only", action="store_true", help="只處理被標記為 stale 或尚無向量的電影")
+    args = parser.parse_args()
+
+    if args.from_db:
+        rebuild_from_db()
+    else:
+        sync_embeddings(
+            full=args.full,
+            batch_size=args.batch_size,
+            queue_size=args.queue_size,
+            read_chunk=args.read_chunk,
+            workers=args.workers,
+            model_batch_size=args.model_batch_size,
+            stale_only=args.stale_only
+        )
@@ -1,37 +1,68 @@
 """
 TMDB 資料同步腳本
 從 TMDB API 獲取電影資料並同步到本地資料庫
+
+用法:
+    python scripts/sync_tmdb.py                          # 完整同步：從列表端點新增電影
+    python scripts/sync_tmdb.py --delta                  # 增量同步：依 /movie/changes 更新上次同步後變更的電影
+    python scripts/sync_tmdb.py --delta --since 2024-06-01
+    python scripts/sync_tmdb.py --pages 500              # 大量同步；中斷後再次執行會從最後完成的頁繼續
+    python scripts/sync_tmdb.py --cache replay           # 只從 TMDB 回應快取同步（不連網）
 """
 
+import argparse
+
 import sys
 import os
 
 # 將 backend 目錄加入 Python path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from concurrent.futures import Future
+
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal, engine, Base
+from app.db.movie_fts import ensure_movie_fts
+from app.core.config import settings
+from app.services.tmdb_cache import CACHE_MODES, create_response_cache
 from app.services.tmdb_client import tmdb_client
 from app.models.movie_model import Movie
 from app.models.genre_model import Genre
 from app.models.person_model import Person
 from app.models.movie_genre_model import MovieGenre
 from app.models.movie_credit_model import MovieCredit
-from typing import List, Dict, Any
-import uuid
-from datetime import datetime
+from app.models.movie_keyword_model import MovieKeyword
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.embedding_repository import EmbeddingRepository
+from app.repositories.person_repository import PersonRepository
+from app.repositories.sync_run_repository import SyncRunRepository
+from app.repositories.sync_state_repository import SyncStateRepository
+from app.repositories.ingest_repository import IdentityCache, IngestRepository
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import date, datetime, timedelta
+
+# TMDB /movie/changes 每次查詢最多涵蓋 14 天
+CHANGES_WINDOW_DAYS = 14
+# 增量同步每批重新獲取與提交的電影數量
+DELTA_BATCH_SIZE = 100
 
 
 def init_db():
     """初始化資料庫表"""
     print("📦 初始化資料庫...")
     Base.metadata.create_all(bind=engine)
+    if ensure_movie_fts(engine):
+        print("🔎 全文搜尋索引已就緒（FTS5 trigram）")
     print("✅ 資料庫初始化完成")
 
 
-def sync_genres(db: Session) -> Dict[int, int]:
+def sync_genres(db: Session, cache: Optional[IdentityCache] = None) -> Dict[int, int]:
     """
-    同步電影類型
+    同步電影類型（一次查詢載入所有既有類型，以名稱比對）
+    
+    Args:
+        db: 資料庫 Session
+        cache: 同步期間的 IdentityCache，提供時寫入類型映射
     
     Returns:
         TMDB genre_id 到本地 genre_id 的映射
@@ -43,167 +74,212 @@ def sync_genres(db: Session) -> Dict[int, int]:
         print("❌ 獲取類型失敗")
         return {}
     
-    genre_map = {}
+    existing_genres = {genre.name: genre for genre in db.query(Genre)}
+    new_genres = {}
     
     for genre_data in genres_data:
-        tmdb_genre_id = genre_data["id"]
         genre_name = genre_data["name"]
-        
-        # 檢查類型是否已存在
-        existing_genre = db.query(Genre).filter(Genre.name == genre_name).first()
-        
-        if existing_genre:
-            genre_map[tmdb_genre_id] = existing_genre.id
-        else:
-            new_genre = Genre(name=genre_name)
-            db.add(new_genre)
-            db.flush()  # 獲取自動生成的 ID
-            genre_map[tmdb_genre_id] = new_genre.id
+        if genre_name not in existing_genres and genre_name not in new_genres:
+            new_genres[genre_name] = Genre(tmdb_id=genre_data["id"], name=genre_name)
             print(f"  ➕ 新增類型: {genre_name}")
     
+    if new_genres:
+        db.add_all(new_genres.values())
+        db.flush()  # 獲取自動生成的 ID
+    
+    genres = {**existing_genres, **new_genres}
+    genre_map = {genre_data["id"]: genres[genre_data["name"]].id for genre_data in genres_data}
+    
     db.commit()
+    if cache is not None:
+        cache.genres = genre_map
     print(f"✅ 類型同步完成，共 {len(genre_map)} 個類型")
     
     return genre_map
 
 
-def sync_movie(
+def parse_release_date(value: Optional[str]) -> Optional[date]:
+    """處理 release_date (字串 -> date 物件)，格式錯誤時返回 None"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def ingest_movies(
     db: Session,
-    movie_data: Dict[str, Any],
-    genre_map: Dict[int, int]
-) -> bool:
+    details_list: List[Dict[str, Any]],
+    genre_map: Dict[int, int],
+    cache: Optional[IdentityCache] = None,
+    replace_links: bool = False
+) -> int:
     """
-    同步單部電影資料
+    批量寫入一批電影（通常為一頁）及其類型、關鍵字與演職人員
+    
+    先在記憶體中組裝所有資料列，人員與關鍵字各以一次 IN 查詢解析，
+    其餘以 INSERT ... ON CONFLICT 批量寫入，每批的查詢數量不隨電影與演員數增加
     
     Args:
         db: 資料庫 Session
-        movie_data: TMDB 電影資料
+        details_list: TMDB 電影詳細資料（append_to_response 附帶 credits 與 keywords）
         genre_map: 類型 ID 映射
+        cache: 同步期間的 IdentityCache，提供時人員與關鍵字不需查詢資料庫
+        replace_links: 先刪除既有的關聯再寫入（更新已存在的電影時使用）
     
     Returns:
-        是否成功同步
+        寫入的電影數量
     """
-    tmdb_id = movie_data["id"]
-    
-    # 檢查電影是否已存在
-    existing_movie = db.query(Movie).filter(Movie.tmdb_id == tmdb_id).first()
-    if existing_movie:
-        return False  # 已存在，跳過
-    
-    # 獲取電影詳細資料
-    details = tmdb_client.get_movie_details(tmdb_id)
-    if not details:
-        print(f"  ⚠️  無法獲取電影詳情: TMDB ID {tmdb_id}")
-        return False
-    
-    # 獲取演職人員資料
-    credits = tmdb_client.get_movie_credits(tmdb_id)
-    
-    # 處理 release_date (字串 -> date 物件)
-    release_date = None
-    if details.get("release_date"):
-        try:
-            release_date = datetime.strptime(details["release_date"], "%Y-%m-%d").date()
-        except ValueError:
-            pass  # 日期格式錯誤，設為 None
-    
-    # 建立電影記錄
-    movie = Movie(
-        id=str(uuid.uuid4()),
-        tmdb_id=tmdb_id,
-        title=details.get("title", ""),
-        original_title=details.get("original_title", ""),
-        overview=details.get("overview", ""),
-        release_date=release_date,
-        runtime=details.get("runtime"),
-        vote_average=details.get("vote_average", 0.0),
-        vote_count=details.get("vote_count", 0),
-        popularity=details.get("popularity", 0.0),
-        poster_path=details.get("poster_path"),
-        backdrop_path=details.get("backdrop_path"),
-    )
-    
-    db.add(movie)
-    db.flush()  # 確保電影已儲存並獲取 ID
-    
-    # 同步類型關聯（注意：詳情 API 返回的是 genres 陣列，不是 genre_ids）
-    for genre in details.get("genres", []):
-        genre_id = genre.get("id")
-        if genre_id in genre_map:
-            movie_genre = MovieGenre(
-                movie_id=movie.id,
-                genre_id=genre_map[genre_id]
-            )
-            db.add(movie_genre)
-    
-    # 同步演職人員
-    if credits:
-        # 同步演員（前 10 名）
-        added_actors = set()  # 追蹤已加入的演員，避免重複
+    movie_rows = []
+    people: Dict[int, Dict[str, Any]] = {}
+    keywords: Dict[int, str] = {}
+    genre_links = []
+    keyword_links = []
+    credit_links = []
+    
+    for details in details_list:
+        tmdb_id = details["id"]
+        movie_rows.append({
+            "tmdb_id": tmdb_id,
+            "title": details.get("title", ""),
+            "original_title": details.get("original_title", ""),
+            "overview": details.get("overview", ""),
+            "release_date": parse_release_date(details.get("release_date")),
+            "runtime": details.get("runtime"),
+            "vote_average": details.get("vote_average", 0.0),
+            "vote_count": details.get("vote_count", 0),
+            "popularity": details.get("popularity", 0.0),
+            "poster_path": details.get("poster_path"),
+            "backdrop_path": details.get("backdrop_path"),
+        })
+        
+        # 類型關聯（注意：詳情 API 返回的是 genres 陣列，不是 genre_ids）
+        genre_ids = {genre_map[g.get("id")] for g in details.get("genres", []) if g.get("id") in genre_map}
+        genre_links.extend((tmdb_id, genre_id) for genre_id in genre_ids)
+        
+        # 關鍵字（推薦重排序使用）
+        for keyword_data in (details.get("keywords") or {}).get("keywords", []):
+            keywords[keyword_data["id"]] = keyword_data.get("name", "")
+            keyword_links.append((tmdb_id, keyword_data["id"]))
+        
+        credits = details.get("credits") or {}
+        # 演員（前 10 名，同一人只保留第一個角色）
+        actors = set()
         for i, cast in enumerate(credits.get("cast", [])[:10]):
-            person = sync_person(db, cast)
-            if person and person.id not in added_actors:
-                credit = MovieCredit(
-                    movie_id=movie.id,
-                    person_id=person.id,
-                    role="actor",
-                    character=cast.get("character", ""),
-                    order_num=i
-                )
-                db.add(credit)
-                added_actors.add(person.id)
+            people.setdefault(cast["id"], cast)
+            if cast["id"] not in actors:
+                credit_links.append((tmdb_id, cast["id"], "actor", cast.get("character", ""), i))
+                actors.add(cast["id"])
         
-        # 同步導演
-        added_directors = set()  # 追蹤已加入的導演，避免重複
+        # 導演
+        directors = set()
         for crew in credits.get("crew", []):
-            if crew.get("job") == "Director":
-                person = sync_person(db, crew)
-                if person and person.id not in added_directors:
-                    credit = MovieCredit(
-                        movie_id=movie.id,
-                        person_id=person.id,
-                        role="director",
-                        character="",
-                        order_num=0
-                    )
-                    db.add(credit)
-                    added_directors.add(person.id)
-    
-    print(f"  ✅ {movie.title} ({movie.release_date})")
-    
-    return True
+            if crew.get("job") == "Director" and crew["id"] not in directors:
+                people.setdefault(crew["id"], crew)
+                credit_links.append((tmdb_id, crew["id"], "director", "", 0))
+                directors.add(crew["id"])
+    
+    ingest_repo = IngestRepository(db, cache)
+    movie_ids = ingest_repo.upsert_movies(movie_rows)
+    person_ids = ingest_repo.resolve_people(people)
+    keyword_ids = ingest_repo.resolve_keywords(keywords)
+    if replace_links:
+        ingest_repo.delete_links(movie_ids.values())
+    
+    ingest_repo.insert_links(MovieGenre, [
+        {"movie_id": movie_ids[tmdb_id], "genre_id": genre_id}
+        for tmdb_id, genre_id in genre_links
+    ])
+    ingest_repo.insert_links(MovieKeyword, [
+        {"movie_id": movie_ids[tmdb_id], "keyword_id": keyword_ids[keyword_tmdb_id]}
+        for tmdb_id, keyword_tmdb_id in keyword_links
+    ])
+    ingest_repo.insert_links(MovieCredit, [
+        {"movie_id": movie_ids[tmdb_id], "person_id": person_ids[person_tmdb_id], "role": role,
+         "character": character, "order_num": order_num}
+        for tmdb_id, person_tmdb_id, role, character, order_num in credit_links
+    ])
+    
+    for row in movie_rows:
+        print(f"  ✅ {row['title']} ({row['release_date']})")
+    
+    return len(movie_rows)
 
 
-def sync_person(db: Session, person_data: Dict[str, Any]) -> Person:
+def start_page(
+    db: Session,
+    endpoint_func,
+    page: int,
+    scheduled: Set[int],
+    cache: Optional[IdentityCache] = None
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[int, Future], int]]:
     """
-    同步演員/導演資料
+    獲取列表頁，並為尚未入庫的電影送出詳細資料的並行請求
     
     Args:
         db: 資料庫 Session
-        person_data: TMDB 人員資料
+        endpoint_func: TMDB Client 的列表方法
+        page: 頁碼
+        scheduled: 已送出請求的 TMDB ID（避免跨頁重複請求）
+        cache: 同步期間的 IdentityCache，提供時不查詢資料庫
     
     Returns:
-        Person 實例
+        (列表頁電影, {tmdb_id: 詳細資料 Future}, 總頁數)，獲取失敗時返回 None
     """
-    tmdb_id = person_data["id"]
-    
-    # 檢查是否已存在
-    existing_person = db.query(Person).filter(Person.tmdb_id == tmdb_id).first()
-    if existing_person:
-        return existing_person
-    
-    # 建立新人員記錄
-    person = Person(
-        id=str(uuid.uuid4()),
-        tmdb_id=tmdb_id,
-        name=person_data.get("name", ""),
-        profile_path=person_data.get("profile_path")
-    )
+    data = endpoint_func(page=page)
+    if not data or "results" not in data:
+        return None
+    
+    movies = data["results"]
+    tmdb_ids = {movie_data["id"] for movie_data in movies} - scheduled
     
-    db.add(person)
-    db.flush()
+    # 一次查詢（或查快取）整頁已存在的電影，取代逐部查詢
+    existing = IngestRepository(db, cache).existing_movie_tmdb_ids(tmdb_ids)
+    new_ids = [movie_data["id"] for movie_data in movies if movie_data["id"] in tmdb_ids - existing]
+    scheduled.update(new_ids)
     
-    return person
+    return movies, tmdb_client.prefetch_movies(new_ids), data.get("total_pages", page)
+
+
+def retry_failed_movies(
+    db: Session,
+    state_repo: SyncStateRepository,
+    endpoint_key: str,
+    genre_map: Dict[int, int],
+    scheduled: Set[int],
+    cache: Optional[IdentityCache] = None
+) -> int:
+    """
+    重試上次同步中詳細資料獲取失敗的電影（這些電影所在的頁已記錄為完成，不會再次獲取）
+    
+    仍然失敗的電影保留在 sync_states，與本次寫入的資料一起提交
+    
+    Returns:
+        成功同步的電影數量
+    """
+    failed = state_repo.get_failed(endpoint_key)
+    if not failed:
+        return 0
+    
+    existing = IngestRepository(db, cache).existing_movie_tmdb_ids(set(failed))
+    retry_ids = [tmdb_id for tmdb_id in failed if tmdb_id not in existing]
+    scheduled.update(retry_ids)
+    print(f"  🔁 重試上次獲取失敗的 {len(retry_ids)} 部電影")
+    
+    details_list, still_failed = [], []
+    for tmdb_id, future in tmdb_client.prefetch_movies(retry_ids).items():
+        details = future.result()
+        if details:
+            details_list.append(details)
+        else:
+            print(f"  ⚠️  無法獲取電影詳情: TMDB ID {tmdb_id}")
+            still_failed.append(tmdb_id)
+    
+    synced_count = ingest_movies(db, details_list, genre_map, cache)
+    state_repo.set_failed(endpoint_key, still_failed)
+    db.commit()
+    return synced_count
 
 
 def sync_movies_from_endpoint(
@@ -211,50 +287,270 @@ def sync_movies_from_endpoint(
     endpoint_name: str,
     endpoint_func,
     genre_map: Dict[int, int],
-    max_pages: int = 5
+    max_pages: int = 5,
+    cache: Optional[IdentityCache] = None,
+    endpoint_key: Optional[str] = None,
+    run_id: Optional[int] = None,
+    restart: bool = False
 ) -> int:
     """
     從指定的 TMDB 端點同步電影
     
+    各頁以管線方式處理：寫入第 N 頁前先獲取第 N+1 頁列表並送出其請求，
+    網路請求在 TMDBClient 的執行緒池中並行（共用速率限制），資料庫寫入留在主執行緒
+    
+    提供 endpoint_key 時記錄進度（sync_states）：每頁的資料與檢查點在同一交易提交，
+    中斷（例外、列表頁獲取失敗、程式被終止）後下次從最後完成的頁碼之後繼續，
+    已完成的頁不會再發出請求；重新處理同一頁也只會 upsert，不會產生重複資料。
+    詳細資料獲取失敗的電影與檢查點一起記錄，下次同步先重試這些電影再繼續，
+    仍有失敗的電影時端點不會標記為完成
+    
     Args:
         db: 資料庫 Session
         endpoint_name: 端點名稱（用於顯示）
         endpoint_func: TMDB Client 的方法
         genre_map: 類型 ID 映射
         max_pages: 最多獲取幾頁
+        cache: 同步期間的 IdentityCache（各端點共用）
+        endpoint_key: 記錄進度用的端點名稱（例如 'popular'），None 時不記錄
+        run_id: 目前的執行紀錄 ID
+        restart: 忽略上次未完成的進度，從第 1 頁開始
     
     Returns:
         成功同步的電影數量
     """
     print(f"\n🎥 同步 {endpoint_name}...")
     
+    state_repo = SyncStateRepository(db) if endpoint_key else None
+    first_page = 1
+    if state_repo:
+        first_page = state_repo.begin(endpoint_key, run_id, restart=restart)
+        db.commit()
+        if first_page > 1:
+            print(f"  ⏩ 上次同步中斷，從第 {first_page} 頁繼續")
+    
     synced_count = 0
+    scheduled: Set[int] = set()
+    if state_repo:
+        synced_count += retry_failed_movies(db, state_repo, endpoint_key, genre_map, scheduled, cache)
     
-    for page in range(1, max_pages + 1):
-        print(f"\n  📄 第 {page}/{max_pages} 頁")
+    pending = start_page(db, endpoint_func, first_page, scheduled, cache) if first_page <= max_pages else None
+    last_page = max_pages
+    completed = first_page > max_pages
+    
+    for page in range(first_page, max_pages + 1):
+        print(f"\n  📄 第 {page}/{last_page} 頁")
         
-        data = endpoint_func(page=page)
-        if not data or "results" not in data:
-            print(f"  ⚠️  獲取第 {page} 頁失敗")
+        if pending is None:
+            print(f"  ⚠️  獲取第 {page} 頁失敗" + ("，下次同步會從這一頁繼續" if state_repo else ""))
             break
         
-        movies = data["results"]
+        movies, fetches, total_pages = pending
+        last_page = min(max_pages, total_pages)
+        
+        # 下一頁的請求與本頁剩餘的請求一起在背景進行
+        pending = start_page(db, endpoint_func, page + 1, scheduled, cache) if page < last_page else None
         
+        details_list, failed = [], []
         for movie_data in movies:
-            if sync_movie(db, movie_data, genre_map):
-                synced_count += 1
+            tmdb_id = movie_data["id"]
+            if tmdb_id not in fetches:
+                continue  # 已存在，跳過
+            details = fetches[tmdb_id].result()
+            if not details:
+                print(f"  ⚠️  無法獲取電影詳情: TMDB ID {tmdb_id}")
+                failed.append(tmdb_id)
+                continue
+            details_list.append(details)
+        
+        synced_count += ingest_movies(db, details_list, genre_map, cache)
+        if state_repo:
+            # 獲取失敗的電影與檢查點一起記錄，下次同步時重試
+            state_repo.checkpoint(endpoint_key, page, run_id, total_pages, failed_tmdb_ids=failed)
+        db.commit()  # 每頁提交一次（與檢查點同一交易）
         
-        db.commit()  # 每頁提交一次
+        if page >= last_page:
+            completed = True
+            break
+    
+    if state_repo and completed:
+        failed = state_repo.get_failed(endpoint_key)
+        if failed:
+            completed = False
+            print(f"  ⚠️  {len(failed)} 部電影獲取失敗，下次同步會先重試")
+        else:
+            state_repo.complete(endpoint_key, run_id)
+            db.commit()
     
-    print(f"\n✅ {endpoint_name} 同步完成，新增 {synced_count} 部電影")
+    print(f"\n✅ {endpoint_name} 同步{'完成' if completed else '中斷'}，新增 {synced_count} 部電影")
     
     return synced_count
 
 
-def main():
-    """主同步流程"""
+def fetch_changed_tmdb_ids(since: date, until: date) -> Set[int]:
+    """
+    獲取期間內有變更的電影 TMDB ID（依 TMDB 限制切成 14 天的區間）
+    任何一頁獲取失敗時拋出例外，避免 watermark 前進而遺漏變更
+    """
+    changed: Set[int] = set()
+    window_start = since
+    while window_start <= until:
+        window_end = min(window_start + timedelta(days=CHANGES_WINDOW_DAYS - 1), until)
+        page, total_pages = 1, 1
+        while page <= total_pages:
+            data = tmdb_client.get_movie_changes(window_start, window_end, page=page)
+            if not data or "results" not in data:
+                raise RuntimeError(f"獲取變更列表失敗（{window_start} ~ {window_end} 第 {page} 頁）")
+            changed.update(item["id"] for item in data["results"])
+            total_pages = data.get("total_pages", 1)
+            page += 1
+        window_start = window_end + timedelta(days=1)
+    return changed
+
+
+def sync_delta(
+    db: Session,
+    genre_map: Dict[int, int],
+    cache: IdentityCache,
+    since: date,
+    until: date
+) -> Dict[str, int]:
+    """
+    增量同步：只重新獲取本地已有、且在 TMDB 變更列表中的電影，就地更新資料列，
+    並將其向量標記為 stale（由 sync_embeddings.py 重新檢查）
+    
+    Args:
+        db: 資料庫 Session
+        genre_map: 類型 ID 映射
+        cache: 同步期間的 IdentityCache
+        since: 變更起始日期（上次同步的 watermark）
+        until: 變更結束日期
+    
+    Returns:
+        SyncRun 統計欄位（另含 refetch_failures）
+    """
+    print(f"\n🔄 獲取 {since} ~ {until} 的 TMDB 變更...")
+    changed = fetch_changed_tmdb_ids(since, until)
+    local_ids = sorted(tmdb_id for tmdb_id in changed if tmdb_id in cache.movies)
+    print(f"  變更 {len(changed)} 部，其中本地已有 {len(local_ids)} 部")
+    
+    updated = stale = failures = 0
+    embedding_repo = EmbeddingRepository(db)
+    for start in range(0, len(local_ids), DELTA_BATCH_SIZE):
+        # 已知有變更：不直接使用回應快取，以 ETag 重新驗證
+        fetches = tmdb_client.prefetch_movies(local_ids[start:start + DELTA_BATCH_SIZE], cache_ttl=0)
+        details_list = []
+        for tmdb_id, future in fetches.items():
+            details = future.result()
+            if details:
+                details_list.append(details)
+            else:
+                print(f"  ⚠️  無法獲取電影詳情: TMDB ID {tmdb_id}")
+                failures += 1
+        
+        updated += ingest_movies(db, details_list, genre_map, cache, replace_links=True)
+        stale += embedding_repo.mark_stale([cache.movies[details["id"]] for details in details_list])
+        db.commit()  # 每批提交一次
+    
+    return {
+        "changes_seen": len(changed),
+        "movies_updated": updated,
+        "embeddings_marked_stale": stale,
+        "refetch_failures": failures,
+    }
+
+
+def sync_full(
+    db: Session,
+    genre_map: Dict[int, int],
+    cache: IdentityCache,
+    run_id: Optional[int] = None,
+    pages: Optional[int] = None,
+    restart: bool = False
+) -> Dict[str, int]:
+    """
+    完整同步：從列表端點新增尚未入庫的電影（記錄各端點進度，可中斷後繼續）
+    
+    Args:
+        db: 資料庫 Session
+        genre_map: 類型 ID 映射
+        cache: 同步期間的 IdentityCache
+        run_id: 目前的執行紀錄 ID
+        pages: 每個端點的頁數，None 時使用預設（熱門 5、高評分 5、正在上映 3）
+        restart: 忽略上次未完成的進度
+    """
+    options = {"cache": cache, "run_id": run_id, "restart": restart}
+    
+    # 2. 同步熱門電影（前 5 頁 = ~100 部，約 100 requests）
+    popular_count = sync_movies_from_endpoint(
+        db,
+        "熱門電影",
+        tmdb_client.get_popular_movies,
+        genre_map,
+        max_pages=pages or 5,
+        endpoint_key="popular",
+        **options
+    )
+    
+    # 3. 同步高評分電影（前 5 頁 = ~100 部，約 100 requests）
+    top_rated_count = sync_movies_from_endpoint(
+        db,
+        "高評分電影",
+        tmdb_client.get_top_rated_movies,
+        genre_map,
+        max_pages=pages or 5,
+        endpoint_key="top_rated",
+        **options
+    )
+    
+    # 4. 同步正在上映（前 3 頁 = ~60 部，約 60 requests）
+    now_playing_count = sync_movies_from_endpoint(
+        db,
+        "正在上映",
+        tmdb_client.get_now_playing_movies,
+        genre_map,
+        max_pages=pages or 3,
+        endpoint_key="now_playing",
+        **options
+    )
+    
+    unfinished = [state.endpoint for state in SyncStateRepository(db).get_unfinished(run_id)] if run_id else []
+    return {
+        "movies_added": popular_count + top_rated_count + now_playing_count,
+        "unfinished_endpoints": unfinished,
+    }
+
+
+def api_stats() -> Dict[str, int]:
+    """TMDB 請求統計（SyncRun 欄位）"""
+    stats = tmdb_client.get_stats()
+    return {"api_requests": stats["requests"], "api_failures": stats["failures"]}
+
+
+def main(
+    delta: bool = False,
+    since: Optional[date] = None,
+    pages: Optional[int] = None,
+    restart: bool = False,
+    cache_mode: Optional[str] = None
+):
+    """
+    主同步流程（每次執行記錄於 sync_runs）
+    
+    Args:
+        delta: 增量同步模式
+        since: 增量同步的起始日期，預設為上次成功增量同步（沒有時為初次完整同步）的 watermark
+        pages: 完整同步時每個端點的頁數
+        restart: 完整同步時忽略上次中斷的進度
+        cache_mode: TMDB 回應快取模式（off | readwrite | replay），None 時使用 TMDB_CACHE_MODE
+    """
+    if cache_mode is not None:
+        tmdb_client.cache = create_response_cache(
+            cache_mode, settings.TMDB_CACHE_DIR, settings.TMDB_CACHE_TTL_SECONDS
+        )
+    
     print("=" * 60)
-    print("🚀 CineMood - TMDB 資料同步")
+    print(f"🚀 CineMood - TMDB 資料同步（{'增量' if delta else '完整'}）")
     print("=" * 60)
     
     # 初始化資料庫
@@ -262,41 +558,53 @@ def main():
     
     # 建立資料庫 Session
     db = SessionLocal()
+    run_repo = SyncRunRepository(db)
+    started_at = datetime.now()
+    
+    if delta and since is None:
+        watermark = run_repo.get_last_watermark()
+        if watermark is None:
+            print("❌ 沒有成功的同步紀錄，請先執行完整同步或以 --since 指定起始日期")
+            db.close()
+            return
+        since = watermark.date()
+    
+    run = run_repo.start_run("delta" if delta else "full", watermark=started_at)
     
     try:
+        # tmdb_id → 本地 id 快取：一次載入，各端點共用
+        cache = IdentityCache.preload(db)
+        
         # 1. 同步類型
-        genre_map = sync_genres(db)
+        genre_map = sync_genres(db, cache)
         
         if not genre_map:
             print("❌ 類型同步失敗，中止同步")
+            run_repo.finish_run(run, api_stats(), error="類型同步失敗")
             return
         
-        # 2. 同步熱門電影（前 5 頁 = ~100 部，約 200 requests）
-        popular_count = sync_movies_from_endpoint(
-            db,
-            "熱門電影",
-            tmdb_client.get_popular_movies,
-            genre_map,
-            max_pages=5
-        )
+        if delta:
+            stats = sync_delta(db, genre_map, cache, since, started_at.date())
+        else:
+            stats = sync_full(db, genre_map, cache, run_id=run.id, pages=pages, restart=restart)
         
-        # 3. 同步高評分電影（前 5 頁 = ~100 部，約 200 requests）
-        top_rated_count = sync_movies_from_endpoint(
-            db,
-            "高評分電影",
-            tmdb_client.get_top_rated_movies,
-            genre_map,
-            max_pages=5
-        )
+        # 重新計算人員統計與代表作（與版本遞增一起提交）
+        person_stats = PersonRepository(db).refresh_stats()
+        print(f"\n👥 人員統計: {person_stats['person_stats']} 筆，代表作 {person_stats['person_top_movies']} 筆")
         
-        # 4. 同步正在上映（前 3 頁 = ~60 部，約 120 requests）
-        now_playing_count = sync_movies_from_endpoint(
-            db,
-            "正在上映",
-            tmdb_client.get_now_playing_movies,
-            genre_map,
-            max_pages=3
-        )
+        # 遞增資料版本，讓 API 的總數快取失效
+        data_version = DataVersionRepository(db).bump_version()
+        db.commit()
+        
+        # 有電影重新獲取失敗或端點中斷時不推進 watermark，下次同步會再次處理
+        refetch_failures = stats.pop("refetch_failures", 0)
+        unfinished = stats.pop("unfinished_endpoints", [])
+        error = None
+        if refetch_failures:
+            error = f"{refetch_failures} 部電影重新獲取失敗"
+        elif unfinished:
+            error = f"端點同步未完成（{', '.join(unfinished)}），再次執行會重試失敗的電影並從中斷的頁繼續"
+        run_repo.finish_run(run, {**stats, **api_stats()}, error=error)
         
         # 統計資料
         total_movies = db.query(Movie).count()
@@ -309,18 +617,49 @@ def main():
         print(f"  電影總數: {total_movies}")
         print(f"  演職人員: {total_people}")
         print(f"  電影類型: {total_genres}")
-        print(f"  本次新增: {popular_count + top_rated_count + now_playing_count} 部")
+        if delta:
+            print(f"  變更電影: {run.changes_seen} 部（更新 {run.movies_updated} 部，"
+                  f"標記 {run.embeddings_marked_stale} 個向量待更新）")
+        else:
+            print(f"  本次新增: {run.movies_added} 部")
+        print(f"  API 請求: {run.api_requests} 次（失敗 {run.api_failures} 次）")
+        if tmdb_client.cache is not None:
+            cache_stats = tmdb_client.cache.get_stats()
+            print(f"  回應快取: {tmdb_client.cache.mode}（命中 {cache_stats['hits']}，"
+                  f"未命中 {cache_stats['misses']}，304 {cache_stats['revalidated']}）")
+        print(f"  資料版本: {data_version}")
+        print(f"  執行紀錄: #{run.id}（{run.status}）")
         print("=" * 60)
-        print("✅ 同步完成！")
+        print("✅ 同步完成！" if run.status == "succeeded" else f"⚠️  同步未完全成功: {run.error}")
         
     except Exception as e:
         print(f"\n❌ 同步過程發生錯誤: {e}")
         db.rollback()
+        # 中斷前已逐頁提交的資料仍在資料庫中：以獨立的交易重新計算人員統計並遞增資料版本，
+        # 讓 API 的各種快取（總數、回應、類型目錄、合作關係圖）不會繼續返回同步前的資料
+        try:
+            PersonRepository(db).refresh_stats()
+            data_version = DataVersionRepository(db).bump_version()
+            db.commit()
+            print(f"  已提交的資料生效（資料版本 {data_version}）")
+        except Exception as bump_error:
+            db.rollback()
+            print(f"  ⚠️  遞增資料版本失敗: {bump_error}")
+        run_repo.finish_run(run, api_stats(), error=str(e))
         raise
     
     finally:
+        tmdb_client.close()
         db.close()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Sync movies from TMDB into the local database")
+    parser.add_argument("--delta", action="store_true", help="增量同步：只更新上次同步後在 TMDB 變更的電影")
+    parser.add_argument("--since", type=date.fromisoformat, help="增量同步的起始日期（YYYY-MM-DD），預設為上次同步時間")
+    parser.add_argument("--pages", type=int, help="完整同步時每個端點的頁數（預設熱門 5、高評分 5、正在上映 3）")
+    parser.add_argument("--restart", action="store_true", help="忽略上次中斷的進度，從第 1 頁開始")
+    parser.add_argument("--cache", choices=CACHE_MODES,
+                        help="TMDB 回應快取：readwrite 重複執行時沿用快取，replay 只讀快取不連網（預設 TMDB_CACHE_MODE）")
+    args = parser.parse_args()
+    main(delta=args.delta, since=args.since, pages=args.pages, restart=args.restart, cache_mode=args.cache)
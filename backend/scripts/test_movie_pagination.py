@@ -0,0 +1,126 @@
+"""
+Movie Pagination Test
+以游標（next_cursor）走訪電影列表、類型篩選與搜尋結果，檢查沒有重複或遺漏，且順序為人氣度降序
+
+搜尋使用 FTS5 時頁碼模式按相關度排序，游標模式（包含 cursor="" 的第一頁）必須改按人氣度排序，
+否則第一頁最後一筆產生的游標會讓後續頁重複或跳過電影
+
+使用暫存的 SQLite 資料庫，不影響 cinemood.db
+
+用法:
+    python scripts/test_movie_pagination.py
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# 必須在匯入 app 之前設定
+_tmp_dir = tempfile.mkdtemp()
+DB_PATH = f"{_tmp_dir}/test_movie_pagination.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+N_MOVIES = 50
+PAGE_SIZE = 7
+QUERY = "星際旅行"
+GENRE_ID = 1
+
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+    print(f"   ✅ {message}")
+
+
+def seed_movies():
+    """
+    建立 N_MOVIES 部標題都包含 QUERY 的電影（app 匯入時已建立資料表與 FTS 觸發器）
+    關鍵字在簡介中重複的次數與人氣度無關，bm25 相關度順序因此與人氣度順序不同
+    """
+    rng = random.Random(3)
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute("INSERT INTO genres (id, tmdb_id, name) VALUES (?, ?, ?)", (GENRE_ID, GENRE_ID, "科幻"))
+    movies = []
+    for i in range(N_MOVIES):
+        movie_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        overview = " ".join([QUERY] * rng.randint(1, 5) + ["劇情"] * rng.randint(0, 20))
+        movies.append((movie_id, i + 1, f"{QUERY} {i}", f"Star Trip {i}", overview, 7.0, 100,
+                       round(rng.uniform(1, 100), 3)))
+    conn.executemany(
+        "INSERT INTO movies (id, tmdb_id, title, original_title, overview, "
+        "vote_average, vote_count, popularity) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        movies
+    )
+    conn.executemany(
+        "INSERT INTO movie_genres (movie_id, genre_id) VALUES (?, ?)",
+        [(movie[0], GENRE_ID) for movie in movies[::2]]
+    )
+    conn.commit()
+    conn.close()
+    # 人氣度降序（同分時 id 降序），與 keyset 游標的順序相同
+    return [movie[0] for movie in sorted(movies, key=lambda movie: (movie[7], movie[0]), reverse=True)]
+
+
+def walk(client: TestClient, path: str, params: dict) -> tuple:
+    """從 cursor="" 開始依 next_cursor 走訪所有頁，返回 (電影 ID 列表, total)"""
+    ids, cursor, total = [], "", None
+    while cursor is not None:
+        response = client.get(path, params={**params, "page_size": PAGE_SIZE, "cursor": cursor})
+        assert response.status_code == 200, response.text
+        data = response.json()
+        ids.extend(movie["id"] for movie in data["movies"])
+        total, cursor = data["total"], data["next_cursor"]
+        if len(ids) > 2 * N_MOVIES:
+            raise AssertionError(f"{path} 游標沒有結束")
+    return ids, total
+
+
+def check_walk(name: str, ids: list, total: int, expected: list):
+    print(f"\n📄 {name}")
+    check(len(ids) == len(set(ids)), f"沒有重複（{len(ids)} 筆）")
+    check(len(ids) == total == len(expected), f"沒有遺漏（total {total}）")
+    check(ids == expected, "按人氣度降序")
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Movie Pagination Test")
+    print("=" * 60)
+
+    by_popularity = seed_movies()
+    client = TestClient(app)
+    api = settings.API_V1_PREFIX
+
+    ids, total = walk(client, f"{api}/movies", {})
+    check_walk("電影列表", ids, total, by_popularity)
+
+    ids, total = walk(client, f"{api}/movies", {"genre_id": GENRE_ID})
+    conn = sqlite3.connect(DB_PATH)
+    in_genre = {movie_id for (movie_id,) in conn.execute("SELECT movie_id FROM movie_genres")}
+    conn.close()
+    check_walk("類型篩選", ids, total, [movie_id for movie_id in by_popularity if movie_id in in_genre])
+
+    relevance = client.get(f"{api}/movies/search", params={"q": QUERY, "page_size": N_MOVIES}).json()
+    relevance_ids = [movie["id"] for movie in relevance["movies"]]
+    print("\n🔎 搜尋（FTS）")
+    check(relevance_ids != by_popularity, "頁碼模式按相關度排序（與人氣度順序不同）")
+
+    ids, total = walk(client, f"{api}/movies/search", {"q": QUERY})
+    check_walk("搜尋游標分頁", ids, total, by_popularity)
+
+    print("\n🎉 所有檢查通過")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Person API Test
+建立少量電影與演職人員，執行 PersonRepository.refresh_stats() 後檢查 /people 與 /people/{id}：
+參與電影數、平均評分（不計入沒有評分的電影）、代表作名次與無效角色的錯誤
+
+使用暫存的 SQLite 資料庫，不影響 cinemood.db
+
+用法:
+    python scripts/test_person_api.py
+"""
+import os
+import sys
+import tempfile
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# 必須在匯入 app 之前設定
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test_person_api.db"
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.movie_credit_model import MovieCredit
+from app.models.movie_model import Movie
+from app.models.person_model import Person
+from app.repositories.person_repository import TOP_MOVIES_PER_PERSON, PersonRepository
+
+API = f"{settings.API_V1_PREFIX}/people"
+
+# (vote_average, vote_count, popularity)：vote_count 為 0 的電影沒有評分
+MOVIES = [
+    (8.0, 100, 50.0),
+    (6.5, 80, 90.0),
+    (0.0, 0, 70.0),
+    (7.25, 10, 10.0),
+    (5.0, 30, 30.0),
+    (0.0, 0, 20.0),
+    (9.0, 500, 40.0),
+]
+
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+    print(f"   ✅ {message}")
+
+
+def seed() -> dict:
+    """
+    建立電影與人員：
+    - lead：參演全部電影，並執導第 1 部
+    - supporting：參演前 2 部
+    - director：只執導，所執導的電影都沒有評分
+    """
+    db = SessionLocal()
+    try:
+        movies = [
+            Movie(tmdb_id=i + 1, title=f"電影 {i}", vote_average=Decimal(str(average)), vote_count=count,
+                  popularity=Decimal(str(popularity)), release_date=date(2000 + i, 1, 1))
+            for i, (average, count, popularity) in enumerate(MOVIES)
+        ]
+        people = {name: Person(tmdb_id=i + 1, name=name) for i, name in enumerate(("lead", "supporting", "director"))}
+        db.add_all(movies + list(people.values()))
+        db.flush()
+
+        credits = [MovieCredit(movie_id=movie.id, person_id=people["lead"].id, role="actor", order_num=0)
+                   for movie in movies]
+        credits += [MovieCredit(movie_id=movie.id, person_id=people["supporting"].id, role="actor", order_num=1)
+                    for movie in movies[:2]]
+        credits.append(MovieCredit(movie_id=movies[0].id, person_id=people["lead"].id, role="director"))
+        credits += [MovieCredit(movie_id=movie.id, person_id=people["director"].id, role="director")
+                    for movie in (movies[2], movies[5])]
+        db.add_all(credits)
+
+        counts = PersonRepository(db).refresh_stats()
+        db.commit()
+        print(f"📦 人員統計 {counts['person_stats']} 筆，代表作 {counts['person_top_movies']} 筆")
+        return {name: person.id for name, person in people.items()}
+    finally:
+        db.close()
+
+
+def test_list(client: TestClient, ids: dict):
+    print("\n👥 /people")
+    data = client.get(API, params={"role": "actor"}).json()
+    check([person["id"] for person in data["people"]] == [ids["lead"], ids["supporting"]],
+          "演員按參與電影數排序")
+    check(data["total"] == 2, "演員總數 2")
+    lead = data["people"][0]
+    check(lead["movie_count"] == len(MOVIES), f"movie_count = {len(MOVIES)}")
+
+    rated = [average for average, count, _ in MOVIES if count > 0]
+    expected = round(sum(rated) / len(rated), 2)
+    check(lead["avg_rating"] == expected, f"avg_rating 不計入沒有評分的電影（{expected}）")
+    check(lead["latest_release_date"] == f"{2000 + len(MOVIES) - 1}-01-01", "latest_release_date 為最新上映日")
+
+    directors = client.get(API, params={"role": "director"}).json()["people"]
+    no_ratings = next(person for person in directors if person["id"] == ids["director"])
+    check(no_ratings["movie_count"] == 2 and no_ratings["avg_rating"] is None, "執導的電影都沒有評分時 avg_rating 為 null")
+
+    response = client.get(API, params={"role": "writer"})
+    check(response.status_code == 400, "無效的 role 返回 400")
+
+
+def test_detail(client: TestClient, ids: dict):
+    print("\n🎬 /people/{id}")
+    data = client.get(f"{API}/{ids['lead']}").json()
+    check([(stats["role"], stats["movie_count"]) for stats in data["stats"]] == [("actor", 7), ("director", 1)],
+          "各角色統計")
+
+    actor_movies = [movie for movie in data["top_movies"] if movie["role"] == "actor"]
+    check([movie["rank"] for movie in actor_movies] == list(range(1, TOP_MOVIES_PER_PERSON + 1)),
+          f"演員代表作名次 1-{TOP_MOVIES_PER_PERSON}")
+    expected = sorted((popularity for _, _, popularity in MOVIES), reverse=True)[:TOP_MOVIES_PER_PERSON]
+    check([movie["popularity"] for movie in actor_movies] == expected, "代表作按人氣度排序，只保留前幾名")
+    check([movie["role"] for movie in data["top_movies"]][-1] == "director", "導演代表作排在演員之後")
+
+    check(client.get(f"{API}/not-a-person").status_code == 404, "不存在的人員返回 404")
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Person API Test")
+    print("=" * 60)
+
+    ids = seed()
+    client = TestClient(app)
+    test_list(client, ids)
+    test_detail(client, ids)
+
+    print("\n🎉 所有檢查通過")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Response Cache Test
+檢查目錄端點的回應快取：
+- 命中時的 CORS 標頭依請求的 Origin 產生，不會沿用第一個請求的 Origin
+- 路由執行期間資料版本改變時，回應不會以新版本存入快取
+
+使用暫存的 SQLite 資料庫，不影響 cinemood.db
+
+用法:
+    python scripts/test_response_cache.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# 必須在匯入 app 之前設定
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test_response_cache.db"
+os.environ["RESPONSE_CACHE_ENABLED"] = "true"
+os.environ["RESPONSE_CACHE_DIR"] = ""
+os.environ["BACKEND_CORS_ORIGINS"] = "http://localhost:5173,http://localhost:3000"
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.response_cache import ResponseCache, ResponseCacheMiddleware
+from app.main import app
+
+ORIGIN_A, ORIGIN_B = settings.cors_origins[:2]
+URL = f"{settings.API_V1_PREFIX}/genres"
+
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+    print(f"   ✅ {message}")
+
+
+def test_cors_per_origin(client: TestClient):
+    """同一個快取項目對不同 Origin 返回各自的 CORS 標頭"""
+    print("\n🌐 CORS 標頭與快取")
+
+    first = client.get(URL, headers={"Origin": ORIGIN_A})
+    check(first.status_code == 200 and first.headers["x-cache"] == "MISS", "第一個請求未命中快取")
+    check(first.headers.get("access-control-allow-origin") == ORIGIN_A, f"MISS 返回 {ORIGIN_A}")
+
+    second = client.get(URL, headers={"Origin": ORIGIN_B})
+    check(second.headers["x-cache"] == "HIT", "第二個 Origin 命中快取")
+    check(second.headers.get("access-control-allow-origin") == ORIGIN_B, f"HIT 返回 {ORIGIN_B}（不是 {ORIGIN_A}）")
+
+    no_origin = client.get(URL)
+    check(no_origin.headers["x-cache"] == "HIT", "沒有 Origin 的請求命中快取")
+    check("access-control-allow-origin" not in no_origin.headers, "沒有 Origin 時不返回 CORS 標頭")
+
+    other = client.get(URL, headers={"Origin": "http://evil.example"})
+    check("access-control-allow-origin" not in other.headers, "未允許的 Origin 不返回 CORS 標頭")
+
+    not_modified = client.get(URL, headers={"Origin": ORIGIN_B, "If-None-Match": first.headers["etag"]})
+    check(not_modified.status_code == 304, "ETag 相符時返回 304")
+    check(not_modified.headers.get("access-control-allow-origin") == ORIGIN_B, f"304 返回 {ORIGIN_B}")
+
+
+def test_version_change_during_request():
+    """路由執行期間其他請求檢查到新版本：此回應可能是舊資料，不快取"""
+    print("\n🔢 請求期間資料版本改變")
+
+    cache = ResponseCache(version_check_interval=3600)
+    calls = []
+
+    async def catalog(scope, receive, send):
+        if not calls:
+            # 模擬同步完成後，另一個請求在此期間讀到新版本並清空快取
+            cache.sync_version(cache.version + 1)
+        calls.append(scope["path"])
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": f'{{"call": {len(calls)}}}'.encode()})
+
+    client = TestClient(ResponseCacheMiddleware(catalog, prefixes=("/catalog",), cache=cache))
+
+    first = client.get("/catalog")
+    check(first.status_code == 200 and first.headers["x-cache"] == "MISS", "第一個請求未命中快取")
+    check(cache.get("/catalog") is None, "版本改變時不存入快取")
+
+    second = client.get("/catalog")
+    check(second.headers["x-cache"] == "MISS" and second.json() == {"call": 2}, "下一個請求重新執行路由")
+
+    third = client.get("/catalog")
+    check(third.headers["x-cache"] == "HIT" and third.json() == {"call": 2}, "版本未改變時正常快取")
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Response Cache Test")
+    print("=" * 60)
+
+    client = TestClient(app)
+    test_cors_per_origin(client)
+    test_version_change_during_request()
+
+    print("\n🎉 所有檢查通過")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Sync Watermark Test
+檢查增量同步的起始 watermark：完整同步不更新已存在的電影，夾在兩次增量同步之間的完整同步不能推進 watermark
+
+使用暫存的 SQLite 資料庫，不影響 cinemood.db
+
+用法:
+    python scripts/test_sync_watermark.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+# 必須在匯入 app 之前設定
+_tmp_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test_sync_watermark.db"
+
+from app.db.session import Base, SessionLocal, engine
+from app.repositories.sync_run_repository import SyncRunRepository
+
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+    print(f"   ✅ {message}")
+
+
+def record(repo: SyncRunRepository, mode: str, day: int, error: str = None) -> datetime:
+    """建立一筆已結束的執行紀錄，返回其 watermark"""
+    watermark = datetime(2026, 1, day)
+    repo.finish_run(repo.start_run(mode, watermark=watermark), {}, error=error)
+    return watermark
+
+
+def main():
+    print("=" * 60)
+    print("🧪 Sync Watermark Test")
+    print("=" * 60)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        repo = SyncRunRepository(db)
+        check(repo.get_last_watermark() is None, "沒有執行紀錄時返回 None")
+
+        record(repo, "full", 1, error="類型同步失敗")
+        check(repo.get_last_watermark() is None, "失敗的完整同步不計入")
+
+        initial = record(repo, "full", 2)
+        check(repo.get_last_watermark() == initial, "只有完整同步時使用初次完整同步")
+
+        record(repo, "full", 3)
+        check(repo.get_last_watermark() == initial, "之後的完整同步不推進 watermark")
+
+        delta = record(repo, "delta", 4)
+        check(repo.get_last_watermark() == delta, "增量同步推進 watermark")
+
+        record(repo, "full", 5)
+        check(repo.get_last_watermark() == delta, "增量同步之後的完整同步不推進 watermark")
+
+        record(repo, "delta", 6, error="3 部電影重新獲取失敗")
+        check(repo.get_last_watermark() == delta, "失敗的增量同步不推進 watermark")
+
+        latest = record(repo, "delta", 7)
+        check(repo.get_last_watermark() == latest, "取最近一次成功的增量同步")
+    finally:
+        db.close()
+
+    print("\n🎉 所有檢查通過")
+
+
+if __name__ == "__main__":
+    main()
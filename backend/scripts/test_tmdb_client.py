@@ -0,0 +1,136 @@
+"""
+TMDB Client Retry Test
+以本機 Fake TMDB Server 注入錯誤，檢查 TMDBClient 的連線重用、重試、429 處理、統計與回應快取
+
+用法:
+    python scripts/test_tmdb_client.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.tmdb_cache import TMDBResponseCache
+from app.services.tmdb_client import TMDBClient
+from fake_tmdb_server import start_fake_tmdb_server
+
+
+def check(condition: bool, message: str):
+    if not condition:
+        raise AssertionError(message)
+    print(f"   ✅ {message}")
+
+
+def make_client(server, **kwargs) -> TMDBClient:
+    options = {"rate_limit": 1000, "max_workers": 4, "max_retries": 3, "backoff_base": 0.05,
+               "backoff_max": 0.2, "timeout": 0.5}
+    options.update(kwargs)
+    client = TMDBClient(**options)
+    client.base_url = server.base_url
+    return client
+
+
+def test_tmdb_client():
+    print("=" * 60)
+    print("TMDB Client Retry Test")
+    print("=" * 60)
+
+    server = start_fake_tmdb_server()
+
+    print("\n🔍 連線重用")
+    print("-" * 60)
+    client = make_client(server)
+    for tmdb_id in range(1, 21):
+        client.get_movie_details(tmdb_id)
+    check(server.connection_count == 1, f"20 個循序請求只建立 {server.connection_count} 個連線")
+    futures = [client.submit(client.get_movie_details, tmdb_id) for tmdb_id in range(1, 41)]
+    check(all(f.result() for f in futures), "並行請求全部成功")
+    check(server.connection_count <= 1 + client.max_workers, f"並行請求的連線數不超過 workers（{server.connection_count}）")
+    client.close()
+
+    print("\n🔍 5xx 重試")
+    print("-" * 60)
+    client = make_client(server)
+    server.add_fault("/movie/550", 503, 502)
+    details = client.get_movie_details(550)
+    check(details is not None and details["id"] == 550, "連續兩次 5xx 後成功返回資料")
+    stats = client.get_stats()
+    check(stats["retries"] == 2 and stats["failures"] == 0, f"重試 2 次、沒有失敗（{stats}）")
+
+    print("\n🔍 429 Retry-After")
+    print("-" * 60)
+    server.add_fault("/movie/551", (429, 1))
+    start = time.perf_counter()
+    details = client.get_movie_details(551)
+    elapsed = time.perf_counter() - start
+    check(details is not None, "429 後重試成功")
+    check(elapsed >= 1.0, f"依 Retry-After 等待（{elapsed:.2f}s）")
+    check(client.get_stats()["rate_limited"] == 1, "記錄 429 次數")
+
+    print("\n🔍 429 暫停所有執行緒")
+    print("-" * 60)
+    paused = make_client(server)
+    server.add_fault("/movie/554", (429, 1))
+    start = time.perf_counter()
+    limited = paused.submit(paused.get_movie_details, 554)
+    time.sleep(0.2)
+    requests_before = server.request_count
+    others = [paused.submit(paused.get_movie_details, tmdb_id) for tmdb_id in range(700, 706)]
+    time.sleep(0.5)
+    check(server.request_count == requests_before, "Retry-After 期間其他執行緒不發出請求")
+    check(limited.result() is not None and all(f.result() for f in others), "暫停結束後全部成功")
+    check(time.perf_counter() - start >= 1.0, "其他執行緒等到 Retry-After 之後")
+    check(paused.get_stats()["rate_limited"] == 1, "只收到 1 次 429")
+    paused.close()
+
+    print("\n🔍 逾時重試")
+    print("-" * 60)
+    server.add_fault("/movie/552/credits", "timeout")
+    credits = client.get_movie_credits(552)
+    check(credits is not None and len(credits["cast"]) > 0, "逾時後重試成功")
+
+    print("\n🔍 重試用盡與不可重試的錯誤")
+    print("-" * 60)
+    client = make_client(server)
+    server.add_fault("/movie/553", 500, 500, 500, 500)
+    check(client.get_movie_details(553) is None, "持續 5xx 時返回 None")
+    stats = client.get_stats()
+    check(stats["retries"] == 3 and stats["failures"] == 1, f"重試 max_retries 次後記錄失敗（{stats}）")
+
+    requests_before = server.request_count
+    check(client._make_request("/not/found") is None, "404 返回 None")
+    check(server.request_count - requests_before == 1, "404 不重試")
+    client.close()
+
+    print("\n🔍 回應快取")
+    print("-" * 60)
+    directory = tempfile.mkdtemp()
+    client = make_client(server, cache=TMDBResponseCache(directory, mode="readwrite"))
+    requests_before = server.request_count
+    first = client.get_movie_details(600, ["credits"])
+    check(client.get_movie_details(600, ["credits"]) == first, "TTL 內返回相同資料")
+    check(server.request_count - requests_before == 1, "TTL 內不發出請求")
+    client.get_movie_details(600)
+    check(server.request_count - requests_before == 2, "不同參數使用不同的快取鍵")
+    client.cache.ttl = 0
+    check(client.get_movie_details(600, ["credits"]) == first, "過期後以 ETag 重新驗證")
+    check(client.cache.get_stats()["revalidated"] == 1, "未變更時伺服器返回 304")
+    client.close()
+
+    client = make_client(server, cache=TMDBResponseCache(directory, mode="replay"))
+    requests_before = server.request_count
+    check(client.get_movie_details(600, ["credits"]) == first, "replay 返回快取資料")
+    check(client.get_movie_details(601) is None, "replay 中沒有的請求返回 None")
+    check(server.request_count == requests_before, "replay 不發出任何請求")
+    client.close()
+
+    server.shutdown()
+    print("\n" + "=" * 60)
+    print("✅ All tests passed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    test_tmdb_client()